@@ -0,0 +1,109 @@
+"""
+Cleaner Benchmark
+Times DataCleaner.clean_data and measures its peak memory (tracemalloc, above the input frame)
+against a step-by-step pandas reference: copy the input, fillna each column, to_numeric,
+astype('category'), drop_duplicates, then clip every outlier column. Checks that both give
+the same frame and that clean_data left its input untouched.
+
+Inputs are SyntheticDataGenerator CSVs, cached in benchmarks/data/ and parsed as the pipeline does.
+
+Usage: python benchmarks/bench_cleaner.py [--sizes 100000 1000000] [--repeat 3] [--compact]
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import tracemalloc
+import contextlib
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import (
+    Config, DataCleaner, DataIngestor, LocalSource, SchemaLoader, _iqr_bounds,
+)
+from datagen import SyntheticDataGenerator
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def reference_clean(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean with one pandas operation per step and column, each producing a new column or frame"""
+    df = df.copy()
+    for col in Config.NUMERIC_COLS:
+        if col in df.columns and df[col].isnull().any():
+            df[col] = df[col].fillna(df[col].median())
+    for col in Config.CATEGORICAL_COLS:
+        if col in df.columns and df[col].isnull().any():
+            mode = df[col].mode()
+            df[col] = df[col].fillna(mode[0] if not mode.empty else 'Unknown')
+    for col in Config.NUMERIC_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col in Config.CATEGORICAL_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    df = df.drop_duplicates()
+    columns = [col for col in Config.OUTLIER_COLS if col in df.columns]
+    quartiles = df[columns].quantile([0.25, 0.75])
+    for col in columns:
+        lower, upper = _iqr_bounds(*quartiles[col])
+        df[col] = df[col].clip(lower=lower, upper=upper)
+    return df
+
+
+def timed(func, repeat: int):
+    """Return (fastest seconds, result)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_mb(func) -> float:
+    """Peak traced allocation while func runs, in MB above what was allocated before it"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        return (tracemalloc.get_traced_memory()[1] - before) / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs; the fastest counts")
+    parser.add_argument('--compact', action='store_true', help="clean SchemaLoader compact dtypes")
+    parser.add_argument('--data-dir', default=os.path.join(BENCH_DIR, 'data'))
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator()
+    print(f"{'rows':>10} {'cleaner':>10} {'time (s)':>9} {'peak (MB)':>10} {'input (MB)':>11} {'equal':>6}")
+    for n_rows in args.sizes:
+        path = os.path.abspath(generator.cached_file(args.data_dir, n_rows))
+        schema = SchemaLoader() if args.compact else None
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = DataIngestor(schema=schema, source=LocalSource(path)).load_data()
+        input_mb = df.memory_usage(deep=True).sum() / 1e6
+        snapshot = df.copy()
+
+        ref_time, expected = timed(lambda: reference_clean(df), args.repeat)
+        ref_peak = peak_mb(lambda: reference_clean(df))
+        cleaner = DataCleaner()
+        new_time, cleaned = timed(lambda: cleaner.clean_data(df), args.repeat)
+        new_peak = peak_mb(lambda: cleaner.clean_data(df))
+        equal = cleaned.equals(expected) and df.equals(snapshot)
+
+        print(f"{n_rows:>10,} {'reference':>10} {ref_time:>9.3f} {ref_peak:>10.1f} {input_mb:>11.1f}")
+        print(f"{n_rows:>10,} {'DataCleaner':>10} {new_time:>9.3f} {new_peak:>10.1f} {input_mb:>11.1f} {str(equal):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Correlation Benchmark
+Times DataFrame.corr() against CorrelationAccumulator on a featured synthetic frame widened to
+--columns numeric columns: the full Pearson matrix, the target-only mode the key findings use,
+and Spearman on approximate ranks. Reports peak memory (tracemalloc) and the largest difference
+from pandas. The accumulator converts BLOCK_ROWS rows to float64 at a time, so its peak stays
+flat as rows grow while corr() copies the whole frame.
+
+Usage: python benchmarks/bench_correlation.py [--sizes 100000 1000000] [--columns 42] [--spearman]
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import tracemalloc
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import (
+    Config, CorrelationAccumulator, DataCleaner, FeatureEngineer,
+)
+from datagen import SyntheticDataGenerator
+
+
+def make_frame(n_rows: int, n_columns: int, seed: int = 0) -> pd.DataFrame:
+    """Featured synthetic sessions, padded with noisy linear mixes of the target up to n_columns numeric columns"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = FeatureEngineer().create_features(DataCleaner().clean_data(SyntheticDataGenerator(seed).generate(n_rows)))
+    rng = np.random.default_rng(seed)
+    target = df[Config.TARGET_COLUMN].to_numpy(dtype=float)
+    extra = n_columns - len(df.select_dtypes(include=[np.number]).columns)
+    for i in range(max(extra, 0)):
+        df[f'Mix_{i}'] = rng.uniform(-1, 1) * target + rng.normal(0, target.std(), len(df))
+    return df
+
+
+def measure(func):
+    """Return (seconds, peak MB traced while func runs, result); timed without tracing"""
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        peak = (tracemalloc.get_traced_memory()[1] - before) / 1e6
+    finally:
+        tracemalloc.stop()
+    return seconds, peak, result
+
+
+def accumulate(df: pd.DataFrame, method: str, target=None) -> pd.DataFrame:
+    accumulator = CorrelationAccumulator(method, target)
+    if accumulator.needs_rank_grid:
+        accumulator.observe(df)
+        accumulator.fix_rank_grid()
+    accumulator.update(df)
+    return accumulator.result()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--columns', type=int, default=42, help="numeric columns of the frame")
+    parser.add_argument('--spearman', action='store_true', help="also time Spearman (pandas ranks every column)")
+    args = parser.parse_args()
+
+    target = Config.TARGET_COLUMN
+    print(f"{'rows':>10} {'method':>28} {'time (s)':>9} {'peak (MB)':>10} {'max diff':>9}")
+    for n_rows in args.sizes:
+        df = make_frame(n_rows, args.columns)
+        methods = ['pearson'] + (['spearman'] if args.spearman else [])
+        for method in methods:
+            seconds, peak, expected = measure(lambda: df.select_dtypes(include=[np.number]).corr(method))
+            print(f"{n_rows:>10,} {f'DataFrame.corr ({method})':>28} {seconds:>9.3f} {peak:>10.1f}")
+            runs = {
+                f'accumulator ({method})': lambda: accumulate(df, method),
+                f'accumulator ({method}, target)': lambda: accumulate(df, method, target),
+            }
+            for name, func in runs.items():
+                seconds, peak, result = measure(func)
+                diff = np.nanmax(np.abs(result.to_numpy() - expected[result.columns].to_numpy()))
+                print(f"{n_rows:>10,} {name:>28} {seconds:>9.3f} {peak:>10.1f} {diff:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
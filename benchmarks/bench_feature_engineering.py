@@ -0,0 +1,73 @@
+"""
+Feature Engineering Benchmark
+Compares the original row-wise FeatureEngineer (df.apply over axis=1) against
+the vectorized feature definitions and checks that both produce the same output.
+
+Usage: python benchmarks/bench_feature_engineering.py [--sizes 20000 1000000 10000000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import FeatureEngineer
+
+
+def make_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Columns FeatureEngineer reads, with some zero-length and missing sessions"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Age': rng.integers(18, 60, n_rows).astype(float),
+        'Session_Duration (hours)': rng.uniform(0.5, 2.0, n_rows).round(2),
+        'Calories_Burned': rng.normal(1280, 500, n_rows).round(1),
+    })
+    df.loc[rng.random(n_rows) < 0.005, 'Session_Duration (hours)'] = 0.0
+    df.loc[rng.random(n_rows) < 0.005, 'Calories_Burned'] = np.nan
+    return df
+
+
+def legacy_create_features(df: pd.DataFrame) -> pd.DataFrame:
+    """The pre-vectorization implementation, kept here as the reference"""
+    df['Age_Group'] = pd.cut(
+        df['Age'],
+        bins=[0, 25, 35, 45, 55, 100],
+        labels=['18-25', '26-35', '36-45', '46-55', '55+']
+    )
+    df['Session_Duration_Minutes'] = df['Session_Duration (hours)'] * 60
+    df['Calories_Burned_Per_Minute'] = df.apply(
+        lambda row: row['Calories_Burned'] / row['Session_Duration_Minutes']
+        if row['Session_Duration_Minutes'] > 0 else 0,
+        axis=1
+    )
+    return df
+
+
+def time_call(func, df: pd.DataFrame):
+    """Run func on a fresh copy and return (seconds, result)"""
+    df = df.copy()
+    start = time.perf_counter()
+    result = func(df)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20_000, 1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    engineer = FeatureEngineer()
+    print(f"{'rows':>12} {'row-wise (s)':>14} {'vectorized (s)':>16} {'speedup':>9}  output")
+    for n_rows in args.sizes:
+        df = make_frame(n_rows)
+        legacy_time, legacy = time_call(legacy_create_features, df)
+        vector_time, vector = time_call(lambda frame: engineer.create_features(frame, verbose=False), df)
+        pd.testing.assert_frame_equal(legacy, vector)
+        print(f"{n_rows:>12,} {legacy_time:>14.3f} {vector_time:>16.4f} {legacy_time / vector_time:>8.0f}x  identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Group Analysis Benchmark
+Compares the original one-groupby-per-table group analysis against the single-pass
+GroupAggregator behind DataExplorer.perform_group_analysis, fed the whole frame and fed
+chunk by chunk as in --streaming, and checks that all three agree. Differences are
+measured on the rounded tables, so 0.01 means a value landed on a rounding boundary.
+
+Usage: python benchmarks/bench_group_analysis.py [--sizes 20000 1000000 10000000] [--chunk-size 100000]
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import DataExplorer
+
+
+def make_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Columns the group analysis reads, with the cleaned data's dtypes"""
+    rng = np.random.default_rng(seed)
+    duration = rng.uniform(30, 120, n_rows).round(1)
+    calories = rng.normal(1280, 500, n_rows).round(1)
+    return pd.DataFrame({
+        'Workout_Type': rng.choice(['Cardio', 'HIIT', 'Strength', 'Yoga'], n_rows),
+        'Gender': rng.choice(['Female', 'Male'], n_rows),
+        'Age_Group': pd.Categorical(rng.choice(['18-25', '26-35', '36-45', '46-55', '55+'], n_rows),
+                                    categories=['18-25', '26-35', '36-45', '46-55', '55+'], ordered=True),
+        'Experience_Level': rng.integers(1, 4, n_rows),
+        'Calories_Burned': calories,
+        'Session_Duration_Minutes': duration,
+        'Calories_Burned_Per_Minute': calories / duration,
+        'Avg_BPM': rng.integers(110, 180, n_rows).astype(float),
+    })
+
+
+def legacy_group_analysis(df: pd.DataFrame) -> dict:
+    """The pre-aggregator implementation, one groupby per table, kept here as the reference"""
+    results = {}
+    results['workout_summary'] = df.groupby('Workout_Type')['Calories_Burned'].agg([
+        'count', 'mean', 'std', 'min', 'max'
+    ]).round(2).sort_values('mean', ascending=False)
+    results['intensity_ranking'] = df.groupby('Workout_Type')['Calories_Burned_Per_Minute'].agg([
+        'mean', 'median'
+    ]).round(3).sort_values('mean', ascending=False)
+    results['gender_summary'] = df.groupby('Gender')['Calories_Burned'].agg(['count', 'mean', 'std']).round(2)
+    results['age_group_summary'] = df.groupby('Age_Group')['Calories_Burned'].agg(['count', 'mean', 'median']).round(2)
+    results['workout_gender_interaction'] = df.groupby(
+        ['Workout_Type', 'Gender']
+    )['Calories_Burned'].mean().unstack().round(2)
+    results['workout_profile'] = df.groupby('Workout_Type')[
+        ['Calories_Burned', 'Session_Duration_Minutes', 'Avg_BPM']
+    ].mean().round(1)
+    results['experience_summary'] = df.groupby('Experience_Level')['Calories_Burned'].agg([
+        'count', 'mean', 'median'
+    ]).round(2)
+    return results
+
+
+def timed(func, df: pd.DataFrame):
+    """Return (seconds, result)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(df)
+    return time.perf_counter() - start, result
+
+
+def chunked_group_analysis(explorer: DataExplorer, df: pd.DataFrame, chunk_size: int) -> dict:
+    aggregator = explorer.create_group_aggregator()
+    for start in range(0, len(df), chunk_size):
+        aggregator.update(df.iloc[start:start + chunk_size])
+    return explorer.summarize_groups(aggregator)
+
+
+def max_difference(legacy: dict, aggregated: dict) -> float:
+    assert list(legacy) == list(aggregated)
+    return max(
+        np.nanmax(np.abs(legacy[name].to_numpy(dtype=float) - aggregated[name].to_numpy(dtype=float)))
+        for name in legacy
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20_000, 1_000_000, 10_000_000])
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    args = parser.parse_args()
+
+    explorer = DataExplorer()
+    print(f"{'rows':>12} {'groupby x7 (s)':>15} {'single pass (s)':>16} {'chunked (s)':>12}  max diff")
+    for n_rows in args.sizes:
+        df = make_frame(n_rows)
+        legacy_time, legacy = timed(legacy_group_analysis, df)
+        single_time, single = timed(explorer.perform_group_analysis, df)
+        chunked_time, chunked = timed(lambda frame: chunked_group_analysis(explorer, frame, args.chunk_size), df)
+        diff = max(max_difference(legacy, single), max_difference(legacy, chunked))
+        print(f"{n_rows:>12,} {legacy_time:>15.3f} {single_time:>16.3f} {chunked_time:>12.3f}  {diff:.2g}")
+
+
+if __name__ == "__main__":
+    main()
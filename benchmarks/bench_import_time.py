@@ -0,0 +1,88 @@
+"""
+Import Time Benchmark
+Measures the startup cost of the module and its CLI with `python -X importtime`: the
+module's import time and its slowest direct imports, then the wall time of `--help` and
+of each CLI stage on a warm cache, with the heavy stacks (plotting, download, scipy)
+each run actually loaded. Only a render that draws should load matplotlib and seaborn.
+
+Usage: python benchmarks/bench_import_time.py [--rows 20000] [--repeat 5] [--top 10]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from datagen import SyntheticDataGenerator
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(os.path.dirname(BENCH_DIR), 'fitness_nutrition_analysis.py')
+HEAVY = ('matplotlib', 'seaborn', 'scipy', 'kagglehub')
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def run_importtime(args: List[str], cwd: str) -> Tuple[float, List[Tuple[int, str, float]]]:
+    """Wall seconds of one `python -X importtime ...` run and its (depth, module, cumulative s) lines"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=cwd, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode:
+        raise RuntimeError(result.stderr[-2000:])
+    imports = [(len(match.group(3)) // 2, match.group(4), int(match.group(2)) / 1e6)
+               for match in map(IMPORT_LINE.match, result.stderr.splitlines()) if match]
+    return wall, imports
+
+
+def heavy_stacks(imports: List[Tuple[int, str, float]]) -> str:
+    loaded = {name.split('.')[0] for _, name, _ in imports}
+    return ', '.join(stack for stack in HEAVY if stack in loaded) or '-'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20_000, help="synthetic rows the CLI stages run on")
+    parser.add_argument('--repeat', type=int, default=5, help="runs of each command; the fastest counts")
+    parser.add_argument('--top', type=int, default=10, help="direct imports to list")
+    parser.add_argument('--data-dir', default=os.path.join(BENCH_DIR, 'data'))
+    args = parser.parse_args()
+
+    repo = os.path.dirname(SCRIPT)
+    runs = [run_importtime(['-c', 'import fitness_nutrition_analysis'], repo) for _ in range(args.repeat)]
+    wall, imports = min(runs)
+    module = next(seconds for depth, name, seconds in imports if name == 'fitness_nutrition_analysis')
+    print(f"import fitness_nutrition_analysis: {module:.3f}s ({wall:.3f}s wall with interpreter start), "
+          f"heavy stacks loaded: {heavy_stacks(imports)}")
+    # Children are listed before their parent; the module's own imports follow the previous top-level line
+    end = next(i for i, (depth, name, _) in enumerate(imports) if name == 'fitness_nutrition_analysis')
+    start = max((i for i in range(end) if imports[i][0] == 0), default=-1) + 1
+    direct: Dict[str, float] = {name: seconds for depth, name, seconds in imports[start:end] if depth == 1}
+    for name, seconds in sorted(direct.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:>30} {seconds:>8.3f}s")
+
+    data_file = os.path.abspath(SyntheticDataGenerator().cached_file(args.data_dir, args.rows))
+    print(f"\nCLI on {args.rows:,} synthetic rows, warm cache")
+    print(f"{'command':>24} {'wall (s)':>9}  heavy stacks loaded")
+    with tempfile.TemporaryDirectory() as work_dir:
+        cli = [SCRIPT, '--data', data_file, '--render-workers', '1']
+        # Fill the stage cache once, so each stage below only pays for startup and cache reads
+        subprocess.run([sys.executable] + cli, cwd=work_dir, capture_output=True, check=True)
+        commands = {
+            '--help': [SCRIPT, '--help'],
+            'ingest': cli + ['ingest'],
+            'clean': cli + ['clean'],
+            'analyze': cli + ['analyze'],
+            'render (charts current)': cli + ['render'],
+            'render (draws)': cli + ['render', '--no-cache'],
+        }
+        for name, command in commands.items():
+            wall, imports = min(run_importtime(command, work_dir) for _ in range(args.repeat))
+            print(f"{name:>24} {wall:>9.3f}  {heavy_stacks(imports)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Parallel Ingestion Benchmark
+Times loading, backing up and cleaning a sharded input serially (load_data, backup_raw_data,
+clean_data on the concatenated frame) and with ParallelCleaner at each worker count, and
+checks that every parallel result equals the serial one. Speedup is bounded by the cores
+available and by the parent's share: merging counts, dropping duplicates across files,
+concatenating and capping outliers.
+
+Shards are cut from SyntheticDataGenerator output and cached in benchmarks/data/.
+
+Usage: python benchmarks/bench_parallel_ingest.py [--rows 2000000] [--shards 16] [--workers 1 2 4 8]
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import (
+    DataCleaner, DataIngestor, GlobSource, ParallelCleaner, ParquetStorage,
+)
+from datagen import SyntheticDataGenerator
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def make_shards(directory: str, n_rows: int, n_shards: int) -> str:
+    """CSV shards of n_rows synthetic sessions in total; returns their glob pattern"""
+    shard_dir = os.path.join(directory, f"shards_{n_rows}_{n_shards}")
+    pattern = os.path.join(shard_dir, 'part-*.csv')
+    if not os.path.isdir(shard_dir):
+        os.makedirs(shard_dir)
+        df = SyntheticDataGenerator().generate(n_rows)
+        for shard in range(n_shards):
+            df.iloc[shard * n_rows // n_shards:(shard + 1) * n_rows // n_shards].to_csv(
+                os.path.join(shard_dir, f"part-{shard:04d}.csv"), index=False)
+    return pattern
+
+
+def timed(func):
+    """Return (seconds, result)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--shards', type=int, default=16)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--data-dir', default=os.path.join(BENCH_DIR, 'data'))
+    args = parser.parse_args()
+
+    pattern = make_shards(args.data_dir, args.rows, args.shards)
+    ingestor = DataIngestor(ParquetStorage(), source=GlobSource(pattern))
+    with contextlib.redirect_stdout(io.StringIO()):
+        paths = ingestor.locate_data_files()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        backup_path = os.path.join(out_dir, 'raw_data.parquet')
+
+        def serial() -> pd.DataFrame:
+            raw_df = ingestor.load_data(paths)
+            ingestor.backup_raw_data(raw_df, backup_path)
+            return DataCleaner().clean_data(raw_df)
+
+        serial_time, expected = timed(serial)
+        print(f"{args.rows:,} rows in {len(paths)} files, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'time (s)':>9} {'speedup':>8} {'equal':>6}")
+        print(f"{'serial':>8} {serial_time:>9.2f} {1:>7.2f}x {'':>6}")
+        for workers in args.workers:
+            cleaner = ParallelCleaner(ingestor, DataCleaner(), workers)
+            seconds, df = timed(lambda: cleaner.clean_files(paths, backup_path))
+            print(f"{workers:>8} {seconds:>9.2f} {serial_time / seconds:>7.2f}x {str(df.equals(expected)):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Pipeline Benchmark Suite
+Runs FitnessDataAnalyzer end to end (uncached) on synthetic data of each size, in memory and
+streaming, and times every stage and sub-stage from its --profile run report. Each run's
+results are saved under benchmarks/results/. Against a saved baseline (--save-baseline writes
+one), a stage more than --tolerance slower, and by at least --min-seconds, is flagged as a
+regression and the script exits with status 1.
+
+Synthetic inputs come from SyntheticDataGenerator and are cached in benchmarks/data/.
+
+Usage: python benchmarks/bench_pipeline.py [--sizes 20000 1000000 10000000] [--modes in-memory streaming]
+                                           [--save-baseline] [--tolerance 0.25] [--min-seconds 0.05]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import datetime
+import tempfile
+import subprocess
+import contextlib
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import Config, FitnessDataAnalyzer
+from datagen import SyntheticDataGenerator
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+MODES = ('in-memory', 'streaming')
+
+
+def run_pipeline(data_file: str, mode: str, depth: int, chunk_size: int, render_workers: int) -> Dict[str, float]:
+    """Wall seconds of every step down to depth of one uncached run, from its run report"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Config paths are relative, so each run writes its outputs into a scratch directory
+        os.chdir(work_dir)
+        try:
+            config = Config(DATA_FILE=data_file, USE_CACHE=False, PROFILE=True, CHUNK_SIZE=chunk_size,
+                            RENDER_WORKERS=render_workers)
+            with contextlib.redirect_stdout(io.StringIO()):
+                FitnessDataAnalyzer(config).run_analysis(streaming=mode == 'streaming')
+            with open(config.RUN_REPORT_PATH) as f:
+                report = json.load(f)
+        finally:
+            os.chdir(cwd)
+    return {step['path']: step['wall_s'] for step in report['steps'] if step['depth'] <= depth}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_seconds: float) -> int:
+    """Print each stage against the baseline and return the number of regressions"""
+    regressions = 0
+    for run, stages in results['runs'].items():
+        base_stages = baseline['runs'].get(run)
+        if base_stages is None:
+            print(f"\n{run}: not in baseline")
+            continue
+        print(f"\n{run} (baseline {baseline['commit']}, {baseline['created']})")
+        print(f"{'stage':>45} {'baseline (s)':>13} {'now (s)':>9} {'change':>8}")
+        for stage, seconds in stages.items():
+            if stage not in base_stages:
+                print(f"{stage:>45} {'-':>13} {seconds:>9.3f}")
+                continue
+            base = base_stages[stage]
+            change = seconds / base - 1 if base > 0 else 0.0
+            regressed = change > tolerance and seconds - base >= min_seconds
+            regressions += regressed
+            flag = '  REGRESSION' if regressed else ''
+            print(f"{stage:>45} {base:>13.3f} {seconds:>9.3f} {change:>+8.0%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20_000, 1_000_000, 10_000_000])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--repeat', type=int, default=1, help="runs per size and mode; the fastest of each stage counts")
+    parser.add_argument('--depth', type=int, default=2, help="step nesting to report (1 = stages only)")
+    parser.add_argument('--chunk-size', type=int, default=Config.CHUNK_SIZE)
+    parser.add_argument('--render-workers', type=int, default=Config.RENDER_WORKERS)
+    parser.add_argument('--input-format', choices=['.csv', '.parquet'], default='.csv')
+    parser.add_argument('--data-dir', default=os.path.join(BENCH_DIR, 'data'))
+    parser.add_argument('--results-dir', default=os.path.join(BENCH_DIR, 'results'))
+    parser.add_argument('--baseline', default=os.path.join(BENCH_DIR, 'baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="relative slowdown that counts as a regression")
+    parser.add_argument('--min-seconds', type=float, default=0.05, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator()
+    results = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        'runs': {},
+    }
+    for n_rows in args.sizes:
+        data_file = os.path.abspath(generator.cached_file(args.data_dir, n_rows, args.input_format))
+        for mode in args.modes:
+            start = time.perf_counter()
+            stages: Dict[str, float] = {}
+            for _ in range(args.repeat):
+                for stage, seconds in run_pipeline(data_file, mode, args.depth, args.chunk_size,
+                                                   args.render_workers).items():
+                    stages[stage] = min(stages.get(stage, seconds), seconds)
+            results['runs'][f"{n_rows}/{mode}"] = stages
+            print(f"✓ {n_rows:,} rows {mode}: {stages['run']:.2f}s "
+                  f"({time.perf_counter() - start:.0f}s for {args.repeat} run(s))")
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    results_path = os.path.join(args.results_dir, f"pipeline_{results['created'].replace(':', '')}.json")
+    with open(results_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Results saved to: {results_path}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✓ Baseline saved to: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_seconds)
+        print(f"\n{regressions} regression(s) beyond {args.tolerance:.0%}")
+        sys.exit(1 if regressions else 0)
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Profiling Overhead Benchmark
+Times the streaming clean → features → aggregate loop with instrumentation off, with the
+per-step run report (--profile) and with tracemalloc peaks (--profile-memory). Small chunks
+are the worst case: every chunk opens about twenty profiled steps.
+
+Usage: python benchmarks/bench_profiling_overhead.py [--rows 1000000] [--chunk-sizes 10000 100000] [--repeat 3]
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import (
+    ChartDataBuilder, CorrelationAccumulator, DataCleaner, DataExplorer, FeatureEngineer,
+    IncrementalState, RowHashSet, RunProfiler, profiling,
+)
+
+
+def make_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Raw sessions with the dataset's columns, a few missing values and outliers"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Age': rng.integers(18, 60, n_rows).astype(float),
+        'Gender': rng.choice(['Male', 'Female'], n_rows),
+        'Weight (kg)': rng.normal(75, 15, n_rows).round(2),
+        'Height (m)': rng.normal(1.72, 0.1, n_rows).round(2),
+        'Avg_BPM': rng.normal(144, 14, n_rows).round(0),
+        'Session_Duration (hours)': rng.uniform(0.5, 2.0, n_rows).round(2),
+        'Calories_Burned': rng.normal(1280, 500, n_rows).round(1),
+        'Workout_Type': rng.choice(['Cardio', 'HIIT', 'Strength', 'Yoga'], n_rows),
+        'Fat_Percentage': rng.uniform(10, 35, n_rows).round(2),
+        'Water_Intake (liters)': rng.uniform(1.5, 3.7, n_rows).round(1),
+        'Workout_Frequency (days/week)': rng.integers(2, 6, n_rows),
+        'Experience_Level': rng.integers(1, 4, n_rows),
+        'BMI': rng.normal(25, 4, n_rows).round(2),
+    })
+    for col in ('Age', 'Avg_BPM', 'Calories_Burned'):
+        df.loc[rng.random(n_rows) < 0.01, col] = np.nan
+    df.loc[rng.random(n_rows) < 0.002, 'Avg_BPM'] = 400
+    return df
+
+
+def run_chunks(df: pd.DataFrame, chunk_size: int) -> None:
+    """The per-chunk work of a streaming run, without file I/O"""
+    cleaner, engineer, explorer = DataCleaner(), FeatureEngineer(), DataExplorer()
+    chunks = lambda: (df.iloc[start:start + chunk_size].copy() for start in range(0, len(df), chunk_size))
+    stats = cleaner.fit_streaming_stats(chunks)
+    ranges = dict(stats.value_ranges, BMI=(df['BMI'].min(), df['BMI'].max()))
+    state = IncrementalState('bench', stats, RowHashSet(), RowHashSet(), CorrelationAccumulator(),
+                             explorer.create_group_aggregator(), ChartDataBuilder(ranges))
+    for chunk in chunks():
+        chunk = state.raw_seen.drop_seen(chunk)
+        state.update(engineer.create_features(cleaner.clean_chunk(chunk, stats, state.seen), verbose=False))
+    explorer.summarize_groups(state.groups)
+
+
+def timed(df: pd.DataFrame, chunk_size: int, repeat: int) -> dict:
+    """Best time of each mode over repeat rounds, modes interleaved so drift hits them alike"""
+    modes = {'off': lambda: None, 'report': RunProfiler, 'memory': lambda: RunProfiler(trace_memory=True)}
+    best = {mode: np.inf for mode in modes}
+    calls = 0
+    for _ in range(repeat):
+        for mode, make_profiler in modes.items():
+            profiler = make_profiler()
+            with contextlib.redirect_stdout(io.StringIO()), profiling(profiler):
+                start = time.perf_counter()
+                run_chunks(df, chunk_size)
+                best[mode] = min(best[mode], time.perf_counter() - start)
+            if profiler:
+                calls = sum(record['calls'] for record in profiler.steps.values())
+    return dict(best, steps=calls)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    print(f"{args.rows:,} rows")
+    print(f"{'chunk size':>11} {'off (s)':>8} {'report (s)':>11} {'overhead':>9} {'memory (s)':>11} "
+          f"{'overhead':>9} {'steps':>7}")
+    for chunk_size in args.chunk_sizes:
+        times = timed(df, chunk_size, args.repeat)
+        off, report, memory = times['off'], times['report'], times['memory']
+        print(f"{chunk_size:>11,} {off:>8.3f} {report:>11.3f} {report / off - 1:>8.1%} {memory:>11.3f} "
+              f"{memory / off - 1:>8.1%} {times['steps']:>7,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Quantile Sketch Benchmark
+Compares exact quantiles with QuantileSketch on the two places the pipeline needs them:
+outlier bounds (quartiles, min and max of every outlier column) and group medians. Accuracy
+is the rank error of each estimate, i.e. how far its position in the sorted data is from the
+requested quantile (0.001 = 0.1% of the rows), which the sketch keeps below --error. The
+chunked column feeds the sketches 100k rows at a time, as --streaming does.
+
+Usage: python benchmarks/bench_quantile_sketch.py [--sizes 1000000 10000000] [--error 0.001]
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import Config, DataCleaner, DataExplorer, QuantileSketch
+
+CHUNK_SIZE = 100_000
+
+
+def make_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Outlier columns and group-median inputs with the raw data's value shapes"""
+    rng = np.random.default_rng(seed)
+    duration = rng.uniform(30, 120, n_rows).round(1)
+    calories = rng.normal(1280, 500, n_rows).round(1)
+    return pd.DataFrame({
+        'Age': rng.integers(18, 60, n_rows).astype(float),
+        'Weight (kg)': rng.lognormal(4.3, 0.2, n_rows).round(1),
+        'Height (m)': rng.normal(1.72, 0.1, n_rows).round(2),
+        'Avg_BPM': rng.integers(110, 180, n_rows).astype(float),
+        'Workout_Type': rng.choice(['Cardio', 'HIIT', 'Strength', 'Yoga'], n_rows),
+        'Experience_Level': rng.integers(1, 4, n_rows),
+        'Age_Group': pd.Categorical(rng.choice(['18-25', '26-35', '36-45', '46-55', '55+'], n_rows),
+                                    categories=['18-25', '26-35', '36-45', '46-55', '55+'], ordered=True),
+        'Calories_Burned': calories,
+        'Calories_Burned_Per_Minute': calories / duration,
+    })
+
+
+def timed(func):
+    """Return (seconds, result)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    return time.perf_counter() - start, result
+
+
+def legacy_outlier_summary(df: pd.DataFrame) -> dict:
+    """The previous per-column quantile(0.25), quantile(0.75), min(), max() calls"""
+    return {col: (df[col].quantile(0.25), df[col].quantile(0.75), df[col].min(), df[col].max())
+            for col in Config.OUTLIER_COLS}
+
+
+def rank_error(sorted_values: np.ndarray, estimate: float, q: float) -> float:
+    """Distance from q to the ranks of the values bracketing the estimate (ties span several ranks)"""
+    n = len(sorted_values)
+    below = sorted_values[max(np.searchsorted(sorted_values, estimate, side='right') - 1, 0)]
+    above = sorted_values[min(np.searchsorted(sorted_values, estimate, side='left'), n - 1)]
+    low = np.searchsorted(sorted_values, below, side='left') / n
+    high = np.searchsorted(sorted_values, above, side='right') / n
+    return max(0.0, low - q, q - high)
+
+
+def quartile_errors(df: pd.DataFrame, sketches: dict) -> float:
+    worst = 0.0
+    for col, sketch in sketches.items():
+        values = np.sort(df[col].to_numpy(dtype=float))
+        for q, estimate in zip((0.25, 0.75), sketch.quantiles([0.25, 0.75])):
+            worst = max(worst, rank_error(values, estimate, q))
+    return worst
+
+
+def median_errors(df: pd.DataFrame, tables: dict) -> float:
+    """Worst rank error of the sketched group medians within their group's values"""
+    worst = 0.0
+    for name, spec in ((spec.name, spec) for spec in DataExplorer.GROUP_SPECS if 'median' in spec.stats):
+        key, metric = spec.keys[0], spec.metrics[0]
+        for label, values in df.groupby(key, observed=True)[metric]:
+            # Medians are reported rounded, so allow for the rounding step itself
+            estimate = tables[name].loc[label, 'median']
+            step = 0.5 * 10 ** -spec.decimals
+            values = np.sort(values.to_numpy(dtype=float))
+            worst = max(worst, min(rank_error(values, estimate + shift, 0.5) for shift in (-step, 0, step)))
+    return worst
+
+
+def sketch_columns(df: pd.DataFrame, error: float, chunk_size: int) -> dict:
+    sketches = {col: QuantileSketch(error) for col in Config.OUTLIER_COLS}
+    for start in range(0, len(df), chunk_size):
+        for col, sketch in sketches.items():
+            sketch.update(df[col].iloc[start:start + chunk_size])
+    return sketches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--error', type=float, default=0.001)
+    args = parser.parse_args()
+
+    exact_cleaner, sketch_cleaner = DataCleaner(), DataCleaner(args.error)
+    exact_explorer, sketch_explorer = DataExplorer(), DataExplorer(args.error)
+    print(f"Outlier bounds over {len(Config.OUTLIER_COLS)} columns and group medians, "
+          f"sketch error {args.error} (compression {QuantileSketch(args.error).compression})")
+    print(f"{'rows':>12} {'task':>15} {'per-column (s)':>15} {'exact (s)':>10} {'sketch (s)':>11} "
+          f"{'speedup':>8} {'rank err':>9} {'chunked err':>12}")
+    for n_rows in args.sizes:
+        df = make_frame(n_rows)
+
+        legacy_time, _ = timed(lambda: legacy_outlier_summary(df))
+        exact_time, _ = timed(lambda: exact_cleaner._outlier_summary(df))
+        sketch_time, _ = timed(lambda: sketch_cleaner._outlier_summary(df))
+        whole_error = quartile_errors(df, sketch_columns(df, args.error, len(df)))
+        chunked_error = quartile_errors(df, sketch_columns(df, args.error, CHUNK_SIZE))
+        print(f"{n_rows:>12,} {'outlier bounds':>15} {legacy_time:>15.3f} {exact_time:>10.3f} {sketch_time:>11.3f} "
+              f"{exact_time / sketch_time:>7.1f}x {whole_error:>9.5f} {chunked_error:>12.5f}")
+
+        exact_time, _ = timed(lambda: exact_explorer.perform_group_analysis(df))
+        sketch_time, tables = timed(lambda: sketch_explorer.perform_group_analysis(df))
+        aggregator = sketch_explorer.create_group_aggregator()
+        for start in range(0, len(df), CHUNK_SIZE):
+            aggregator.update(df.iloc[start:start + CHUNK_SIZE])
+        with contextlib.redirect_stdout(io.StringIO()):
+            chunked_tables = sketch_explorer.summarize_groups(aggregator)
+        print(f"{n_rows:>12,} {'group medians':>15} {'':>15} {exact_time:>10.3f} {sketch_time:>11.3f} "
+              f"{exact_time / sketch_time:>7.1f}x {median_errors(df, tables):>9.5f} "
+              f"{median_errors(df, chunked_tables):>12.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Render Profile Benchmark
+Draws the summary and insights dashboards of a featured synthetic frame with every render profile
+(Visualizer.PROFILES) and reports the render time (fastest of --repeat, prepared data only, as on
+the render pool), file size and image size. --formats also saves each profile in those formats,
+and each profile is timed once more with one Text artist per label to isolate label batching.
+
+Usage: python benchmarks/bench_render_profiles.py [--rows 100000] [--repeat 3] [--formats png webp]
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+from dataclasses import replace
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import (
+    ChartDataBuilder, DataCleaner, DataExplorer, FeatureEngineer, OutputManager, RenderProfile,
+    Visualizer, _pyplot,
+)
+from datagen import SyntheticDataGenerator
+
+
+def dashboard_data(n_rows: int, seed: int = 0) -> dict:
+    """Prepared data of both dashboards, by Visualizer.RENDERERS kind"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = FeatureEngineer().create_features(DataCleaner().clean_data(SyntheticDataGenerator(seed).generate(n_rows)))
+        grouped = DataExplorer().perform_group_analysis(df)
+    chart_data = ChartDataBuilder.from_frame(df)
+    visualizer = Visualizer(OutputManager('.'))
+    return {
+        'summary': visualizer.summary_dashboard_data(chart_data, grouped),
+        'insights': visualizer.insights_dashboard_data(chart_data, grouped),
+    }
+
+
+def render(profile: RenderProfile, kind: str, data: dict, filename: str, repeat: int) -> float:
+    """Fastest seconds to draw and save one dashboard"""
+    visualizer = Visualizer(OutputManager(os.path.dirname(filename)), profile)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(visualizer, Visualizer.RENDERERS[kind])(data, filename)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3, help="timed renders per dashboard; the fastest counts")
+    parser.add_argument('--formats', nargs='*', choices=sorted(RenderProfile.EXTENSIONS), default=[],
+                        help="also save every profile in these formats")
+    args = parser.parse_args()
+
+    data = dashboard_data(args.rows)
+    # Imported (and the fonts loaded) before timing, as a long-lived render worker would have them
+    _pyplot()
+    warmup = os.path.join(tempfile.gettempdir(), 'warmup.png')
+    render(Visualizer.PROFILES['preview'], 'insights', data['insights'], warmup, 1)
+
+    runs = []
+    for name, profile in Visualizer.PROFILES.items():
+        runs.append((name, profile))
+        runs += [(f'{name} ({fmt})', profile.with_format(fmt)) for fmt in args.formats if fmt != profile.format]
+        if profile.batch_labels:
+            runs.append((f'{name} (Text labels)', replace(profile, batch_labels=False)))
+
+    print(f"{'profile':>28} {'dashboard':>10} {'format':>14} {'dpi':>4} {'time (s)':>9} {'KB':>8} {'pixels':>11}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name, profile in runs:
+            for kind, kind_data in data.items():
+                filename = os.path.join(out_dir, f'{kind}.{profile.extension}')
+                seconds = render(profile, kind, kind_data, filename, args.repeat)
+                with Image.open(filename) as image:
+                    pixels = f'{image.width}x{image.height}'
+                print(f"{name:>28} {kind:>10} {profile.format:>14} {profile.dpi:>4} {seconds:>9.3f} "
+                      f"{os.path.getsize(filename) / 1024:>8.0f} {pixels:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Results Store Benchmark
+Builds a ResultsStore from a featured synthetic frame saved as processed_data.parquet, then times
+segment queries against what a caller does without it: reload processed_data and filter/group it.
+aggregate() is timed on a freshly opened store (loads the cube) and warm; rows() against reading
+the whole file and filtering, for filters on one dimension and on all of them. Reports the largest relative difference of the aggregate means.
+
+Usage: python benchmarks/bench_results_store.py [--sizes 100000 1000000] [--queries 200]
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import (
+    DataCleaner, FeatureEngineer, OutputManager, ParquetStorage, ResultsStore, ResultsStoreWriter,
+)
+from datagen import SyntheticDataGenerator
+
+
+def make_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return FeatureEngineer().create_features(DataCleaner().clean_data(SyntheticDataGenerator(seed).generate(n_rows)))
+
+
+def random_filters(store: ResultsStore, n_queries: int, seed: int = 0) -> list:
+    """Filters on one to all dimensions, values drawn from the store's partitions"""
+    rng = np.random.default_rng(seed)
+    partitions = store.manifest['partitions']
+    dimensions = store.manifest['dimensions']
+    queries = []
+    for _ in range(n_queries):
+        values = partitions[rng.integers(len(partitions))]['values']
+        keys = rng.choice(dimensions, rng.integers(1, len(dimensions) + 1), replace=False)
+        queries.append({key: values[key] for key in keys})
+    return queries
+
+
+def pandas_rows(path: str, filters: dict) -> pd.DataFrame:
+    """Reload the whole file and keep the rows matching filters"""
+    df = pd.read_parquet(path)
+    return df[np.logical_and.reduce([(df[key] == value).to_numpy() for key, value in filters.items()])]
+
+
+def pandas_aggregate(path: str, metric: str, filters: dict) -> pd.Series:
+    return pandas_rows(path, filters)[metric].agg(list(ResultsStore.STATS))
+
+
+def per_query_ms(func, queries: list) -> float:
+    start = time.perf_counter()
+    for filters in queries:
+        func(filters)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--queries', type=int, default=200, help="aggregate queries per timing")
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="rows per chunk fed to the writer")
+    args = parser.parse_args()
+
+    metric = 'Calories_Burned'
+    print(f"{'rows':>10} {'step':>32} {'time (ms)':>10} {'max rel diff':>13}")
+    for n_rows in args.sizes:
+        with tempfile.TemporaryDirectory() as out_dir:
+            output_manager = OutputManager(out_dir, ParquetStorage())
+            data_path = os.path.join(out_dir, 'processed_data.parquet')
+            with contextlib.redirect_stdout(io.StringIO()):
+                output_manager.save_dataframe(make_frame(n_rows), data_path)
+            store_path = os.path.join(out_dir, 'results_store')
+
+            start = time.perf_counter()
+            with ResultsStoreWriter(store_path) as writer:
+                for chunk in output_manager.iter_dataframe_chunks(data_path, args.chunk_size):
+                    writer.write(chunk)
+            print(f"{n_rows:>10,} {'build store':>32} {(time.perf_counter() - start) * 1000:>10.0f}")
+
+            queries = random_filters(ResultsStore(store_path), args.queries)
+            start = time.perf_counter()
+            store = ResultsStore(store_path)
+            store.aggregate(metric, **queries[0])
+            print(f"{n_rows:>10,} {'aggregate (cold)':>32} {(time.perf_counter() - start) * 1000:>10.2f}")
+            ms = per_query_ms(lambda filters: store.aggregate(metric, **filters), queries)
+            print(f"{n_rows:>10,} {'aggregate (warm)':>32} {ms:>10.3f}")
+
+            baseline = queries[:max(1, args.queries // 20)]
+            ms = per_query_ms(lambda filters: pandas_aggregate(data_path, metric, filters), baseline)
+            diff = max(
+                abs(store.aggregate(metric, **filters)['mean'] / pandas_aggregate(data_path, metric, filters)['mean'] - 1)
+                for filters in baseline
+            )
+            print(f"{n_rows:>10,} {'reload + filter (pandas)':>32} {ms:>10.1f} {diff:>13.1e}")
+
+            # rows() reads only the matching partitions, so its gain depends on how selective the filters are
+            dimensions = store.manifest['dimensions']
+            for name, subset in (('one dimension', dimensions[:1]), ('all dimensions', dimensions)):
+                filters = [{key: query_values[key] for key in subset} for query_values in
+                           (entry['values'] for entry in store.manifest['partitions'][:len(baseline)])]
+                ms = per_query_ms(lambda query: store.rows(**query), filters)
+                print(f"{n_rows:>10,} {f'rows() ({name})':>32} {ms:>10.1f}")
+                ms = per_query_ms(lambda query: pandas_rows(data_path, query), filters)
+                print(f"{n_rows:>10,} {f'reload + filter ({name})':>32} {ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
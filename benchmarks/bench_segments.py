@@ -0,0 +1,87 @@
+"""
+Segment Fan-out Benchmark
+Renders the summary and insights dashboards for every gym of a featured synthetic frame whose
+rows are spread over --segments gyms, with SegmentFanout: one partitioning pass, shared scales
+and frozen dashboard figures that only redraw the artists following each segment's data. Reports
+the time to partition the rows and compute the scales (each segment's chart data is built as the
+renderer reaches it, so it counts as render time) and the dashboards per second for each worker
+count, against drawing a few segments with Visualizer (new figures per dashboard, saved at 300 dpi
+as the pipeline does).
+
+Usage: python benchmarks/bench_segments.py [--rows 200000] [--segments 500] [--workers 1 2] [--baseline 4]
+"""
+
+import os
+import io
+import sys
+import time
+import itertools
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import (
+    Config, DataCleaner, FeatureEngineer, OutputManager, SegmentFanout, Visualizer,
+)
+from datagen import SyntheticDataGenerator
+
+
+def make_frame(n_rows: int, n_segments: int, seed: int = 0) -> pd.DataFrame:
+    """Featured synthetic sessions, each assigned to one of n_segments gyms of uneven size"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = FeatureEngineer().create_features(DataCleaner().clean_data(SyntheticDataGenerator(seed).generate(n_rows)))
+    rng = np.random.default_rng(seed)
+    weights = rng.pareto(1.5, n_segments) + 1
+    df['Gym'] = pd.Categorical(rng.choice(n_segments, len(df), p=weights / weights.sum())).rename_categories(
+        lambda gym: f'gym-{gym:05d}')
+    return df
+
+
+def baseline_rate(fanout: SegmentFanout, df: pd.DataFrame, n_segments: int, out_dir: str) -> float:
+    """Dashboards per second drawing the first n_segments with Visualizer, one new figure per dashboard"""
+    _, segments = fanout.prepare(df)
+    visualizer = Visualizer(OutputManager(out_dir))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, (_, _, data) in enumerate(itertools.islice(segments, n_segments)):
+            visualizer.render_summary_dashboard(data['summary'], os.path.join(out_dir, f'{i}_summary.png'))
+            visualizer.render_insights_dashboard(data['insights'], os.path.join(out_dir, f'{i}_insights.png'))
+    return 2 * (i + 1) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--segments', type=int, default=500, help="gyms the rows are spread over")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2], help="render processes to time")
+    parser.add_argument('--dpi', type=int, default=Config.SEGMENT_DPI)
+    parser.add_argument('--baseline', type=int, default=4, help="segments to draw with Visualizer (0 to skip)")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.segments)
+    print(f"{args.rows:,} rows over {df['Gym'].nunique()} gyms, {os.cpu_count()} CPU(s), {args.dpi} dpi")
+    print(f"{'renderer':>30} {'workers':>8} {'prepare (s)':>12} {'render (s)':>11} {'dashboards/s':>13} {'MB':>6}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        if args.baseline:
+            rate = baseline_rate(SegmentFanout(('Gym',), out_dir, args.dpi), df, args.baseline, out_dir)
+            print(f"{'Visualizer (300 dpi)':>30} {1:>8} {'':>12} {'':>11} {rate:>13.1f}")
+        for workers in args.workers:
+            segment_dir = os.path.join(out_dir, f'workers-{workers}')
+            fanout = SegmentFanout(('Gym',), segment_dir, args.dpi, workers)
+            start = time.perf_counter()
+            scales, segments = fanout.prepare(df)
+            prepared = time.perf_counter() - start
+            with contextlib.redirect_stdout(io.StringIO()):
+                fanout.write(scales, segments)
+            seconds = time.perf_counter() - start - prepared
+            files = [os.path.join(segment_dir, name) for name in os.listdir(segment_dir) if name.endswith('.png')]
+            size = sum(os.path.getsize(path) for path in files) / 1e6
+            print(f"{'SegmentFanout':>30} {workers:>8} {prepared:>12.2f} {seconds:>11.2f} "
+                  f"{len(files) / seconds:>13.1f} {size:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
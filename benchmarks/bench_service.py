@@ -0,0 +1,144 @@
+"""
+Analytics Service Load Test
+Sends concurrent keep-alive GET requests to the --serve analytics service on localhost and reports
+p50/p99 latency per route and the overall request rate. Starts the service on a synthetic dataset
+in a temporary directory unless --url points at a running one. The first request of each route is
+timed on its own: it loads, explores or renders, while the load test itself is served from the cache.
+
+Usage: python benchmarks/bench_service.py [--rows 100000] [--clients 32] [--requests 5000] [--url http://127.0.0.1:8050]
+"""
+
+import os
+import sys
+import time
+import json
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from urllib.parse import urlsplit
+import numpy as np
+
+from datagen import SyntheticDataGenerator
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(os.path.dirname(BENCH_DIR), 'fitness_nutrition_analysis.py')
+ROUTES = ['/health', '/findings', '/groups', '/groups/gender_summary', '/groups/workout_gender_interaction',
+          '/charts/summary.png', '/charts/insights.png']
+
+
+async def get(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, path: str) -> tuple:
+    """(status, body) of one GET on an open keep-alive connection"""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def first_requests(host: str, port: int) -> dict:
+    """Seconds of the first request of every route, one after the other"""
+    reader, writer = await asyncio.open_connection(host, port)
+    seconds = {}
+    for path in ROUTES:
+        start = time.perf_counter()
+        status, _ = await get(reader, writer, host, path)
+        seconds[path] = time.perf_counter() - start
+        if status != 200:
+            raise RuntimeError(f"GET {path} returned {status}")
+    writer.close()
+    return seconds
+
+
+async def load_test(host: str, port: int, clients: int, requests: int) -> tuple:
+    """Latencies per route of requests spread over clients concurrent connections, and the wall time"""
+    latencies = {path: [] for path in ROUTES}
+    counter = iter(range(requests))
+
+    async def client() -> None:
+        reader, writer = await asyncio.open_connection(host, port)
+        for i in counter:
+            path = ROUTES[i % len(ROUTES)]
+            start = time.perf_counter()
+            await get(reader, writer, host, path)
+            latencies[path].append(time.perf_counter() - start)
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return latencies, time.perf_counter() - start
+
+
+async def health(host: str, port: int) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    _, body = await get(reader, writer, host, '/health')
+    writer.close()
+    return json.loads(body)
+
+
+def wait_until_up(host: str, port: int, process: subprocess.Popen, timeout: float) -> None:
+    """Poll /health until the started service has loaded its data"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The service exited with code {process.returncode}")
+        try:
+            print(f"Service up: {asyncio.run(health(host, port))}")
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise TimeoutError(f"The service did not answer within {timeout:.0f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default=None, help="a running service; by default one is started")
+    parser.add_argument('--rows', type=int, default=100_000, help="synthetic rows of the started service")
+    parser.add_argument('--port', type=int, default=8057, help="port of the started service")
+    parser.add_argument('--clients', type=int, default=32, help="concurrent keep-alive connections")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--timeout', type=float, default=600, help="seconds to wait for the started service")
+    args = parser.parse_args()
+
+    process = None
+    with tempfile.TemporaryDirectory() as work_dir:
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            host, port = '127.0.0.1', args.port
+            data_file = SyntheticDataGenerator().cached_file(os.path.join(BENCH_DIR, 'data'), args.rows)
+            log = open(os.path.join(work_dir, 'service.log'), 'w')
+            process = subprocess.Popen([sys.executable, SCRIPT, '--data', data_file, '--serve',
+                                        '--port', str(port)], cwd=work_dir, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            if process:
+                wait_until_up(host, port, process, args.timeout)
+            print(f"\n{'first request':>36} {'time (ms)':>10}")
+            for path, seconds in asyncio.run(first_requests(host, port)).items():
+                print(f"{path:>36} {seconds * 1000:>10.1f}")
+
+            latencies, seconds = asyncio.run(load_test(host, port, args.clients, args.requests))
+            print(f"\n{args.requests} requests over {args.clients} connections: "
+                  f"{args.requests / seconds:,.0f} requests/s")
+            print(f"{'route':>36} {'requests':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9}")
+            for path, values in latencies.items():
+                values = np.array(values) * 1000
+                print(f"{path:>36} {len(values):>9} {np.percentile(values, 50):>9.2f} "
+                      f"{np.percentile(values, 99):>9.2f} {values.max():>9.2f}")
+        finally:
+            if process:
+                process.terminate()
+                process.wait()
+                log.close()
+
+
+if __name__ == "__main__":
+    main()
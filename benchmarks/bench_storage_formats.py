@@ -0,0 +1,72 @@
+"""
+Storage Format Benchmark
+Write time, read time and file size of processed data in each storage format
+(CSV, Parquet, Feather/Arrow IPC), plus a column-subset read.
+
+Usage: python benchmarks/bench_storage_formats.py [--sizes 20000 1000000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import CsvStorage, FeatherStorage, ParquetStorage
+
+FORMATS = {
+    'csv': CsvStorage(),
+    'parquet-zstd': ParquetStorage('zstd'),
+    'parquet-snappy': ParquetStorage('snappy'),
+    'feather': FeatherStorage(),
+    'feather-lz4': FeatherStorage('lz4'),
+}
+SUBSET = ['Workout_Type', 'Gender', 'Calories_Burned']
+
+
+def make_frame(n_rows: int, n_numeric: int = 40, seed: int = 42) -> pd.DataFrame:
+    """A processed-data-shaped frame: ~40 float columns plus the categorical keys"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        rng.normal(100, 25, (n_rows, n_numeric)).round(2),
+        columns=[f'metric_{i}' for i in range(n_numeric)]
+    )
+    df['Calories_Burned'] = rng.normal(1280, 500, n_rows).round(1)
+    df['Workout_Type'] = pd.Categorical(rng.choice(['Cardio', 'HIIT', 'Strength', 'Yoga'], n_rows))
+    df['Gender'] = pd.Categorical(rng.choice(['Female', 'Male'], n_rows))
+    df['Age_Group'] = pd.Categorical(rng.choice(['18-25', '26-35', '36-45', '46-55', '55+'], n_rows), ordered=True)
+    return df
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20_000, 1_000_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in args.sizes:
+            df = make_frame(n_rows)
+            print(f"\n{n_rows:,} rows x {df.shape[1]} columns")
+            print(f"{'format':>15} {'write (s)':>10} {'read (s)':>9} {'read 3 cols (s)':>16} {'size (MB)':>10}  dtypes kept")
+            for name, storage in FORMATS.items():
+                path = storage.path(os.path.join(tmp_dir, f"bench_{name}"))
+                write_time = timed(lambda: storage.write(df, path, index=True))
+                read_time = timed(lambda: storage.read(path, index=True))
+                subset_time = timed(lambda: storage.read(path, columns=SUBSET, index=True))
+                restored = storage.read(path, index=True)
+                dtypes_kept = (restored.dtypes == df.dtypes).all()
+                size_mb = os.path.getsize(path) / 1e6
+                print(f"{name:>15} {write_time:>10.3f} {read_time:>9.3f} {subset_time:>16.3f} {size_mb:>10.1f}  {dtypes_kept}")
+
+
+if __name__ == "__main__":
+    main()
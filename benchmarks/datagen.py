@@ -0,0 +1,139 @@
+"""
+Synthetic Data Generator
+Writes workout sessions with the dataset's schema (missing values, duplicate rows and outliers
+included) for the benchmarks and tests, or for analyzing a large input offline with --data.
+
+Usage: python benchmarks/datagen.py ROWS [--output benchmarks/data/sessions.csv] [--seed 42]
+"""
+
+import os
+import sys
+import argparse
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fitness_nutrition_analysis import Config, storage_format_for_path
+
+
+class SyntheticDataGenerator:
+    """Synthetic workout sessions with the dataset's schema, for benchmarks, tests and offline runs
+    
+    Columns are Config.NUMERIC_COLS, Config.CATEGORICAL_COLS and BMI, with related distributions
+    (BMI from height and weight, heart rate and calories from workout type and duration), plus
+    missing values, outliers and exact duplicate rows. Rows are generated in fixed blocks seeded
+    by (seed, block), so a seed and row count always give the same data.
+    """
+    
+    BLOCK_ROWS = 100_000
+    WORKOUT_TYPES = np.array(['Cardio', 'HIIT', 'Strength', 'Yoga'], dtype=object)
+    # Per workout type: kcal per hour at the average heart rate, and its heart-rate offset
+    KCAL_PER_HOUR = np.array([1080.0, 1320.0, 1020.0, 720.0])
+    BPM_OFFSET = np.array([0.0, 8.0, -3.0, -10.0])
+    OUTLIER_COLS = Config.OUTLIER_COLS + ('Calories_Burned',)
+    
+    def __init__(self, seed: int = 42, missing_rate: float = 0.01, duplicate_rate: float = 0.01,
+                 outlier_rate: float = 0.005):
+        self.seed = seed
+        self.missing_rate = missing_rate
+        self.duplicate_rate = duplicate_rate
+        self.outlier_rate = outlier_rate
+    
+    def iter_chunks(self, n_rows: int) -> Iterator[pd.DataFrame]:
+        """n_rows sessions, one block at a time"""
+        for block, start in enumerate(range(0, n_rows, self.BLOCK_ROWS)):
+            yield self._block(block, min(self.BLOCK_ROWS, n_rows - start))
+    
+    def generate(self, n_rows: int) -> pd.DataFrame:
+        return pd.concat(self.iter_chunks(n_rows), ignore_index=True)
+    
+    def write(self, path: str, n_rows: int) -> str:
+        """Write n_rows sessions to path (format from its extension) without holding them all in memory"""
+        tmp_path = f"{path}.tmp{os.path.splitext(path)[1]}"
+        with storage_format_for_path(path).open_writer(tmp_path, index=False) as writer:
+            for chunk in self.iter_chunks(n_rows):
+                writer.write(chunk)
+        os.replace(tmp_path, path)
+        return path
+    
+    def cached_file(self, directory: str, n_rows: int, extension: str = '.csv') -> str:
+        """Path of a generated file with n_rows sessions, writing it the first time"""
+        path = os.path.join(directory, f"synthetic_{n_rows}_seed{self.seed}{extension}")
+        if not os.path.exists(path):
+            os.makedirs(directory, exist_ok=True)
+            print(f"📝 Generating {n_rows:,} synthetic sessions...")
+            self.write(path, n_rows)
+            print(f"✓ Synthetic data saved to: {path}")
+        return path
+    
+    def _block(self, block: int, n: int) -> pd.DataFrame:
+        rng = np.random.default_rng([self.seed, block])
+        male = rng.random(n) < 0.5
+        experience = rng.choice([1, 2, 3], n, p=[0.4, 0.4, 0.2])
+        workout = rng.integers(0, len(self.WORKOUT_TYPES), n)
+        height = np.where(male, rng.normal(1.77, 0.08, n), rng.normal(1.64, 0.07, n)).round(2)
+        weight = (rng.normal(24.5, 4.0, n).clip(16, 42) * height ** 2).round(1)
+        duration = rng.normal(1.0 + 0.15 * experience, 0.3).clip(0.5, 2.0).round(2)
+        avg_bpm = (rng.normal(143, 12, n) + self.BPM_OFFSET[workout]).round(0)
+        calories = (self.KCAL_PER_HOUR[workout] * duration * avg_bpm / 143 * np.sqrt(weight / 73)
+                    + rng.normal(0, 100, n)).clip(150).round(1)
+        columns = {
+            'Age': rng.integers(18, 60, n).astype(float),
+            'Gender': np.where(male, 'Male', 'Female').astype(object),
+            'Weight (kg)': weight,
+            'Height (m)': height,
+            'Avg_BPM': avg_bpm,
+            'Session_Duration (hours)': duration,
+            'Calories_Burned': calories,
+            'Workout_Type': self.WORKOUT_TYPES[workout],
+            'Fat_Percentage': (np.where(male, 20.0, 28.0) - 2.0 * experience + rng.normal(0, 5, n)).clip(8, 45).round(1),
+            'Water_Intake (liters)': (rng.normal(2.3, 0.4, n) + 0.5 * male).clip(1.5, 3.7).round(1),
+            'Workout_Frequency (days/week)': (experience + rng.integers(1, 3, n)).clip(2, 5).astype(float),
+            'Experience_Level': experience.astype(float),
+            'BMI': (weight / height ** 2).round(2),
+        }
+        
+        # Outliers: a few values scaled far up or down, as data-entry errors would be
+        for col in self.OUTLIER_COLS:
+            rows = rng.random(n) < self.outlier_rate
+            factors = np.where(rng.random(rows.sum()) < 0.5, rng.uniform(1.6, 2.5, rows.sum()),
+                               rng.uniform(0.3, 0.6, rows.sum()))
+            columns[col][rows] = (columns[col][rows] * factors).round(2)
+        
+        # Missing values in every column cleaning imputes
+        for col in Config.NUMERIC_COLS + Config.CATEGORICAL_COLS:
+            if col in columns:
+                columns[col][rng.random(n) < self.missing_rate] = None if columns[col].dtype == object else np.nan
+        
+        # Exact duplicates: some rows overwritten with copies of other rows of the block
+        targets = rng.choice(n, int(n * self.duplicate_rate), replace=False)
+        sources = rng.integers(0, n, len(targets))
+        for values in columns.values():
+            values[targets] = values[sources]
+        
+        df = pd.DataFrame(columns)
+        # Whole-number columns stay integers, with <NA> where missing
+        for col in ('Workout_Frequency (days/week)', 'Experience_Level'):
+            df[col] = df[col].astype('Int64')
+        return df
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('rows', type=int, help="sessions to generate")
+    parser.add_argument('--output', default=None,
+                        help="CSV/Parquet/Feather file to write (default: cached in benchmarks/data/)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator(args.seed)
+    if args.output:
+        print(f"✓ Synthetic data saved to: {generator.write(args.output, args.rows)}")
+    else:
+        generator.cached_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'), args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,31 +4,100 @@ A comprehensive OOP-based analysis of Workout, Nutrition, and Health Metrics dat
 Author: Data Science Expert
 """
 
+from __future__ import annotations
+
 import os
+import abc
+import ast
+import asyncio
+import sys
+import glob
+import json
+import re
+import time
+import pickle
+import hashlib
+import inspect
+import shutil
+import cProfile
+import argparse
+import datetime
+import platform
+import functools
+import itertools
 import warnings
+import contextlib
+import tempfile
+import multiprocessing
+import tracemalloc
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from urllib.parse import unquote, urlsplit
 import numpy as np
 import pandas as pd
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import seaborn as sns
-import kagglehub
-from dataclasses import dataclass
-from typing import Dict, Optional
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+try:
+    import resource
+except ImportError:  # no getrusage on Windows; peak RSS is then left out of run reports
+    resource = None
 
 warnings.filterwarnings('ignore')
-sns.set_style('whitegrid')
-plt.rcParams['figure.dpi'] = 100
+
+
+@functools.lru_cache(maxsize=None)
+def _pyplot():
+    """matplotlib.pyplot with the Agg backend and the chart style, imported on first use
+    
+    matplotlib and seaborn take seconds to import, so runs that draw nothing never load them.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    sns.set_style('whitegrid')
+    plt.rcParams['figure.dpi'] = 100
+    return plt
 
 
 @dataclass
 class Config:
     """Configuration class containing all constants and paths"""
     KAGGLE_DATASET: str = "zeesolver/final-dataset"
+    # A local data file, directory or glob pattern of shards to analyze instead of the Kaggle download
+    DATA_FILE: Optional[str] = None
+    # Manifest of downloaded datasets with checksums, so reruns never touch the network
+    DATA_CACHE_DIR: str = 'final_output/data_cache'
+    VERIFY_DATA: bool = False
     OUTPUT_DIR: str = 'final_output'
     CHART_DIR: str = 'final_output/charts'
-    PROCESSED_DATA_PATH: str = 'final_output/processed_data.csv'
-    RAW_DATA_BACKUP_PATH: str = 'final_output/raw_data.csv'
+    # The file extension follows STORAGE_FORMAT ('parquet', 'feather' or 'csv')
+    PROCESSED_DATA_PATH: str = 'final_output/processed_data.parquet'
+    RAW_DATA_BACKUP_PATH: str = 'final_output/raw_data.parquet'
+    STORAGE_FORMAT: str = 'parquet'
+    PARQUET_COMPRESSION: str = 'zstd'
+    # Compact loading: float32/small ints/categoricals at read time, optionally only USECOLS
+    COMPACT_DTYPES: bool = False
+    USECOLS: Optional[tuple] = None
+    RENDER_WORKERS: int = 2
+    # Per-segment dashboards: a summary and insights pair for every value combination of these columns
+    SEGMENT_BY: Optional[tuple] = None
+    SEGMENT_DIR: str = 'final_output/charts/segments'
+    SEGMENT_DPI: int = 50
+    # Dashboard rasterization: a Visualizer.PROFILES name ('preview', 'web' or 'print'), optionally another file format
+    RENDER_PROFILE: str = 'print'
+    CHART_FORMAT: Optional[str] = None
+    # Processed rows partitioned by segment plus an aggregate cube, for ResultsStore queries; None skips it
+    RESULTS_STORE_DIR: Optional[str] = 'final_output/results_store'
+    # Processes parsing and cleaning the files of a sharded input (--data 'dir/*.csv') in memory
+    INGEST_WORKERS: int = os.cpu_count() or 1
     TARGET_COLUMN: str = 'Calories_Burned'
     NUMERIC_COLS: tuple = (
         'Age', 'Weight (kg)', 'Height (m)', 'Session_Duration (hours)',
@@ -38,415 +107,3962 @@ class Config:
     CATEGORICAL_COLS: tuple = (
         'Gender', 'Workout_Type', 'Experience_Level'
     )
+    OUTLIER_COLS: tuple = (
+        'Age', 'Weight (kg)', 'Height (m)', 'Avg_BPM'
+    )
+    CHUNK_SIZE: int = 100_000
+    CACHE_DIR: str = 'final_output/cache'
+    CACHE_MAX_BYTES: int = 1024 ** 3
+    USE_CACHE: bool = True
+    # Mergeable statistics saved by streaming runs, updated in place by --append runs; the hashes of the rows
+    # seen so far go in run files under analysis_state_hashes/ beside it
+    STATE_PATH: str = 'final_output/analysis_state.pkl'
+    # Rank error of mergeable quantile sketches for outlier bounds and medians; None keeps them exact
+    QUANTILE_SKETCH_ERROR: Optional[float] = None
+    # The same for streaming and --append runs while QUANTILE_SKETCH_ERROR is None, so their memory depends on
+    # the chunk size rather than on the number of distinct values; None keeps them exact as well
+    STREAMING_SKETCH_ERROR: Optional[float] = 0.001
+    # 'pearson' or 'spearman' (exact ranks in memory, approximate ones when streaming); only the correlations
+    # with TARGET_COLUMN unless disabled
+    CORRELATION_METHOD: str = 'pearson'
+    CORRELATION_TARGET_ONLY: bool = True
+    # Instrumentation: per-step JSON run report, tracemalloc peaks in it, and a cProfile dump
+    PROFILE: bool = False
+    RUN_REPORT_PATH: str = 'final_output/run_report.json'
+    PROFILE_MEMORY: bool = False
+    CPROFILE_PATH: Optional[str] = None
+    # Local analytics service (--serve): address, LRU cache entries and seconds between input change checks
+    SERVE_HOST: str = '127.0.0.1'
+    SERVE_PORT: int = 8050
+    SERVE_CACHE_ITEMS: int = 64
+    SERVE_POLL_SECONDS: float = 2.0
+
+
+def _max_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _frame_rows(values: tuple) -> Optional[int]:
+    """Row count of the first DataFrame among values"""
+    for value in values:
+        if isinstance(value, pd.DataFrame):
+            return len(value)
+    return None
+
+
+class ProfileStep:
+    """An open profiled step; code inside it may set rows_out"""
+    __slots__ = ('rows_in', 'rows_out')
+    
+    def __init__(self, rows_in: Optional[int] = None):
+        self.rows_in = rows_in
+        self.rows_out = None
+
+
+class RunProfiler:
+    """Wall time, CPU time, memory and row counts of nested pipeline steps
+    
+    Steps nest by call order into paths like 'run/in_memory_stages/clean_data/cap_outliers';
+    repeated calls of one path (per chunk, per column) are summed. Python allocation peaks are
+    only traced, at a noticeable cost, with trace_memory.
+    """
+    
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.steps: Dict[str, Dict[str, object]] = {}
+        self._stack: List[str] = []
+        # tracemalloc peak reached by the finished children of each open step
+        self._child_peaks: List[int] = []
+    
+    @contextlib.contextmanager
+    def step(self, name: str, rows_in: Optional[int] = None) -> Iterator[ProfileStep]:
+        path = f"{self._stack[-1]}/{name}" if self._stack else name
+        record = self.steps.setdefault(path, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rows_in': None,
+                                              'rows_out': None, 'max_rss_mb': None, 'rss_growth_mb': 0.0})
+        self._stack.append(path)
+        handle = ProfileStep(rows_in)
+        rss_before = _max_rss_mb()
+        if self.trace_memory:
+            traced_before, peak = tracemalloc.get_traced_memory()
+            if self._child_peaks:
+                self._child_peaks[-1] = max(self._child_peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._child_peaks.append(0)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield handle
+        finally:
+            record['calls'] += 1
+            record['wall_s'] += time.perf_counter() - wall
+            record['cpu_s'] += time.process_time() - cpu
+            for key in ('rows_in', 'rows_out'):
+                rows = getattr(handle, key)
+                if rows is not None:
+                    record[key] = (record[key] or 0) + rows
+            rss_after = _max_rss_mb()
+            if rss_after is not None:
+                record['max_rss_mb'] = rss_after
+                record['rss_growth_mb'] += rss_after - rss_before
+            if self.trace_memory:
+                peak = max(self._child_peaks.pop(), tracemalloc.get_traced_memory()[1])
+                record['alloc_peak_mb'] = max(record.get('alloc_peak_mb', 0.0), (peak - traced_before) / 1024 ** 2)
+                if self._child_peaks:
+                    self._child_peaks[-1] = max(self._child_peaks[-1], peak)
+            self._stack.pop()
+    
+    def merge(self, steps: Dict[str, Dict[str, object]]) -> None:
+        """Add steps recorded by another profiler (e.g. in a render worker) under the open step"""
+        prefix = f"{self._stack[-1]}/" if self._stack else ''
+        for path, other in steps.items():
+            record = self.steps.setdefault(prefix + path, dict(other, calls=0, wall_s=0.0, cpu_s=0.0,
+                                                                rows_in=None, rows_out=None, rss_growth_mb=0.0))
+            for key in ('calls', 'wall_s', 'cpu_s', 'rss_growth_mb'):
+                record[key] += other[key]
+            for key in ('rows_in', 'rows_out'):
+                if other[key] is not None:
+                    record[key] = (record[key] or 0) + other[key]
+            for key in ('max_rss_mb', 'alloc_peak_mb'):
+                if other.get(key) is not None:
+                    record[key] = max(record.get(key) or 0.0, other[key])
+    
+    def report(self, **meta) -> Dict[str, object]:
+        """The JSON-ready run report: meta fields plus one entry per step path, in first-call order"""
+        steps = [{'path': path, 'depth': path.count('/'), **{key: round(value, 6) if isinstance(value, float) else value
+                                                            for key, value in record.items()}}
+                 for path, record in self.steps.items()]
+        return {**meta, 'steps': steps}
+
+
+class _NullStep:
+    """Stands in for ProfileStep when profiling is off: stateless, so one instance serves every caller and thread"""
+    __slots__ = ()
+    rows_in = rows_out = None
+    
+    def __setattr__(self, name: str, value: object) -> None:
+        pass
+
+
+# The profiler that profiled steps report to; None (the default) makes every step a no-op
+_active_profiler: Optional[RunProfiler] = None
+_NO_STEP = contextlib.nullcontext(_NullStep())
+
+
+@contextlib.contextmanager
+def profiling(profiler: Optional[RunProfiler]) -> Iterator[Optional[RunProfiler]]:
+    """Send profiled steps to profiler while the block runs"""
+    global _active_profiler
+    previous, _active_profiler = _active_profiler, profiler
+    start_tracing = profiler is not None and profiler.trace_memory and not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+    try:
+        yield profiler
+    finally:
+        _active_profiler = previous
+        if start_tracing:
+            tracemalloc.stop()
+
+
+def profile_step(name: str, rows_in: Optional[int] = None):
+    """Time a block as a step of the active profiler, or do nothing when profiling is off"""
+    profiler = _active_profiler
+    return _NO_STEP if profiler is None else profiler.step(name, rows_in)
+
+
+def profiled(name: str) -> Callable:
+    """Profile every call of the decorated function, counting rows of its first DataFrame argument and result"""
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active_profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.step(name, _frame_rows(args)) as step:
+                result = func(*args, **kwargs)
+                step.rows_out = _frame_rows((result,))
+            return result
+        return wrapper
+    return decorate
+
+
+def _profiled_chunks(chunks: Iterator[pd.DataFrame], name: str = 'read_chunk') -> Iterator[pd.DataFrame]:
+    """Yield chunks, timing each read as a step"""
+    chunks = iter(chunks)
+    while True:
+        with profile_step(name) as step:
+            chunk = next(chunks, None)
+            step.rows_out = None if chunk is None else len(chunk)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def _plain_index(index: pd.Index) -> pd.Index:
+    """Strip categorical levels so indexes from different chunks align on values"""
+    if isinstance(index, pd.MultiIndex):
+        return pd.MultiIndex.from_arrays(
+            [np.asarray(index.get_level_values(i), dtype=object) for i in range(index.nlevels)],
+            names=index.names
+        )
+    return pd.Index(np.asarray(index, dtype=object), name=index.name)
+
+
+def _quantile_from_counts(counts: pd.Series, q: float) -> float:
+    """Exact linearly-interpolated quantile from a value -> count Series"""
+    counts = counts[counts > 0].sort_index()
+    return _quantile_from_sorted_counts(counts.index.to_numpy(dtype=float), counts.to_numpy(), q)
+
+
+def _quantile_from_sorted_counts(values: np.ndarray, counts: np.ndarray, q: float) -> float:
+    """Exact linearly-interpolated quantile from ascending distinct values and their positive counts"""
+    if not len(values):
+        return np.nan
+    cumulative = counts.cumsum()
+    position = q * (cumulative[-1] - 1)
+    lower, upper = int(np.floor(position)), int(np.ceil(position))
+    lower_value = values[np.searchsorted(cumulative, lower, side='right')]
+    upper_value = values[np.searchsorted(cumulative, upper, side='right')]
+    return lower_value + (upper_value - lower_value) * (position - lower)
+
+
+class ValueCountAccumulator:
+    """Mergeable value counts giving exact medians, quantiles and modes across chunks"""
+    
+    def __init__(self):
+        self.counts: Optional[pd.Series] = None
+    
+    def update(self, series: pd.Series) -> None:
+        """Add the non-null values of a chunk's column"""
+        chunk_counts = series.value_counts(dropna=True)
+        chunk_counts = chunk_counts[chunk_counts > 0]
+        chunk_counts.index = _plain_index(chunk_counts.index)
+        if self.counts is None:
+            self.counts = chunk_counts
+        else:
+            self.counts = self.counts.add(chunk_counts, fill_value=0)
+    
+    @property
+    def total(self) -> int:
+        return 0 if self.counts is None else int(self.counts.sum())
+    
+    def quantile(self, q: float) -> float:
+        """Exact quantile matching pandas' linear interpolation"""
+        if self.counts is None:
+            return np.nan
+        return _quantile_from_counts(self.counts, q)
+    
+    def quantiles(self, qs: List[float]) -> np.ndarray:
+        """Several exact quantiles from one sort of the counts"""
+        if self.counts is None:
+            return np.full(len(qs), np.nan)
+        counts = self.counts[self.counts > 0].sort_index()
+        values = counts.index.to_numpy(dtype=float)
+        return np.array([_quantile_from_sorted_counts(values, counts.to_numpy(), q) for q in qs])
+    
+    def merge(self, other: 'ValueCountAccumulator') -> None:
+        """Add the counts of an accumulator filled elsewhere (another chunk, file or process)"""
+        if other.counts is None:
+            return
+        if self.counts is None:
+            self.counts = other.counts
+        else:
+            self.counts = self.counts.add(other.counts, fill_value=0)
+    
+    def median(self) -> float:
+        return self.quantile(0.5)
+    
+    def mode(self):
+        """Most frequent value, smallest value on ties (as pandas.Series.mode)"""
+        if self.counts is None or self.counts.empty:
+            return None
+        return self.counts.sort_index().idxmax()
+
+
+class QuantileSketch:
+    """Mergeable t-digest style quantile sketch with a bounded rank error
+    
+    Values are summarized as weighted centroids sized by the arcsine scale function, so they are
+    smallest in the tails. A compression of pi / (2 * error) keeps the rank error of any estimate
+    below `error`, with about compression / 2 centroids whatever the number of values.
+    """
+    
+    def __init__(self, error: float = 0.001):
+        self.error = error
+        self.compression = int(np.ceil(np.pi / (2 * error)))
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+        # q at each whole step of the scale function, where one centroid ends and the next starts
+        steps = np.arange(1, self.compression // 2 + 1)
+        self._boundaries = (np.sin(2 * np.pi * steps / self.compression - np.pi / 2) + 1) / 2
+    
+    @property
+    def total(self) -> int:
+        return int(self.weights.sum())
+    
+    def update(self, values) -> None:
+        """Add a chunk's non-null values (Series or array)"""
+        if isinstance(values, pd.Series):
+            values = values.to_numpy(dtype=float, na_value=np.nan)
+        values = np.sort(np.asarray(values, dtype=float))
+        values = values[:len(values) - np.isnan(values).sum()]  # NaN sorts last
+        if not len(values):
+            return
+        self.min, self.max = min(self.min, values[0]), max(self.max, values[-1])
+        # Sorted unit weights: cut at the scale-function boundaries directly, no per-value scale math
+        starts = np.unique(np.r_[0, np.ceil(self._boundaries * len(values) - 0.5).astype(np.int64)])
+        starts = starts[starts < len(values)]
+        weights = np.diff(np.r_[starts, len(values)]).astype(float)
+        self._add(np.add.reduceat(values, starts) / weights, weights)
+    
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Fold another sketch (e.g. from another chunk or worker) into this one"""
+        if other.weights.size:
+            self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+            self._add(other.means, other.weights)
+    
+    @classmethod
+    def merged(cls, sketches: List['QuantileSketch']) -> 'QuantileSketch':
+        """One sketch of the values of all sketches, their centroids compressed once instead of merge by merge"""
+        sketch = cls(sketches[0].error)
+        sketches = [other for other in sketches if other.weights.size]
+        if sketches:
+            sketch.min, sketch.max = min(other.min for other in sketches), max(other.max for other in sketches)
+            means = np.concatenate([other.means for other in sketches])
+            weights = np.concatenate([other.weights for other in sketches])
+            order = np.argsort(means, kind='stable')
+            sketch.means, sketch.weights = sketch._compress(means[order], weights[order])
+        return sketch
+    
+    def _add(self, means: np.ndarray, weights: np.ndarray) -> None:
+        if not self.weights.size:
+            self.means, self.weights = means, weights
+            return
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind='stable')
+        self.means, self.weights = self._compress(means[order], weights[order])
+    
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Merge neighbouring centroids whose midpoints fall in the same scale-function step"""
+        cumulative = np.cumsum(weights)
+        middle = (cumulative - weights / 2) / cumulative[-1]
+        step = np.searchsorted(self._boundaries, middle, side='right')
+        starts = np.flatnonzero(np.r_[True, step[1:] != step[:-1]])
+        merged_weights = np.add.reduceat(weights, starts)
+        return np.add.reduceat(means * weights, starts) / merged_weights, merged_weights
+    
+    def quantiles(self, qs: List[float]) -> np.ndarray:
+        """Estimates interpolated as pandas does between order statistics, centroids standing in for them"""
+        if not self.weights.size:
+            return np.full(len(qs), np.nan)
+        total = self.weights.sum()
+        # 0-based rank of each centroid's middle value
+        positions = np.cumsum(self.weights) - (self.weights + 1) / 2
+        return np.interp(np.asarray(qs, dtype=float) * (total - 1),
+                         np.r_[0.0, positions, total - 1], np.r_[self.min, self.means, self.max])
+    
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+    
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+
+def _quantile_accumulator(sketch_error: Optional[float] = None):
+    """Exact value counts, or a QuantileSketch with the given rank error"""
+    return ValueCountAccumulator() if sketch_error is None else QuantileSketch(sketch_error)
+
+
+class ChunkWriter(abc.ABC):
+    """Writes a DataFrame to one file chunk by chunk; use as a context manager"""
+    
+    @abc.abstractmethod
+    def write(self, df: pd.DataFrame) -> None:
+        """Append one chunk of rows"""
+    
+    def close(self) -> None:
+        pass
+    
+    def abort(self) -> None:
+        """Discard a partially written file"""
+        pass
+    
+    def __enter__(self) -> 'ChunkWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class CsvChunkWriter(ChunkWriter):
+    """Writes the header with the first chunk and appends the rest"""
+    
+    def __init__(self, path: str, index: bool):
+        self.path = path
+        self.index = index
+        self._started = False
+    
+    @profiled('write_chunk')
+    def write(self, df: pd.DataFrame) -> None:
+        df.to_csv(self.path, index=self.index, mode='a' if self._started else 'w', header=not self._started)
+        self._started = True
+
+
+class ArrowChunkWriter(ChunkWriter):
+    """Appends chunks to a Parquet/Arrow IPC file with the first chunk's schema"""
+    
+    def __init__(self, path: str, open_writer: Callable[[str, pa.Schema], object], index: bool):
+        # Written beside the target and renamed on close: frames memory-mapped from the
+        # previous file keep reading the old inode instead of seeing it rewritten
+        self.path = path
+        self._tmp_path = f"{path}.tmp"
+        self._open_writer = open_writer
+        self.index = index
+        self._writer = None
+        self._schema: Optional[pa.Schema] = None
+        self._categories: Dict[str, list] = {}
+        self._empty: Optional[pd.DataFrame] = None
+    
+    @profiled('write_chunk')
+    def write(self, df: pd.DataFrame) -> None:
+        if self._writer is None and df.empty:
+            # Categoricals of an empty frame have no category type to build the file's schema from
+            self._empty = df
+            return
+        df = self._extend_categories(df)
+        if self._schema is not None:
+            df = self._match_integer_columns(df)
+        if self.index:
+            # A RangeIndex is stored only as schema metadata, which would pin every chunk to the first one's range
+            df.index = pd.Index(df.index.to_numpy(), name=df.index.name)
+        table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=self.index)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open_writer(self._tmp_path, table.schema)
+        self._writer.write_table(table)
+    
+    def _extend_categories(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Grow each categorical's categories append-only, so later dictionaries extend earlier ones"""
+        df = df.copy(deep=False)
+        for col in df.columns:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                continue
+            known = self._categories.setdefault(col, [])
+            known_set = set(known)
+            known.extend(c for c in df[col].cat.categories if c not in known_set)
+            if list(df[col].cat.categories) != known:
+                df[col] = df[col].cat.set_categories(known)
+        return df
+    
+    def _match_integer_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Integer columns read as float in a later chunk (because of NaN) go back to nullable ints"""
+        for field_ in self._schema:
+            if pa.types.is_integer(field_.type) and field_.name in df.columns and df[field_.name].dtype.kind == 'f':
+                df[field_.name] = df[field_.name].astype('Int64')
+        return df
+    
+    def close(self) -> None:
+        if self._writer is None and self._empty is not None:
+            self._writer = self._open_writer(self._tmp_path, pa.Schema.from_pandas(self._empty, preserve_index=self.index))
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(self._tmp_path, self.path)
+    
+    def abort(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            os.remove(self._tmp_path)
+
+
+def _arrow_index_columns(schema: pa.Schema) -> List[str]:
+    """Columns holding the pandas index of an Arrow schema (a RangeIndex is stored as metadata, not as a column)"""
+    metadata = schema.pandas_metadata or {}
+    return [col for col in metadata.get('index_columns', []) if isinstance(col, str)]
+
+
+def _arrow_to_pandas(table: Union[pa.Table, pa.RecordBatch], index: bool, offset: int = 0) -> pd.DataFrame:
+    """A table read from a file as a DataFrame, with the file's stored index
+    
+    Without index, rows are numbered from offset. split_blocks keeps null-free numeric columns as views
+    over a memory-mapped file.
+    """
+    df = table.to_pandas(split_blocks=True)
+    if not index:
+        df.index = pd.RangeIndex(offset, offset + len(df))
+    return df
+
+
+class StorageFormat(abc.ABC):
+    """Reads and writes DataFrames in one on-disk format"""
+    
+    name = ''
+    extension = ''
+    
+    def path(self, path: str) -> str:
+        """path with this format's file extension"""
+        return os.path.splitext(path)[0] + self.extension
+    
+    def write(self, df: pd.DataFrame, path: str, index: bool) -> None:
+        with self.open_writer(path, index) as writer:
+            writer.write(df)
+    
+    @abc.abstractmethod
+    def open_writer(self, path: str, index: bool) -> ChunkWriter:
+        """Writer for the file at path, storing the frames' index with index"""
+    
+    @abc.abstractmethod
+    def read(self, path: str, columns: Optional[List[str]] = None, index: bool = False) -> pd.DataFrame:
+        """The whole file (only columns, if given); its stored index with index, rows numbered from 0 without"""
+    
+    @abc.abstractmethod
+    def iter_chunks(self, path: str, chunk_size: int, index: bool = False) -> Iterator[pd.DataFrame]:
+        """The file in chunks of at most chunk_size rows, indexed as read would index the whole file"""
+    
+    def part_paths(self, path: str) -> List[str]:
+        """Batches appended to the dataset at path, oldest first"""
+        stem, extension = os.path.splitext(path)
+        return sorted(glob.glob(f"{glob.escape(stem)}.part-*{extension}"))
+    
+    def open_append_writer(self, path: str, index: bool) -> ChunkWriter:
+        """Writer for one more batch of the dataset at path, saved as a numbered part file beside it"""
+        stem, extension = os.path.splitext(path)
+        return self.open_writer(f"{stem}.part-{len(self.part_paths(path)) + 1:04d}{extension}", index)
+    
+    def remove_parts(self, path: str) -> None:
+        """Drop appended batches once the dataset at path is rewritten in full"""
+        for part in self.part_paths(path):
+            os.remove(part)
+
+
+class CsvStorage(StorageFormat):
+    """Plain CSV; loses dtypes and must be parsed in full on every read"""
+    
+    name = 'csv'
+    extension = '.csv'
+    
+    def open_writer(self, path: str, index: bool) -> ChunkWriter:
+        return CsvChunkWriter(path, index)
+    
+    def read(self, path: str, columns: Optional[List[str]] = None, index: bool = False) -> pd.DataFrame:
+        if index and columns is not None:
+            return pd.read_csv(path, index_col=0).loc[:, columns]
+        return pd.read_csv(path, usecols=columns, index_col=0 if index else None)
+    
+    def iter_chunks(self, path: str, chunk_size: int, index: bool = False) -> Iterator[pd.DataFrame]:
+        return iter(pd.read_csv(path, chunksize=chunk_size, index_col=0 if index else None))
+
+
+class ParquetStorage(StorageFormat):
+    """Compressed columnar Parquet; keeps dtypes and reads only the requested columns"""
+    
+    name = 'parquet'
+    extension = '.parquet'
+    
+    def __init__(self, compression: str = 'zstd'):
+        self.compression = compression
+    
+    def open_writer(self, path: str, index: bool) -> ChunkWriter:
+        return ArrowChunkWriter(
+            path, lambda tmp_path, schema: pq.ParquetWriter(tmp_path, schema, compression=self.compression), index
+        )
+    
+    def read(self, path: str, columns: Optional[List[str]] = None, index: bool = False) -> pd.DataFrame:
+        table = pq.read_table(path, columns=columns, memory_map=True, use_pandas_metadata=index)
+        return _arrow_to_pandas(table, index)
+    
+    def iter_chunks(self, path: str, chunk_size: int, index: bool = False) -> Iterator[pd.DataFrame]:
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        offset = 0
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield _arrow_to_pandas(batch, index, offset)
+            offset += batch.num_rows
+
+
+class FeatherStorage(StorageFormat):
+    """Arrow IPC (Feather v2); uncompressed files are memory-mapped and read without copying"""
+    
+    name = 'feather'
+    extension = '.feather'
+    
+    def __init__(self, compression: Optional[str] = None):
+        self.compression = compression
+    
+    def open_writer(self, path: str, index: bool) -> ChunkWriter:
+        options = pa.ipc.IpcWriteOptions(compression=self.compression, emit_dictionary_deltas=True)
+        return ArrowChunkWriter(path, lambda tmp_path, schema: pa.ipc.new_file(tmp_path, schema, options=options), index)
+    
+    def read(self, path: str, columns: Optional[List[str]] = None, index: bool = False) -> pd.DataFrame:
+        if index and columns is not None:
+            # Feather selects columns by name only, so the stored index columns are added explicitly
+            with pa.memory_map(path) as source:
+                stored = _arrow_index_columns(pa.ipc.open_file(source).schema)
+            columns = list(columns) + [col for col in stored if col not in columns]
+        return _arrow_to_pandas(feather.read_table(path, columns=columns, memory_map=True), index)
+    
+    def iter_chunks(self, path: str, chunk_size: int, index: bool = False) -> Iterator[pd.DataFrame]:
+        table = feather.read_table(path, memory_map=True)
+        for offset in range(0, table.num_rows, chunk_size):
+            yield _arrow_to_pandas(table.slice(offset, chunk_size), index, offset)
+
+
+STORAGE_FORMATS = {
+    CsvStorage.name: CsvStorage,
+    ParquetStorage.name: ParquetStorage,
+    FeatherStorage.name: FeatherStorage,
+}
+
+
+def get_storage_format(name: str, config: Optional['Config'] = None) -> StorageFormat:
+    """Storage format by name ('csv', 'parquet', 'feather')"""
+    if name not in STORAGE_FORMATS:
+        raise ValueError(f"Unknown storage format '{name}', expected one of {sorted(STORAGE_FORMATS)}")
+    if name == ParquetStorage.name and config is not None:
+        return ParquetStorage(config.PARQUET_COMPRESSION)
+    return STORAGE_FORMATS[name]()
+
+
+def storage_format_for_path(path: str) -> StorageFormat:
+    """Storage format matching a file's extension"""
+    extension = os.path.splitext(path)[1].lower()
+    for storage_cls in STORAGE_FORMATS.values():
+        if storage_cls.extension == extension or (storage_cls is FeatherStorage and extension in ('.arrow', '.ipc')):
+            return storage_cls()
+    raise ValueError(f"Unsupported data file type: {path}")
+
+
+@functools.lru_cache(maxsize=None)
+def _top_level_definitions(module_name: str) -> Dict[str, Tuple[int, int, frozenset]]:
+    """(first, last) source line and the names used by each top-level class and function in a module, from one parse"""
+    tree = ast.parse(inspect.getsource(sys.modules[module_name]))
+    return {
+        node.name: (min([node.lineno] + [d.lineno for d in node.decorator_list]), node.end_lineno,
+                    frozenset(name.id for name in ast.walk(node) if isinstance(name, ast.Name)))
+        for node in tree.body if isinstance(node, (ast.ClassDef, ast.FunctionDef))
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _code_source(module_name: str, name: str) -> str:
+    """Source of a top-level class or function and of every top-level class and function it uses, transitively
+    
+    Helpers such as _iqr_bounds or _row_hashes change a stage's output as much as its own methods do.
+    Config is left out: its values enter stage keys through CONFIG_FIELDS.
+    """
+    definitions = _top_level_definitions(module_name)
+    if name not in definitions:
+        raise KeyError(name)
+    used, pending = set(), [name]
+    while pending:
+        current = pending.pop()
+        if current not in used and current in definitions and current != 'Config':
+            used.add(current)
+            pending.extend(definitions[current][2])
+    lines = inspect.getsource(sys.modules[module_name]).splitlines()
+    return '\n'.join('\n'.join(lines[first - 1:last]) for first, last in sorted(definitions[current][:2] for current in used))
+
+
+def _stage_source(cls: type) -> str:
+    """Versioned source of a stage class (see _code_source); inspect.getsource re-parses the whole module on
+    every call"""
+    try:
+        return _code_source(cls.__module__, cls.__qualname__)
+    except (KeyError, OSError, TypeError):
+        return inspect.getsource(cls)
+
+
+class StageCache:
+    """Content-addressed on-disk cache of pipeline stage outputs with LRU eviction by total size"""
+    
+    MANIFEST = 'manifest.json'
+    OUTPUTS = 'outputs.json'
+    
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._manifest_path = os.path.join(cache_dir, self.MANIFEST)
+        self._manifest: Optional[Dict[str, dict]] = None
+        self._outputs: Optional[Dict[str, str]] = None
+    
+    @staticmethod
+    def file_digest(path: str, block_size: int = 1 << 20) -> str:
+        """Hash of a file's contents"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def stage_key(parent_key: str, stage: object, config: Optional['Config'] = None) -> str:
+        """Key of a stage's (class or instance) output: its input key, its Config fields and the source of its code"""
+        stage_cls = stage if isinstance(stage, type) else type(stage)
+        try:
+            code = _stage_source(stage_cls)
+        except (OSError, TypeError):
+            code = stage_cls.__qualname__
+        fields = {name: getattr(config, name) for name in getattr(stage, 'CONFIG_FIELDS', ())} if config else {}
+        payload = json.dumps([parent_key, stage_cls.__name__, code, fields], default=repr)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
+    @profiled('cache_get')
+    def get(self, key: str) -> Optional[object]:
+        """Return the cached value for key, or None on a miss"""
+        entry = self._load_manifest().get(key)
+        if entry is None:
+            return None
+        path = os.path.join(self.cache_dir, entry['file'])
+        if not os.path.exists(path):
+            del self._manifest[key]
+            self._save_manifest()
+            return None
+        
+        if entry['file'].endswith('.parquet'):
+            value = pd.read_parquet(path)
+        else:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        entry['last_used'] = time.time()
+        self._save_manifest()
+        return value
+    
+    @profiled('cache_put')
+    def put(self, key: str, value: object) -> None:
+        """Store value under key (DataFrames as Parquet when possible) and evict old entries"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        filename = None
+        if isinstance(value, pd.DataFrame):
+            try:
+                filename = f"{key}.parquet"
+                value.to_parquet(os.path.join(self.cache_dir, filename))
+            except (ImportError, ValueError, TypeError):
+                filename = None
+        if filename is None:
+            filename = f"{key}.pkl"
+            with open(os.path.join(self.cache_dir, filename), 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        size = os.path.getsize(os.path.join(self.cache_dir, filename))
+        self._load_manifest()[key] = {'file': filename, 'size': size, 'last_used': time.time()}
+        self._evict()
+        self._save_manifest()
+    
+    def output_is_current(self, path: str, key: str) -> bool:
+        """True if an output file exists and was last written from the given stage key"""
+        return os.path.exists(path) and self._load_outputs().get(os.path.abspath(path)) == key
+    
+    def mark_output(self, path: str, key: Optional[str]) -> None:
+        """Record the stage key an output file was written from (None: written outside the cache)"""
+        if key is None:
+            # Only an earlier record needs removing, so runs without the cache create no cache files
+            if self._load_outputs().pop(os.path.abspath(path), None) is None:
+                return
+        else:
+            self._load_outputs()[os.path.abspath(path)] = key
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(os.path.join(self.cache_dir, self.OUTPUTS), 'w') as f:
+            json.dump(self._outputs, f)
+    
+    def _load_outputs(self) -> Dict[str, str]:
+        if self._outputs is None:
+            path = os.path.join(self.cache_dir, self.OUTPUTS)
+            if os.path.exists(path):
+                with open(path) as f:
+                    self._outputs = json.load(f)
+            else:
+                self._outputs = {}
+        return self._outputs
+    
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = sorted(self._manifest.items(), key=lambda item: item[1]['last_used'])
+        total = sum(entry['size'] for _, entry in entries)
+        for key, entry in entries:
+            if total <= self.max_bytes:
+                break
+            path = os.path.join(self.cache_dir, entry['file'])
+            if os.path.exists(path):
+                os.remove(path)
+            total -= entry['size']
+            del self._manifest[key]
+    
+    def _load_manifest(self) -> Dict[str, dict]:
+        if self._manifest is None:
+            if os.path.exists(self._manifest_path):
+                with open(self._manifest_path) as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {}
+        return self._manifest
+    
+    def _save_manifest(self) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._manifest_path, 'w') as f:
+            json.dump(self._manifest, f)
+
+
+class OutputManager:
+    """Manages output directory structure and file saving operations"""
+    
+    def __init__(self, chart_dir: str, storage: Optional[StorageFormat] = None):
+        self.chart_dir = chart_dir
+        self.storage = storage or CsvStorage()
+    
+    def setup_output_directories(self) -> None:
+        """Create output directories if they don't exist"""
+        os.makedirs(self.chart_dir, exist_ok=True)
+        print(f"✓ Output directories created: {self.chart_dir}")
+    
+    @profiled('save_dataframe')
+    def save_dataframe(self, df: pd.DataFrame, filename: str) -> str:
+        """Save DataFrame in the configured storage format and return the written path"""
+        filename = self.storage.path(filename)
+        self.storage.remove_parts(filename)
+        self.storage.write(df, filename, index=True)
+        print(f"✓ Saved: {filename}")
+        return filename
+    
+    def open_dataframe_writer(self, filename: str) -> ChunkWriter:
+        """Writer that saves a DataFrame chunk by chunk, as save_dataframe would"""
+        filename = self.storage.path(filename)
+        self.storage.remove_parts(filename)
+        return self.storage.open_writer(filename, index=True)
+    
+    def open_dataframe_append_writer(self, filename: str) -> ChunkWriter:
+        """Writer adding a batch of rows to a saved DataFrame without rewriting it"""
+        return self.storage.open_append_writer(self.storage.path(filename), index=True)
+    
+    @profiled('load_dataframe')
+    def load_dataframe(self, filename: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read back a DataFrame written by save_dataframe, with any appended batches"""
+        filename = self.storage.path(filename)
+        frames = [self.storage.read(path, columns=columns, index=True)
+                  for path in [filename] + self.storage.part_paths(filename)]
+        if len(frames) == 1:
+            return frames[0]
+        df = pd.concat(frames)
+        # Parts carry their own categories; keep such columns categorical after the concat
+        for col in frames[0].columns:
+            if isinstance(frames[0][col].dtype, pd.CategoricalDtype) and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+        return df
+    
+    def iter_dataframe_chunks(self, filename: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Read back a DataFrame written by save_dataframe chunk by chunk, appended batches last"""
+        filename = self.storage.path(filename)
+        for path in [filename] + self.storage.part_paths(filename):
+            yield from self.storage.iter_chunks(path, chunk_size, index=True)
+    
+    @profiled('save_plot')
+    def save_plot(self, fig: plt.Figure, filename: str, profile: Optional[RenderProfile] = None) -> None:
+        """Save matplotlib figure to file, as profile rasterizes and encodes it (tight 300 dpi PNG by default)"""
+        if profile is None:
+            fig.savefig(filename, bbox_inches='tight', dpi=300)
+        else:
+            profile.save(fig, filename)
+        _pyplot().close(fig)
+        print(f"✓ Saved: {filename}")
+
+
+class SchemaLoader:
+    """Reads a data file chunk by chunk straight into compact dtypes, so the default-dtype frame never exists"""
+    
+    # Object columns with at most this share of distinct values become categoricals
+    CATEGORY_RATIO = 0.5
+    
+    def __init__(self, chunk_size: int = Config.CHUNK_SIZE, usecols: Optional[tuple] = None):
+        self.chunk_size = chunk_size
+        self.usecols = list(usecols) if usecols else None
+        self.last_report: Optional[pd.DataFrame] = None
+    
+    def iter_chunks(self, path: str, chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Chunks restricted to usecols and downcast as soon as each one is parsed"""
+        chunk_size = chunk_size or self.chunk_size
+        storage = storage_format_for_path(path)
+        if isinstance(storage, CsvStorage):
+            # Categoricals are converted after parsing: dtype='category' would turn integer codes into strings
+            chunks = pd.read_csv(path, usecols=self.usecols, chunksize=chunk_size)
+        else:
+            chunks = (chunk[self.usecols] if self.usecols else chunk
+                      for chunk in storage.iter_chunks(path, chunk_size))
+        for chunk in chunks:
+            yield self.compact(chunk)
+    
+    def load(self, paths: Union[str, List[str]]) -> pd.DataFrame:
+        """Whole file (or files, concatenated) in compact dtypes, with a per-column memory report in last_report"""
+        paths = [paths] if isinstance(paths, str) else paths
+        baseline = self._default_bytes_per_row(paths[0])
+        chunks = [chunk for path in paths for chunk in self.iter_chunks(path)]
+        df = self._concat(chunks)
+        
+        compact_bytes = df.memory_usage(index=False, deep=True)
+        default_bytes = baseline.reindex(compact_bytes.index) * len(df)
+        self.last_report = pd.DataFrame({
+            'dtype': df.dtypes.astype(str),
+            'default_mb': default_bytes / 1e6,
+            'compact_mb': compact_bytes / 1e6,
+        })
+        self.last_report['reduction'] = self.last_report['default_mb'] / self.last_report['compact_mb']
+        return df
+    
+    def compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Downcast one chunk: float32 / smallest int for numerics, categoricals for repetitive strings"""
+        for col in df.columns:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            if col in Config.NUMERIC_COLS:
+                df[col] = pd.to_numeric(series, errors='coerce').astype(np.float32)
+            elif pd.api.types.is_integer_dtype(series.dtype):
+                df[col] = pd.to_numeric(series, downcast='integer')
+            elif pd.api.types.is_float_dtype(series.dtype):
+                df[col] = series.astype(np.float32)
+            elif col in Config.CATEGORICAL_COLS or series.nunique() <= self.CATEGORY_RATIO * len(series):
+                df[col] = series.astype('category')
+        return df
+    
+    @staticmethod
+    def _concat(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+        """Concatenate chunks, merging per-chunk categories instead of falling back to object"""
+        if len(chunks) == 1:
+            return chunks[0]
+        columns = {}
+        for col in chunks[0].columns:
+            parts = [chunk[col] for chunk in chunks]
+            if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+                columns[col] = pd.Series(pd.api.types.union_categoricals(parts, ignore_order=True))
+            else:
+                columns[col] = pd.concat(parts, ignore_index=True)
+        return pd.DataFrame(columns)
+    
+    def _default_bytes_per_row(self, path: str, sample_rows: int = 10_000) -> pd.Series:
+        """Per-column bytes per row with default dtypes, measured on a sample"""
+        storage = storage_format_for_path(path)
+        if isinstance(storage, CsvStorage):
+            sample = pd.read_csv(path, usecols=self.usecols, nrows=sample_rows)
+        else:
+            sample = next(iter(storage.iter_chunks(path, sample_rows)))
+            sample = sample[self.usecols] if self.usecols else sample
+        return sample.memory_usage(index=False, deep=True) / max(len(sample), 1)
+    
+    @staticmethod
+    def print_report(report: pd.DataFrame, top: int = 10) -> None:
+        """Largest columns and the overall reduction"""
+        total_default, total_compact = report['default_mb'].sum(), report['compact_mb'].sum()
+        print(f"✓ Memory: {total_default:.1f} MB with default dtypes → {total_compact:.1f} MB compact "
+              f"({total_default / total_compact:.1f}x smaller)")
+        largest = report.sort_values('default_mb', ascending=False).head(top)
+        for col, row in largest.iterrows():
+            print(f"   • {col}: {row['default_mb']:.2f} → {row['compact_mb']:.2f} MB ({row['dtype']})")
+
+
+DATA_EXTENSIONS = ('.csv', '.parquet', '.feather')
+
+
+def _pick_data_file(directory: str) -> str:
+    """The dataset's data file inside a directory: the one named like 'final', else the first CSV"""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith(DATA_EXTENSIONS):
+                found.append(os.path.join(root, file))
+    if not found:
+        raise FileNotFoundError(f"No data files found in {directory}")
+    csv_files = [path for path in found if path.endswith('.csv')] or found
+    for path in csv_files:
+        if 'Final_data' in path or 'final' in os.path.basename(path).lower():
+            return path
+    return csv_files[0]
+
+
+def _describe_files(paths: List[str]) -> str:
+    """File name of a single input, or how many files a sharded input has"""
+    if len(paths) == 1:
+        return os.path.basename(paths[0])
+    return f"{len(paths)} files ({os.path.basename(paths[0])} ... {os.path.basename(paths[-1])})"
+
+
+class DataSource(abc.ABC):
+    """Where the input data comes from; locate() returns the data files to analyze, in order"""
+    
+    @abc.abstractmethod
+    def locate(self) -> List[str]:
+        ...
+    
+    def digest(self, path: str) -> str:
+        """Content hash of one located file"""
+        return StageCache.file_digest(path)
+
+
+class LocalSource(DataSource):
+    """A local data file, or the data file inside a local directory"""
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def locate(self) -> List[str]:
+        if os.path.isdir(self.path):
+            path = _pick_data_file(self.path)
+        elif os.path.exists(self.path):
+            path = self.path
+        else:
+            raise FileNotFoundError(f"Data file not found: {self.path}")
+        print(f"✓ Using local data file: {path}")
+        return [path]
+
+
+class GlobSource(DataSource):
+    """Every file matching a glob pattern (e.g. 'data/sessions_*.csv'), as shards of one dataset"""
+    
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+    
+    def locate(self) -> List[str]:
+        paths = sorted(path for path in glob.glob(self.pattern, recursive=True)
+                       if os.path.isfile(path) and path.endswith(DATA_EXTENSIONS))
+        if not paths:
+            raise FileNotFoundError(f"No data files match: {self.pattern}")
+        print(f"✓ Using {len(paths)} data file(s) matching: {self.pattern}")
+        return paths
+
+
+class KaggleSource(DataSource):
+    """A Kaggle dataset, downloaded once and then found through a local manifest without touching the network"""
+    
+    MANIFEST = 'sources.json'
+    
+    def __init__(self, dataset: str, cache_dir: str, verify: bool = False):
+        self.dataset = dataset
+        self.verify = verify
+        self._manifest_path = os.path.join(cache_dir, self.MANIFEST)
+        # Read once per locate(), so digest() of the located files does not re-parse it
+        self._manifest: Optional[Dict[str, dict]] = None
+    
+    def locate(self) -> List[str]:
+        manifest = self._manifest = self._load_manifest()
+        entry = manifest.get(self.dataset)
+        if entry and self._is_intact(entry):
+            print(f"✓ Using cached dataset {self.dataset}: {entry['path']}")
+            if not self._stat_matches(entry):
+                # Touched but unchanged: record the new stat so the next run skips hashing again
+                self._record(manifest, entry['path'], entry['digest'])
+            return [entry['path']]
+        if entry:
+            print(f"  → Cached copy of {self.dataset} is missing or changed, downloading it again")
+        
+        path = _pick_data_file(self._download(force=entry is not None))
+        self._record(manifest, path, StageCache.file_digest(path))
+        return [path]
+    
+    def digest(self, path: str) -> str:
+        """The manifest's checksum when the file is unchanged since it was recorded, so reruns skip hashing"""
+        if self._manifest is None:
+            self._manifest = self._load_manifest()
+        entry = self._manifest.get(self.dataset)
+        if entry and entry['path'] == path and self._stat_matches(entry):
+            return entry['digest']
+        return super().digest(path)
+    
+    def _is_intact(self, entry: dict) -> bool:
+        """File still has its recorded checksum, re-hashed only if its size or mtime changed or with verify"""
+        if not os.path.isfile(entry['path']):
+            return False
+        if self._stat_matches(entry) and not self.verify:
+            return True
+        return StageCache.file_digest(entry['path']) == entry['digest']
+    
+    def _record(self, manifest: Dict[str, dict], path: str, digest: str) -> None:
+        stat = os.stat(path)
+        manifest[self.dataset] = {'path': path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+        self._save_manifest(manifest)
+    
+    @staticmethod
+    def _stat_matches(entry: dict) -> bool:
+        try:
+            stat = os.stat(entry['path'])
+        except OSError:
+            return False
+        return stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']
+    
+    def _download(self, force: bool) -> str:
+        print("📥 Downloading dataset from Kaggle...")
+        print(f"   Dataset: {self.dataset}")
+        
+        try:
+            # Imported here so runs with a cached or local dataset never load kagglehub
+            import kagglehub
+            path = kagglehub.dataset_download(self.dataset, force_download=force)
+            print(f"✓ Dataset downloaded to: {path}")
+            return path
+            
+        except Exception as e:
+            print(f"❌ Error loading data from Kaggle: {str(e)}")
+            print("\n⚠️  Please ensure:")
+            print("   1. You have kagglehub installed: pip install kagglehub")
+            print("   2. Your Kaggle API credentials are configured")
+            print("   3. You have internet connection")
+            print("   Or analyze a local copy with --data FILE")
+            raise
+    
+    def _load_manifest(self) -> Dict[str, dict]:
+        if not os.path.exists(self._manifest_path):
+            return {}
+        with open(self._manifest_path) as f:
+            return json.load(f)
+    
+    def _save_manifest(self, manifest: Dict[str, dict]) -> None:
+        os.makedirs(os.path.dirname(self._manifest_path) or '.', exist_ok=True)
+        with open(self._manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+
+def get_data_source(config: 'Config') -> DataSource:
+    """The DataSource for Config.DATA_FILE: a glob pattern, a local file or directory, else the Kaggle dataset"""
+    if not config.DATA_FILE:
+        return KaggleSource(config.KAGGLE_DATASET, config.DATA_CACHE_DIR, config.VERIFY_DATA)
+    if any(char in config.DATA_FILE for char in '*?['):
+        return GlobSource(config.DATA_FILE)
+    return LocalSource(config.DATA_FILE)
+
+
+class DataIngestor:
+    """Handles data loading and backup operations"""
+    
+    def __init__(self, storage: Optional[StorageFormat] = None, schema: Optional[SchemaLoader] = None,
+                 source: Optional[DataSource] = None):
+        self.storage = storage or CsvStorage()
+        self.schema = schema
+        self.source = source or KaggleSource(Config.KAGGLE_DATASET, Config.DATA_CACHE_DIR)
+    
+    def locate_data_files(self) -> List[str]:
+        """Paths of the input data files, from the local manifest, local disk or a Kaggle download"""
+        return self.source.locate()
+    
+    def input_digest(self, paths: List[str]) -> str:
+        """Content hash of the input files, the root of every stage cache key"""
+        digests = [self.source.digest(path) for path in paths]
+        if len(digests) == 1:
+            return digests[0]
+        return hashlib.blake2b(json.dumps(digests).encode(), digest_size=16).hexdigest()
+    
+    @profiled('load_data')
+    def load_data(self, paths: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load the data files into one frame, locating them first unless given"""
+        if paths is None:
+            paths = self.locate_data_files()
+        
+        print(f"✓ Loading data from: {_describe_files(paths)}")
+        if self.schema:
+            df = self.schema.load(paths)
+            print(f"✓ Loaded data: {df.shape[0]} rows, {df.shape[1]} columns")
+            SchemaLoader.print_report(self.schema.last_report)
+        else:
+            frames = [self.read_file(path) for path in paths]
+            df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            print(f"✓ Loaded data: {df.shape[0]} rows, {df.shape[1]} columns")
+        if df.empty:
+            raise ValueError(f"No rows in {_describe_files(paths)}")
+        
+        return df
+    
+    def read_file(self, path: str) -> pd.DataFrame:
+        """One data file, without progress output"""
+        if self.schema:
+            return self.schema.load(path)
+        return storage_format_for_path(path).read(path)
+    
+    def iter_chunks(self, paths: Union[str, List[str]], chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Stream the data files one after another in chunks of at most chunk_size rows"""
+        paths = [paths] if isinstance(paths, str) else paths
+        if self.schema:
+            chunks = (chunk for path in paths for chunk in self.schema.iter_chunks(path, chunk_size))
+        else:
+            chunks = (chunk for path in paths for chunk in storage_format_for_path(path).iter_chunks(path, chunk_size))
+        return _profiled_chunks(chunks)
+    
+    @profiled('backup_raw_data')
+    def backup_raw_data(self, df: pd.DataFrame, path: str) -> str:
+        """Create backup of raw data and return the written path"""
+        path = self.storage.path(path)
+        self.storage.remove_parts(path)
+        self.storage.write(df, path, index=False)
+        print(f"✓ Raw data backed up to: {path}")
+        return path
+    
+    def backup_shard(self, df: pd.DataFrame, path: str, shard: int) -> str:
+        """Back up one file of a sharded input: the first as the backup itself, later ones as numbered parts"""
+        path = self.storage.path(path)
+        if shard:
+            stem, extension = os.path.splitext(path)
+            path = f"{stem}.part-{shard:04d}{extension}"
+        self.storage.write(df, path, index=False)
+        return path
+    
+    def open_backup_writer(self, path: str) -> ChunkWriter:
+        """Writer that backs up raw data chunk by chunk"""
+        path = self.storage.path(path)
+        self.storage.remove_parts(path)
+        return self.storage.open_writer(path, index=False)
+    
+    def open_backup_append_writer(self, path: str) -> ChunkWriter:
+        """Writer adding newly ingested raw rows to the backup as a separate batch"""
+        return self.storage.open_append_writer(self.storage.path(path), index=False)
+
+
+@dataclass
+class CleaningStats:
+    """Global statistics that cleaning needs, computed once over the whole input"""
+    fill_values: Dict[str, object] = field(default_factory=dict)
+    outlier_bounds: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    # (min, max) of each numeric column after cleaning, for fixed-range chart grids
+    value_ranges: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    # Counts or sketches behind fill_values and outlier_bounds, kept so appended rows can update them
+    fill_counters: Dict[str, Union[ValueCountAccumulator, QuantileSketch]] = field(default_factory=dict)
+    outlier_counters: Dict[str, Union[ValueCountAccumulator, QuantileSketch]] = field(default_factory=dict)
+    # Categories of each categorical column over the whole input, for cleaning files separately
+    category_dtypes: Dict[str, pd.CategoricalDtype] = field(default_factory=dict)
+
+
+def _row_hashes(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """64-bit hash of every row (index ignored) and a mask of rows equal to an earlier row of the frame"""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    duplicated = pd.Series(hashes).duplicated().to_numpy()
+    if duplicated.any():
+        duplicated = _confirm_duplicates(hashes, duplicated, lambda positions: df.iloc[positions])
+    return hashes, duplicated
+
+
+def _confirm_duplicates(hashes: np.ndarray, duplicated: np.ndarray,
+                        rows: Callable[[np.ndarray], pd.DataFrame]) -> np.ndarray:
+    """duplicated (rows whose hash appeared earlier) narrowed to rows equal to an earlier row
+    
+    A hash collision therefore never drops a distinct row.
+    rows(positions) returns the rows at positions. Each candidate is compared with the first row of its
+    hash; should that differ, all rows sharing the hash are compared with each other.
+    """
+    duplicated = duplicated.copy()
+    candidates = np.flatnonzero(duplicated)
+    firsts = np.flatnonzero(~duplicated)
+    firsts = firsts[pd.Index(hashes[firsts]).get_indexer(hashes[candidates])]
+    equal = _rows_equal(rows(candidates), rows(firsts))
+    duplicated[candidates] = equal
+    if not equal.all():
+        group = np.flatnonzero(np.isin(hashes, hashes[candidates[~equal]]))
+        duplicated[group] = rows(group).duplicated().to_numpy()
+    return duplicated
+
+
+def _rows_equal(a: pd.DataFrame, b: pd.DataFrame) -> np.ndarray:
+    """Whether each row of a equals the row of b at the same position, missing values matching each other"""
+    equal = np.ones(len(a), dtype=bool)
+    for col in a.columns:
+        x, y = a[col].reset_index(drop=True), b[col].reset_index(drop=True)
+        equal &= (x == y).to_numpy(dtype=bool, na_value=False) | (x.isna() & y.isna()).to_numpy()
+    return equal
+
+
+class RowHashSet:
+    """Remembers 64-bit row hashes so duplicates are dropped across chunks
+    
+    Hashes are kept in sorted runs merged like a binary counter: a run is merged into the one before it
+    once it is at least half that size, so every hash is rewritten O(log n) times and a chunk is looked
+    up in O(log n) runs. With a directory, runs of SPILL_HASHES or more live there as memory-mapped .npy
+    files, merged block by block, and pickling stores only their file names: saving the set writes
+    nothing but the small runs added since the last spill.
+    
+    Earlier chunks are gone, so rows are matched against them by hash alone: dropping a distinct row
+    takes a 64-bit collision. Exact de-duplication has to remember every distinct row: the set costs
+    8 bytes per distinct row (80 MB for 10M rows), the one part of a streaming run that grows with the
+    input. With a directory that is disk and page cache, not process memory.
+    """
+    
+    SPILL_HASHES = 1 << 16
+    MERGE_BLOCK = 1 << 20
+    
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self._runs: List[np.ndarray] = []
+        # File name of each spilled run, None for runs held in memory
+        self._files: List[Optional[str]] = []
+    
+    @profiled('drop_seen')
+    def drop_seen(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows already seen in this or any earlier chunk, keeping the first occurrence"""
+        hashes, duplicated = _row_hashes(df)
+        for run in self._runs:
+            positions = np.searchsorted(run, hashes).clip(max=run.size - 1)
+            duplicated = duplicated | (run[positions] == hashes)
+        new = np.sort(hashes[~duplicated])
+        if new.size:
+            self._runs.append(new)
+            self._files.append(None)
+            while len(self._runs) > 1 and 2 * self._runs[-1].size >= self._runs[-2].size:
+                self._merge_last_runs()
+            if self.directory and self._files[-1] is None and self._runs[-1].size >= self.SPILL_HASHES:
+                self._runs[-1], self._files[-1] = self._write_run(self._runs[-1])
+        return df[~duplicated]
+    
+    def _merge_last_runs(self) -> None:
+        first, second = self._runs[-2:]
+        if self.directory and first.size + second.size >= self.SPILL_HASHES:
+            merged, name = self._write_run(first, second)
+        else:
+            # A stable sort merges two sorted runs in linear time
+            merged, name = np.sort(np.concatenate([first, second]), kind='stable'), None
+        del self._runs[-2:], self._files[-2:]
+        self._runs.append(merged)
+        self._files.append(name)
+    
+    def _write_run(self, first: np.ndarray, second: Optional[np.ndarray] = None) -> Tuple[np.ndarray, str]:
+        """A new run file holding first, merged with second, memory-mapped; written MERGE_BLOCK hashes at a time"""
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"hashes-{os.urandom(8).hex()}.npy"
+        path = os.path.join(self.directory, name)
+        second = np.empty(0, dtype=np.uint64) if second is None else second
+        run = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint64, shape=(first.size + second.size,))
+        # Runs never share a hash, so a hash's place in the merged run is its rank in its own run plus
+        # its rank in the other
+        for source, other in ((first, second), (second, first)):
+            for start in range(0, source.size, self.MERGE_BLOCK):
+                block = np.asarray(source[start:start + self.MERGE_BLOCK])
+                run[np.arange(start, start + block.size) + np.searchsorted(other, block)] = block
+        run.flush()
+        del run
+        return np.load(path, mmap_mode='r'), name
+    
+    @staticmethod
+    def remove_unused_runs(*sets: 'RowHashSet') -> None:
+        """Delete run files in the sets' directories that none of them uses any more (merged into larger runs)"""
+        used = {name for hash_set in sets for name in hash_set._files if name}
+        for directory in {hash_set.directory for hash_set in sets if hash_set.directory}:
+            if os.path.isdir(directory):
+                for name in os.listdir(directory):
+                    if name.endswith('.npy') and name not in used:
+                        os.remove(os.path.join(directory, name))
+    
+    def __getstate__(self) -> Dict[str, object]:
+        return {'directory': self.directory, 'runs': [name or run for run, name in zip(self._runs, self._files)]}
+    
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.directory = state['directory']
+        self._runs, self._files = [], []
+        for run in state['runs']:
+            if isinstance(run, str):
+                self._runs.append(np.load(os.path.join(self.directory, run), mmap_mode='r'))
+                self._files.append(run)
+            else:
+                self._runs.append(run)
+                self._files.append(None)
+    
+    def __len__(self) -> int:
+        return sum(run.size for run in self._runs)
+
+
+class DataCleaner:
+    """Handles all data cleaning operations"""
+    
+    # Config fields that change this stage's output (part of its cache key)
+    CONFIG_FIELDS = ('NUMERIC_COLS', 'CATEGORICAL_COLS', 'OUTLIER_COLS', 'COMPACT_DTYPES', 'USECOLS',
+                     'QUANTILE_SKETCH_ERROR')
+    
+    def __init__(self, sketch_error: Optional[float] = None):
+        # Rank error of the quantile sketches behind outlier bounds; None computes them exactly
+        self.sketch_error = sketch_error
+    
+    @profiled('clean_data')
+    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Orchestrate all cleaning operations
+        
+        df itself is never written to, so callers need not copy it first. Columns that cleaning leaves
+        unchanged are shared between df and the result; copy-on-write keeps a later write to either private.
+        """
+        print("  → Filling missing values and correcting data types...")
+        df = self._impute_and_type(df)
+        
+        print("  → Removing duplicates...")
+        df = self._remove_duplicates(df)
+        
+        print("  → Capping outliers...")
+        for col, (lower, upper, col_min, col_max) in self._outlier_summary(df).items():
+            df = self._cap_outliers(df, col, (lower, upper))
+            if col_min < lower or col_max > upper:
+                print(f"  → Capped outliers in {col}: [{lower:.2f}, {upper:.2f}]")
+        
+        return df
+    
+    @profiled('fit_streaming_stats')
+    def fit_streaming_stats(self, chunks: Callable[[], Iterator[pd.DataFrame]]) -> CleaningStats:
+        """Compute imputation values and IQR bounds over all chunks, as clean_data would on one frame"""
+        stats = CleaningStats()
+        
+        # Pass 1: medians and modes of the raw columns
+        print("  → Computing imputation values...")
+        for chunk in chunks():
+            self._count_fill_values(chunk, stats)
+        self._set_fill_values(stats)
+        
+        # Pass 2: quartiles and value ranges of the imputed, de-duplicated rows
+        print("  → Computing outlier bounds...")
+        lows, highs = [], []
+        with tempfile.TemporaryDirectory() as hash_dir:
+            seen = RowHashSet(hash_dir)
+            for chunk in chunks():
+                chunk = seen.drop_seen(self._impute_and_type(chunk, stats.fill_values))
+                self._count_outlier_values(chunk, stats)
+                numeric = chunk.select_dtypes(include=[np.number])
+                lows.append(numeric.min())
+                highs.append(numeric.max())
+            # Unmaps the run files before they are deleted
+            del seen
+        self._set_outlier_bounds(stats)
+        for col, (lower, upper) in stats.outlier_bounds.items():
+            print(f"  → Outlier bounds for {col}: [{lower:.2f}, {upper:.2f}]")
+        
+        # Clipping is monotone, so the capped range is the clipped raw range
+        low, high = pd.concat(lows, axis=1).min(axis=1), pd.concat(highs, axis=1).max(axis=1)
+        for col in low.index:
+            bounds = stats.outlier_bounds.get(col, (-np.inf, np.inf))
+            stats.value_ranges[col] = tuple(float(np.clip(v, *bounds)) for v in (low[col], high[col]))
+        
+        return stats
+    
+    @profiled('clean_chunk')
+    def clean_chunk(self, df: pd.DataFrame, stats: CleaningStats, seen: RowHashSet) -> pd.DataFrame:
+        """Clean one chunk using global statistics from fit_streaming_stats"""
+        df = seen.drop_seen(self._impute_and_type(df, stats.fill_values))
+        for col, bounds in stats.outlier_bounds.items():
+            df = self._cap_outliers(df, col, bounds)
+        return df
+    
+    @profiled('clean_delta')
+    def clean_delta(self, df: pd.DataFrame, stats: CleaningStats, seen: RowHashSet) -> pd.DataFrame:
+        """Clean newly appended rows, first folding them into the imputation values and outlier bounds
+        
+        Rows cleaned earlier keep the statistics of their own batch; a full run re-cleans everything.
+        """
+        self._count_fill_values(df, stats)
+        self._set_fill_values(stats)
+        df = seen.drop_seen(self._impute_and_type(df, stats.fill_values))
+        self._count_outlier_values(df, stats)
+        self._set_outlier_bounds(stats)
+        for col, bounds in stats.outlier_bounds.items():
+            df = self._cap_outliers(df, col, bounds)
+        return df
+    
+    def _count_fill_values(self, df: pd.DataFrame, stats: CleaningStats) -> None:
+        """Medians from quantile accumulators; modes from value counts, as many as the column has categories"""
+        for col in Config.NUMERIC_COLS + Config.CATEGORICAL_COLS:
+            if col in df.columns:
+                if col not in stats.fill_counters:
+                    stats.fill_counters[col] = (_quantile_accumulator(self.sketch_error) if col in Config.NUMERIC_COLS
+                                                else ValueCountAccumulator())
+                stats.fill_counters[col].update(df[col])
+    
+    def _set_fill_values(self, stats: CleaningStats) -> None:
+        """Medians for numeric columns, modes for categorical ones"""
+        for col, counter in stats.fill_counters.items():
+            if col in Config.NUMERIC_COLS:
+                stats.fill_values[col] = float(counter.median())
+            else:
+                mode_val = counter.mode()
+                stats.fill_values[col] = 'Unknown' if mode_val is None else mode_val
+    
+    def _count_outlier_values(self, df: pd.DataFrame, stats: CleaningStats) -> None:
+        for col in Config.OUTLIER_COLS:
+            if col in df.columns:
+                if col not in stats.outlier_counters:
+                    stats.outlier_counters[col] = _quantile_accumulator(self.sketch_error)
+                stats.outlier_counters[col].update(df[col])
+    
+    def _set_outlier_bounds(self, stats: CleaningStats) -> None:
+        """IQR bounds from the counted quartiles"""
+        for col, counter in stats.outlier_counters.items():
+            stats.outlier_bounds[col] = _iqr_bounds(*counter.quantiles([0.25, 0.75]))
+    
+    @profiled('outlier_summary')
+    def _outlier_summary(self, df: pd.DataFrame) -> Dict[str, Tuple[float, float, float, float]]:
+        """IQR bounds, min and max of every outlier column, all quartiles computed together"""
+        columns = [col for col in Config.OUTLIER_COLS if col in df.columns]
+        if self.sketch_error is None:
+            quartiles = df[columns].quantile([0.25, 0.75])
+            extremes = df[columns].agg(['min', 'max'])
+            return {col: (*_iqr_bounds(*quartiles[col]), *extremes[col]) for col in columns}
+        summary = {}
+        for col in columns:
+            sketch = QuantileSketch(self.sketch_error)
+            sketch.update(df[col])
+            summary[col] = (*_iqr_bounds(*sketch.quantiles([0.25, 0.75])), sketch.min, sketch.max)
+        return summary
+    
+    @profiled('impute_and_type')
+    def _impute_and_type(self, df: pd.DataFrame, fill_values: Optional[Dict[str, object]] = None) -> pd.DataFrame:
+        """Coerce, fill and encode every column in one pass: median for numeric, mode and category dtype for categorical
+        
+        fill_values (e.g. CleaningStats.fill_values) replace the frame's own medians and modes. Returns a
+        new frame without writing to df; only the columns that change get new arrays.
+        """
+        fill_values = fill_values or {}
+        df = df.copy(deep=False)
+        for col in Config.NUMERIC_COLS:
+            if col in df.columns:
+                values = self._numeric_values(df[col], fill_values.get(col))
+                if values is not None:
+                    df[col] = values
+        
+        for col in Config.CATEGORICAL_COLS:
+            if col in df.columns:
+                df[col] = self._categorical_values(df[col], fill_values.get(col))
+        
+        return df
+    
+    @staticmethod
+    def _numeric_values(column: pd.Series, fill_value: Optional[float] = None) -> Optional[Union[np.ndarray, pd.Series]]:
+        """The column coerced to numbers with missing values filled by fill_value or its median; None if
+        already clean"""
+        converted = not pd.api.types.is_numeric_dtype(column.dtype)
+        if converted:
+            column = pd.to_numeric(column, errors='coerce')
+        elif not column.hasnans:
+            return None
+        if not isinstance(column.dtype, np.dtype):
+            # Nullable extension columns are filled by pandas
+            return column.fillna(column.median() if fill_value is None else fill_value)
+        values = column.to_numpy()
+        if values.dtype.kind != 'f':
+            return values
+        missing = np.isnan(values)
+        if missing.any():
+            if not converted:
+                # Without copy-on-write to_numpy() is a writable view of the caller's column
+                values = values.copy()
+            # Assigned into the array, the fill value takes the column's dtype (float32 stays float32)
+            values[missing] = column.median() if fill_value is None else fill_value
+        return values
+    
+    @staticmethod
+    def _categorical_values(column: pd.Series, fill_value: object = None) -> pd.Categorical:
+        """The column as a categorical with missing values filled by fill_value or its mode, from one factorization"""
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes, categories = column.cat.codes.to_numpy(), column.cat.categories
+        else:
+            # Sorted, as astype('category') orders categories
+            codes, categories = pd.factorize(column, sort=True)
+        missing = codes < 0
+        if missing.any():
+            if fill_value is None:
+                counts = np.bincount(codes[~missing], minlength=len(categories))
+                # argmax takes the first category on ties, the one Series.mode()[0] returns
+                fill_value = categories[counts.argmax()] if counts.any() else 'Unknown'
+            position = categories.get_indexer([fill_value])[0]
+            codes = codes.copy()
+            if position < 0:
+                position = len(categories)
+                if not isinstance(column.dtype, pd.CategoricalDtype):
+                    position = categories.searchsorted(fill_value)
+                    codes[codes >= position] += 1
+                categories = categories.insert(position, fill_value)
+            codes[missing] = position
+        return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories), validate=False)
+    
+    @profiled('remove_duplicates')
+    def _remove_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove duplicate rows, matched by 64-bit row hashes"""
+        _, duplicated = _row_hashes(df)
+        removed = int(duplicated.sum())
+        if removed > 0:
+            df = df[~duplicated]
+            print(f"  → Removed {removed} duplicate rows")
+        return df
+    
+    @profiled('cap_outliers')
+    def _cap_outliers(self, df: pd.DataFrame, column: str, bounds: Tuple[float, float]) -> pd.DataFrame:
+        """Clip a column to its IQR bounds; a column already within them is kept as it is"""
+        values = df[column]
+        if values.min() < bounds[0] or values.max() > bounds[1]:
+            df[column] = values.clip(lower=bounds[0], upper=bounds[1])
+        return df
+
+
+def _iqr_bounds(q1: float, q3: float) -> Tuple[float, float]:
+    """Tukey fences: 1.5 IQR beyond the quartiles"""
+    iqr = q3 - q1
+    # Plain floats: a numpy float64 bound would upcast float32 columns when clipping
+    return float(q1 - 1.5 * iqr), float(q3 + 1.5 * iqr)
+
+
+def _worker_task(profile: bool, trace_memory: bool, func: Callable,
+                 *args) -> Tuple[object, Optional[Dict[str, Dict[str, object]]]]:
+    """Run func(*args) in a worker process; with profile, also return the steps it recorded for the parent's report"""
+    if not profile:
+        return func(*args), None
+    profiler = RunProfiler(trace_memory)
+    with profiling(profiler):
+        return func(*args), profiler.steps
+
+
+@profiled('scan_shard')
+def _scan_shard(ingestor: 'DataIngestor', path: str, shard: int, backup_path: str,
+                spill_path: str) -> Tuple[int, Dict[str, ValueCountAccumulator], pd.DataFrame]:
+    """Map step 1: parse one data file, back it up, count the values behind imputation and spill the parsed rows
+    
+    The rows are spilled to an uncompressed Feather file, which the clean step memory-maps. Returns
+    the row count, the counters and an empty frame with the file's dtypes.
+    """
+    df = ingestor.read_file(path)
+    ingestor.backup_shard(df, backup_path, shard)
+    stats = CleaningStats()
+    DataCleaner()._count_fill_values(df, stats)
+    FeatherStorage().write(df, spill_path, index=False)
+    return len(df), stats.fill_counters, df.iloc[:0]
+
+
+@profiled('clean_shard')
+def _clean_shard(spill_path: str, shard_path: str, offset: int, dtypes: Dict[str, object], stats: CleaningStats,
+                 sketch_error: Optional[float]) -> Tuple[np.ndarray, Dict[str, object]]:
+    """Map step 2: impute and type one spilled file as a slice of the combined frame, drop its own duplicates
+    
+    The rows are written to an uncompressed Feather file at shard_path, with their index, for the parent
+    to memory-map. Returns their hashes (for duplicates across files) and their outlier column counters.
+    """
+    storage = FeatherStorage()
+    df = storage.read(spill_path)
+    os.remove(spill_path)
+    # Rows numbered and typed as in the concatenation of all files
+    df.index = pd.RangeIndex(offset, offset + len(df))
+    df = df.astype({col: dtype for col, dtype in dtypes.items() if df[col].dtype != dtype})
+    
+    cleaner = DataCleaner(sketch_error)
+    df = cleaner._impute_and_type(df, stats.fill_values)
+    for col, dtype in stats.category_dtypes.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+    
+    hashes, duplicated = _row_hashes(df)
+    if duplicated.any():
+        df, hashes = df[~duplicated], hashes[~duplicated]
+    storage.write(df, shard_path, index=True)
+    counted = CleaningStats()
+    cleaner._count_outlier_values(df, counted)
+    return hashes, counted.outlier_counters
+
+
+class ParallelCleaner:
+    """Loads and cleans the files of a sharded input on a process pool, with the statistics of one combined frame
+    
+    Imputation values, duplicates and IQR bounds are reduced from per-file counts and row hashes, so the
+    result equals clean_data on all files concatenated. Rows travel between processes only as memory-mapped
+    Feather files: the parent joins the cleaned files into one frame with a single conversion.
+    """
+    
+    def __init__(self, ingestor: 'DataIngestor', cleaner: DataCleaner, workers: int,
+                 mp_context: Optional[multiprocessing.context.BaseContext] = None):
+        self.ingestor = ingestor
+        self.cleaner = cleaner
+        self.workers = workers
+        # Start method of the worker processes (None: the platform default)
+        self.mp_context = mp_context
+    
+    @profiled('parallel_clean')
+    def clean_files(self, paths: List[str], backup_path: str) -> pd.DataFrame:
+        """Parse, back up and clean every file; the cleaned rows of all files come back as one frame"""
+        backup_path = self.ingestor.storage.path(backup_path)
+        self.ingestor.storage.remove_parts(backup_path)
+        
+        with tempfile.TemporaryDirectory() as spill_dir, \
+                ProcessPoolExecutor(max_workers=min(self.workers, len(paths)), mp_context=self.mp_context) as pool:
+            spill_paths = [os.path.join(spill_dir, f"raw-{shard}.feather") for shard in range(len(paths))]
+            shard_paths = [os.path.join(spill_dir, f"clean-{shard}.feather") for shard in range(len(paths))]
+            print(f"  → Parsing {len(paths)} files on {min(self.workers, len(paths))} processes...")
+            scanned = self._run(pool, _scan_shard, [self.ingestor] * len(paths),
+                                paths, range(len(paths)), [backup_path] * len(paths), spill_paths)
+            print(f"✓ Loaded data: {sum(rows for rows, _, _ in scanned)} rows from {len(paths)} files")
+            if not sum(rows for rows, _, _ in scanned):
+                raise ValueError(f"No rows in {_describe_files(paths)}")
+            print(f"✓ Raw data backed up to: {backup_path} (one part per file)")
+            
+            # Reduce 1: imputation values, dtypes and category sets of the combined frame
+            print("  → Computing imputation values...")
+            stats = CleaningStats()
+            for _, counters, _ in scanned:
+                for col, counter in counters.items():
+                    stats.fill_counters.setdefault(col, ValueCountAccumulator()).merge(counter)
+            self.cleaner._set_fill_values(stats)
+            dtypes = pd.concat([empty for _, _, empty in scanned]).dtypes.to_dict()
+            self._set_category_dtypes(stats, dtypes)
+            shard_stats = CleaningStats(fill_values=stats.fill_values, category_dtypes=stats.category_dtypes)
+            offsets = np.concatenate([[0], np.cumsum([rows for rows, _, _ in scanned])[:-1]]).tolist()
+            
+            print("  → Filling missing values and correcting data types...")
+            cleaned = self._run(pool, _clean_shard, spill_paths, shard_paths, offsets,
+                                [dtypes] * len(paths), [shard_stats] * len(paths),
+                                [self.cleaner.sketch_error] * len(paths))
+            
+            # Reduce 2: duplicates across files (first occurrence wins), then IQR bounds of the kept rows
+            print("  → Removing duplicates...")
+            df, counters = self._drop_duplicates_across(shard_paths, cleaned)
+        for shard_counters in counters:
+            for col, counter in shard_counters.items():
+                if col in stats.outlier_counters:
+                    stats.outlier_counters[col].merge(counter)
+                else:
+                    stats.outlier_counters[col] = counter
+        self.cleaner._set_outlier_bounds(stats)
+        
+        removed = sum(rows for rows, _, _ in scanned) - len(df)
+        if removed > 0:
+            print(f"  → Removed {removed} duplicate rows")
+        
+        print("  → Capping outliers...")
+        for col, (lower, upper) in stats.outlier_bounds.items():
+            col_min, col_max = df[col].min(), df[col].max()
+            df = self.cleaner._cap_outliers(df, col, (lower, upper))
+            if col_min < lower or col_max > upper:
+                print(f"  → Capped outliers in {col}: [{lower:.2f}, {upper:.2f}]")
+        return df
+    
+    def _run(self, pool: ProcessPoolExecutor, func: Callable, *args) -> list:
+        """pool.map one step over the files; when this run is profiled, workers profile themselves and their
+        steps are merged here"""
+        profiler = _active_profiler
+        task = functools.partial(_worker_task, profiler is not None, profiler is not None and profiler.trace_memory, func)
+        results = []
+        for result, steps in pool.map(task, *args):
+            if steps:
+                profiler.merge(steps)
+            results.append(result)
+        return results
+    
+    def _drop_duplicates_across(self, shard_paths: List[str], cleaned: list
+                                ) -> Tuple[pd.DataFrame, List[Dict[str, object]]]:
+        """The cleaned files as one frame without rows already present in an earlier file; files that lose
+        rows are recounted"""
+        table = pa.concat_tables([feather.read_table(path, memory_map=True) for path in shard_paths],
+                                 promote_options='default')
+        hashes = np.concatenate([shard_hashes for shard_hashes, _ in cleaned])
+        duplicated = pd.Series(hashes).duplicated().to_numpy()
+        if duplicated.any():
+            duplicated = _confirm_duplicates(hashes, duplicated,
+                                             lambda positions: _arrow_to_pandas(table.take(positions), index=True))
+            table = table.filter(~duplicated)
+        df = _arrow_to_pandas(table, index=True)
+        
+        counters = []
+        start = kept_start = 0
+        for shard_hashes, shard_counters in cleaned:
+            shard_duplicated = duplicated[start:start + len(shard_hashes)]
+            start += len(shard_hashes)
+            kept = len(shard_hashes) - int(shard_duplicated.sum())
+            if shard_duplicated.any():
+                recounted = CleaningStats()
+                self.cleaner._count_outlier_values(df.iloc[kept_start:kept_start + kept], recounted)
+                shard_counters = recounted.outlier_counters
+            kept_start += kept
+            counters.append(shard_counters)
+        return df, counters
+    
+    @staticmethod
+    def _set_category_dtypes(stats: CleaningStats, dtypes: Dict[str, object]) -> None:
+        """Sorted categories of each categorical column over all files, as astype('category') gives one frame"""
+        for col in Config.CATEGORICAL_COLS:
+            counter = stats.fill_counters.get(col)
+            if counter is None:
+                continue
+            values = [] if counter.counts is None else counter.counts.index.tolist()
+            if stats.fill_values[col] not in values:
+                values.append(stats.fill_values[col])
+            values = pd.Index(values)
+            # Categories keep the column's value type (e.g. float32 levels of a compact column)
+            dtype = dtypes[col].categories.dtype if isinstance(dtypes[col], pd.CategoricalDtype) else dtypes[col]
+            if dtype != object and values.dtype != dtype:
+                values = values.astype(dtype)
+            stats.category_dtypes[col] = pd.CategoricalDtype(values.sort_values())
+
+
+def _safe_divide(numerator: pd.Series, denominator: pd.Series) -> np.ndarray:
+    """Element-wise numerator / denominator, 0 where the denominator is not positive"""
+    numerator = numerator.to_numpy(dtype=float)
+    denominator = denominator.to_numpy(dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+@dataclass(frozen=True)
+class FeatureDefinition:
+    """A derived column computed as one vectorized expression over the frame"""
+    name: str
+    compute: Callable[[pd.DataFrame], object]
+
+
+class FeatureEngineer:
+    """Creates new features from existing data"""
+    
+    # Evaluated in order, so later definitions may use earlier features
+    FEATURES = (
+        FeatureDefinition('Age_Group', lambda df: pd.cut(
+            df['Age'],
+            bins=[0, 25, 35, 45, 55, 100],
+            labels=['18-25', '26-35', '36-45', '46-55', '55+']
+        )),
+        FeatureDefinition('Session_Duration_Minutes', lambda df: df['Session_Duration (hours)'] * 60),
+        FeatureDefinition('Calories_Burned_Per_Minute', lambda df: _safe_divide(
+            df['Calories_Burned'], df['Session_Duration_Minutes']
+        )),
+    )
+    
+    @profiled('create_features')
+    def create_features(self, df: pd.DataFrame, verbose: bool = True) -> pd.DataFrame:
+        """Generate all engineered features"""
+        for feature in self.FEATURES:
+            df[feature.name] = feature.compute(df)
+        
+        if verbose:
+            names = ', '.join(feature.name for feature in self.FEATURES)
+            print(f"✓ Created {len(self.FEATURES)} new features: {names}")
+            print(f"✓ Using existing BMI column from dataset")
+        
+        return df
+
+
+class CorrelationAccumulator:
+    """Accumulates pairwise co-moments block by block to rebuild DataFrame.corr(); mergeable across chunks and processes
+    
+    With a target only the correlations of every numeric column with that column are kept (O(k) state
+    instead of O(k²)). Spearman correlations are the Pearson correlations of approximate ranks: each
+    value's position in a quantile grid of its column over all rows. The grid takes a first pass:
+    observe() every chunk (sketches merge across processes), fix_rank_grid(), then update() every
+    chunk. Accumulators built with the same rank_grid merge across processes.
+    """
+    
+    METHODS = ('pearson', 'spearman')
+    # Rows converted to float64 at a time, which bounds the working memory on large frames
+    BLOCK_ROWS = 65_536
+    # Quantiles of all rows that approximate ranks in spearman mode, sketched to half a grid step
+    RANK_GRID = 1024
+    RANK_SKETCH_ERROR = 1 / (2 * RANK_GRID)
+    
+    def __init__(self, method: str = 'pearson', target: Optional[str] = None,
+                 rank_grid: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown correlation method '{method}', expected one of {self.METHODS}")
+        self.method = method
+        self.target = target
+        self.columns: Optional[List[str]] = None
+        # Spearman only: (grid points, their ranks) of every numeric column, from fix_rank_grid()
+        self.rank_grid = rank_grid
+        self._sketches: Dict[str, QuantileSketch] = {}
+    
+    @property
+    def needs_rank_grid(self) -> bool:
+        """Spearman mode before fix_rank_grid(): chunks go to observe(), not yet to update()"""
+        return self.method == 'spearman' and self.rank_grid is None
+    
+    def observe(self, df: pd.DataFrame) -> None:
+        """First pass in spearman mode: add the numeric columns of one chunk to the sketches behind the rank grid"""
+        for col in df.select_dtypes(include=[np.number]).columns:
+            self._sketches.setdefault(col, QuantileSketch(self.RANK_SKETCH_ERROR)).update(df[col])
+    
+    def fix_rank_grid(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Cut the rank grid from the observed (and merged) sketches; pass it to accumulators of other processes"""
+        levels = np.linspace(0.0, 1.0, self.RANK_GRID + 1)
+        self.rank_grid = {}
+        for col, sketch in self._sketches.items():
+            edges = sketch.quantiles(levels) if sketch.total else np.array([0.0])
+            # A value repeated across grid points (ties) gets the middle of its points: its midrank
+            points, inverse = np.unique(edges, return_inverse=True)
+            ranks = np.bincount(inverse, weights=levels[:len(edges)]) / np.bincount(inverse)
+            self.rank_grid[col] = (points, ranks)
+        self._sketches = {}
+        return self.rank_grid
+    
+    @profiled('correlation_update')
+    def update(self, df: pd.DataFrame) -> None:
+        """Add the numeric columns of one chunk"""
+        if self.needs_rank_grid:
+            raise ValueError("Spearman correlations need a rank grid: observe() every chunk, then fix_rank_grid()")
+        if self.columns is None:
+            # In spearman mode the columns observed for the grid, whatever dtype a re-read gives them
+            self._start(list(self.rank_grid) if self.method == 'spearman'
+                        else list(df.select_dtypes(include=[np.number]).columns))
+        frame = df[self.columns]
+        for start in range(0, len(frame), self.BLOCK_ROWS):
+            values = frame.iloc[start:start + self.BLOCK_ROWS].to_numpy(dtype=float, na_value=np.nan)
+            if self.method == 'spearman':
+                values = self._ranks(values)
+            self._combine(*self._block_moments(values))
+    
+    def merge(self, other: 'CorrelationAccumulator') -> None:
+        """Fold in an accumulator that saw other rows of the same columns (or observed other rows, before
+        fix_rank_grid)"""
+        for col, sketch in other._sketches.items():
+            if col in self._sketches:
+                self._sketches[col].merge(sketch)
+            else:
+                self._sketches[col] = sketch
+        if other.columns is None:
+            return
+        if self.columns is None:
+            self._start(other.columns)
+            if self.rank_grid is None:
+                self.rank_grid = other.rank_grid
+        if (other.columns, other.method, other.target) != (self.columns, self.method, self.target):
+            raise ValueError("Only accumulators of the same columns, method and target can be merged")
+        if self.method == 'spearman' and not all(
+                np.array_equal(self.rank_grid[col][0], other.rank_grid[col][0]) for col in self.columns):
+            raise ValueError("Spearman accumulators must share their rank grid to be merged")
+        self._combine(other._n, other._mean_x, other._mean_y, other._m2_x, other._m2_y, other._c)
+    
+    def result(self) -> pd.DataFrame:
+        """Correlations over pairwise-complete observations: the full matrix, or one target column"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self._c / np.sqrt(self._m2_x * self._m2_y)
+        corr[(self._n < 2) | (self._m2_x <= 0) | (self._m2_y <= 0)] = np.nan
+        corr = np.clip(corr, -1.0, 1.0)
+        for j, i in enumerate(self._targets):
+            corr[i, j] = np.nan if np.isnan(corr[i, j]) else 1.0
+        return pd.DataFrame(corr, index=self.columns, columns=[self.columns[i] for i in self._targets])
+    
+    def _start(self, columns: List[str]) -> None:
+        self.columns = columns
+        if self.target is not None and self.target not in columns:
+            raise KeyError(f"Correlation target '{self.target}' is not a numeric column")
+        self._targets = [columns.index(self.target)] if self.target is not None else list(range(len(columns)))
+        shape = (len(columns), len(self._targets))
+        # Per pair (column i, target j), over rows where both are present: count, means, M2s and co-moment
+        self._n = np.zeros(shape)
+        self._mean_x, self._mean_y = np.zeros(shape), np.zeros(shape)
+        self._m2_x, self._m2_y, self._c = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+    
+    def _block_moments(self, values: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Pairwise counts, means, M2s and co-moments of one block, from a few matrix products"""
+        present = ~np.isnan(values)
+        shape = (values.shape[1], len(self._targets))
+        if present.all():
+            # Complete rows (the usual case after cleaning): every pair shares one count, means and M2s
+            mean = values.mean(axis=0)
+            x = values - mean
+            m2 = np.einsum('ij,ij->j', x, x)
+            n = np.full(shape, float(len(values)))
+            return (n, np.broadcast_to(mean[:, None], shape), np.broadcast_to(mean[self._targets][None, :], shape),
+                    np.broadcast_to(m2[:, None], shape), np.broadcast_to(m2[self._targets][None, :], shape),
+                    x.T @ x[:, self._targets])
+        mask = present.astype(float)
+        # Centering on the block's column means keeps the raw sums below well conditioned
+        counts = mask.sum(axis=0)
+        shift = np.divide(np.where(present, values, 0.0).sum(axis=0), counts, out=np.zeros(len(counts)),
+                          where=counts > 0)
+        x = np.where(present, values - shift, 0.0)
+        y, y_mask = x[:, self._targets], mask[:, self._targets]
+        n = mask.T @ y_mask
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_x = np.where(n > 0, (x.T @ y_mask) / n, 0.0)
+            mean_y = np.where(n > 0, (mask.T @ y) / n, 0.0)
+        m2_x = (x * x).T @ y_mask - n * mean_x ** 2
+        m2_y = mask.T @ (y * y) - n * mean_y ** 2
+        c = x.T @ y - n * mean_x * mean_y
+        return (n, mean_x + shift[:, None], mean_y + shift[self._targets][None, :],
+                np.maximum(m2_x, 0.0), np.maximum(m2_y, 0.0), c)
+    
+    def _combine(self, n: np.ndarray, mean_x: np.ndarray, mean_y: np.ndarray,
+                 m2_x: np.ndarray, m2_y: np.ndarray, c: np.ndarray) -> None:
+        """Chan et al.'s pairwise update: add the moments of other rows to the running ones"""
+        total = self._n + n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(total > 0, n / total, 0.0)
+        dx, dy = mean_x - self._mean_x, mean_y - self._mean_y
+        self._m2_x += m2_x + dx * dx * self._n * weight
+        self._m2_y += m2_y + dy * dy * self._n * weight
+        self._c += c + dx * dy * self._n * weight
+        self._mean_x += dx * weight
+        self._mean_y += dy * weight
+        self._n = total
+    
+    def _ranks(self, values: np.ndarray) -> np.ndarray:
+        """Approximate rank (0-1) of every value, interpolated in its column's quantile grid"""
+        return np.column_stack([np.interp(column, *self.rank_grid[col]) for column, col in zip(values.T, self.columns)])
+
+
+def _factorize_groups(keys: Tuple[str, ...], key_codes: Dict[str, Tuple[np.ndarray, np.ndarray]]
+                      ) -> Tuple[np.ndarray, pd.Index]:
+    """Dense group code per row (-1 where a key is missing) and the plain labels of each observed group
+    
+    key_codes maps each key to its factorized (codes, uniques), so a key shared by several key sets
+    is only factorized once per frame.
+    """
+    if len(keys) == 1:
+        codes, uniques = key_codes[keys[0]]
+        return codes, pd.Index(uniques, name=keys[0], dtype=object)
+    
+    missing = np.zeros(len(key_codes[keys[0]][0]), dtype=bool)
+    combined = np.zeros(len(missing), dtype=np.int64)
+    for key in keys:
+        codes, uniques = key_codes[key]
+        missing |= codes < 0
+        combined = combined * max(len(uniques), 1) + codes
+    
+    codes = np.full(len(combined), -1, dtype=np.int64)
+    codes[~missing], group_ids = pd.factorize(combined[~missing])
+    
+    # Decode each observed combination back into one label per key
+    arrays = []
+    for key in reversed(keys):
+        uniques = key_codes[key][1]
+        group_ids, level_codes = np.divmod(group_ids, max(len(uniques), 1))
+        arrays.insert(0, uniques[level_codes])
+    return codes, pd.MultiIndex.from_arrays(arrays, names=list(keys))
+
+
+def _merge_sorted_counts(a: Tuple[np.ndarray, np.ndarray], b: Tuple[np.ndarray, np.ndarray]
+                         ) -> Tuple[np.ndarray, np.ndarray]:
+    """Add (ascending distinct values, counts) pair b into a, without re-sorting a"""
+    values, counts = a
+    positions = np.searchsorted(values, b[0])
+    known = positions < len(values)
+    known[known] = values[positions[known]] == b[0][known]
+    counts = counts.copy()
+    counts[positions[known]] += b[1][known]
+    return (np.insert(values, positions[~known], b[0][~known]),
+            np.insert(counts, positions[~known], b[1][~known]))
+
+
+@dataclass(frozen=True)
+class GroupSpec:
+    """One group-analysis table: group keys, metrics, statistics and layout"""
+    name: str
+    keys: Tuple[str, ...]
+    metrics: Tuple[str, ...]
+    stats: Tuple[str, ...] = ('count', 'mean', 'std')
+    decimals: int = 2
+    sort_by: Optional[str] = None  # statistic to sort groups by, descending
+    unstack: bool = False  # spread the last key into columns (single metric and statistic)
+
+
+class GroupAggregator:
+    """Single-pass count/sum/sum-of-squares/min/max for every (keys, metric) pair of a list of GroupSpecs
+    
+    Each key set is factorized once per frame and every metric grouped by it is reduced with
+    np.bincount on the codes. Totals add across chunks; exact medians come from per-group value counts,
+    approximate ones from per-group QuantileSketches when sketch_error is set.
+    """
+    
+    STATS = ('count', 'mean', 'std', 'min', 'max', 'median')
+    
+    def __init__(self, specs: Tuple[GroupSpec, ...], sketch_error: Optional[float] = None, dropna: bool = True):
+        self.specs = tuple(specs)
+        self.sketch_error = sketch_error
+        # Rows missing a key value are left out, as groupby leaves them out; False groups them under a NaN label
+        self.dropna = dropna
+        # key set -> metric -> whether any spec needs its median
+        self._plan: Dict[Tuple[str, ...], Dict[str, bool]] = {}
+        for spec in self.specs:
+            unknown = set(spec.stats) - set(self.STATS)
+            if unknown:
+                raise ValueError(f"Unknown statistics {sorted(unknown)} in group spec '{spec.name}'")
+            metrics = self._plan.setdefault(spec.keys, {})
+            for metric in spec.metrics:
+                metrics[metric] = metrics.get(metric, False) or 'median' in spec.stats
+        self._shift: Dict[str, float] = {}
+        self._moments: Dict[Tuple[Tuple[str, ...], str], pd.DataFrame] = {}
+        # (keys, metric) -> group label -> (ascending distinct values, counts)
+        self._value_counts: Dict[Tuple[Tuple[str, ...], str], Dict[object, Tuple[np.ndarray, np.ndarray]]] = {}
+        # (keys, metric) -> group label -> sketch of its values
+        self._sketches: Dict[Tuple[Tuple[str, ...], str], Dict[object, QuantileSketch]] = {}
+        # Categorical key -> its dtype, while every chunk declares the same one
+        self._categories: Dict[str, Optional[pd.CategoricalDtype]] = {}
+    
+    @profiled('group_update')
+    def update(self, df: pd.DataFrame) -> None:
+        """Fold one frame (or chunk) into the running totals"""
+        key_codes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        metric_columns: Dict[str, Tuple[np.ndarray, ...]] = {}
+        value_orders: Dict[str, np.ndarray] = {}
+        for keys, metrics in self._plan.items():
+            if any(key not in df.columns for key in keys):
+                continue
+            for key in keys:
+                if key not in key_codes:
+                    codes, uniques = pd.factorize(df[key], use_na_sentinel=self.dropna)
+                    key_codes[key] = (codes.astype(np.int64), np.asarray(uniques, dtype=object))
+            self._track_categories(df, keys)
+            codes, labels = _factorize_groups(keys, key_codes)
+            has_group = codes >= 0
+            
+            for metric, with_median in metrics.items():
+                if metric not in df.columns:
+                    continue
+                if metric not in metric_columns:
+                    metric_columns[metric] = self._metric_columns(df[metric])
+                values, shifted, squared, present = metric_columns[metric]
+                valid = has_group & present
+                columns = (codes, values, shifted, squared)
+                if not valid.all():
+                    columns = tuple(column[valid] for column in columns)
+                self._update_moments(keys, metric, labels, *columns)
+                
+                if with_median and self.sketch_error is not None:
+                    self._update_sketches(keys, metric, *columns[:2], labels)
+                elif with_median:
+                    # One value sort per metric serves every key set that needs its median
+                    if metric not in value_orders:
+                        value_orders[metric] = np.argsort(values)
+                    order = value_orders[metric]
+                    order = order[valid[order]]
+                    self._update_value_counts(keys, metric, codes[order], values[order], labels)
+    
+    def _metric_columns(self, column: pd.Series) -> Tuple[np.ndarray, ...]:
+        """A metric's values, values less the metric's shift, their squares and the non-null mask"""
+        values = column.to_numpy(dtype=float, na_value=np.nan)
+        present = ~np.isnan(values)
+        # Shifting by the first chunk's mean keeps the sums of squares well conditioned
+        if column.name not in self._shift:
+            self._shift[column.name] = float(values[present].mean()) if present.any() else 0.0
+        shifted = np.where(present, values - self._shift[column.name], 0.0)
+        return values, shifted, shifted ** 2, present
+    
+    def _update_moments(self, keys: Tuple[str, ...], metric: str, labels: pd.Index, groups: np.ndarray,
+                        values: np.ndarray, shifted: np.ndarray, squared: np.ndarray) -> None:
+        n_groups = len(labels)
+        counts = np.bincount(groups, minlength=n_groups)
+        mins = np.full(n_groups, np.inf)
+        maxs = np.full(n_groups, -np.inf)
+        np.minimum.at(mins, groups, values)
+        np.maximum.at(maxs, groups, values)
+        chunk = pd.DataFrame({
+            'count': counts,
+            'sum': np.bincount(groups, weights=shifted, minlength=n_groups),
+            'sumsq': np.bincount(groups, weights=squared, minlength=n_groups),
+            'min': np.where(counts > 0, mins, np.nan),
+            'max': np.where(counts > 0, maxs, np.nan),
+        }, index=labels)
+        
+        previous = self._moments.get((keys, metric))
+        if previous is not None:
+            index = previous.index.union(chunk.index)
+            previous, chunk = previous.reindex(index), chunk.reindex(index)
+            merged = previous[['count', 'sum', 'sumsq']].add(chunk[['count', 'sum', 'sumsq']], fill_value=0)
+            merged['min'] = np.fmin(previous['min'], chunk['min'])
+            merged['max'] = np.fmax(previous['max'], chunk['max'])
+            chunk = merged
+        self._moments[(keys, metric)] = chunk
+    
+    def _update_value_counts(self, keys: Tuple[str, ...], metric: str, groups: np.ndarray,
+                             values: np.ndarray, labels: pd.Index) -> None:
+        """Add per-group (distinct values, counts) from rows already in ascending value order"""
+        if not len(values):
+            return
+        # A stable sort on the small group codes keeps values ascending within each group
+        by_group = np.argsort(groups.astype(np.min_scalar_type(len(labels))), kind='stable')
+        groups, values = groups[by_group], values[by_group]
+        run_starts = np.flatnonzero(np.r_[True, (groups[1:] != groups[:-1]) | (values[1:] != values[:-1])])
+        run_counts = np.diff(np.r_[run_starts, len(values)])
+        run_groups, run_values = groups[run_starts], values[run_starts]
+        bounds = np.searchsorted(run_groups, np.arange(len(labels) + 1))
+        
+        state = self._value_counts.setdefault((keys, metric), {})
+        for position, label in enumerate(labels):
+            start, stop = bounds[position], bounds[position + 1]
+            if start == stop:
+                continue
+            counts = (run_values[start:stop], run_counts[start:stop])
+            state[label] = counts if label not in state else _merge_sorted_counts(state[label], counts)
+    
+    def _update_sketches(self, keys: Tuple[str, ...], metric: str, groups: np.ndarray,
+                         values: np.ndarray, labels: pd.Index) -> None:
+        """Add each group's values to its quantile sketch"""
+        if not len(values):
+            return
+        by_group = np.argsort(groups.astype(np.min_scalar_type(len(labels))), kind='stable')
+        values = values[by_group]
+        bounds = np.r_[0, np.cumsum(np.bincount(groups, minlength=len(labels)))]
+        sketches = self._sketches.setdefault((keys, metric), {})
+        for position, label in enumerate(labels):
+            start, stop = bounds[position], bounds[position + 1]
+            if start < stop:
+                sketches.setdefault(label, QuantileSketch(self.sketch_error)).update(values[start:stop])
+    
+    def _track_categories(self, df: pd.DataFrame, keys: Tuple[str, ...]) -> None:
+        """Keep a categorical key's declared order while every chunk agrees on it"""
+        for key in keys:
+            categories = df[key].dtype if isinstance(df[key].dtype, pd.CategoricalDtype) else None
+            if key not in self._categories:
+                self._categories[key] = categories
+            elif self._categories[key] != categories:
+                self._categories[key] = None
+    
+    def statistics(self, keys: Tuple[str, ...], metric: str, by: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+        """count, mean, std, min, max (and median when planned) of metric per group
+        
+        With by, a subset of keys, the groups are first rolled up to those keys; by=() gives one row for all groups.
+        """
+        moments = self._moments[(keys, metric)]
+        medians = self._value_counts.get((keys, metric), self._sketches.get((keys, metric)))
+        if by is not None and tuple(by) != keys:
+            moments, medians = self._roll_up(keys, moments, medians, by)
+            keys = by
+        n = moments['count']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (moments['sumsq'] - moments['sum'] ** 2 / n) / (n - 1)
+            table = pd.DataFrame({
+                'count': n.astype(int),
+                'mean': self._shift[metric] + moments['sum'] / n,
+                'std': np.sqrt(np.maximum(variance, 0.0)),
+                'min': moments['min'],
+                'max': moments['max'],
+            })
+        if medians is not None:
+            table['median'] = [self._median(medians[label]) if label in medians else np.nan for label in table.index]
+        return self._ordered(table, keys) if keys else table
+    
+    @staticmethod
+    def _median(state: Union[QuantileSketch, Tuple[np.ndarray, np.ndarray]]) -> float:
+        """Median of a group's sketch or (ascending distinct values, counts)"""
+        return state.median() if isinstance(state, QuantileSketch) else _quantile_from_sorted_counts(*state, 0.5)
+    
+    @staticmethod
+    def _roll_up(keys: Tuple[str, ...], moments: pd.DataFrame, medians: Optional[dict], by: Tuple[str, ...]
+                 ) -> Tuple[pd.DataFrame, Optional[dict]]:
+        """Moments and median state per group of by, combined from the groups of keys"""
+        unknown = set(by) - set(keys)
+        if unknown:
+            raise KeyError(f"Cannot roll groups of {keys} up to {sorted(unknown)}")
+        levels = [keys.index(key) for key in by]
+        if not levels:
+            groups = [0] * len(moments)
+            grouped = moments.groupby(np.zeros(len(moments), dtype=np.int64))
+        else:
+            index = moments.index
+            if len(levels) < len(keys):
+                index = index.droplevel([level for level in range(len(keys)) if level not in levels])
+            groups = list(index)
+            grouped = moments.groupby(level=levels, sort=False, dropna=False)
+        rolled = grouped.agg({'count': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max'})
+        
+        if medians is not None:
+            members = {}
+            for label, group in zip(moments.index, groups):
+                if label in medians:
+                    members.setdefault(group, []).append(medians[label])
+            medians = {group: QuantileSketch.merged(states) if isinstance(states[0], QuantileSketch)
+                       else functools.reduce(_merge_sorted_counts, states) for group, states in members.items()}
+        return rolled, medians
+    
+    def _ordered(self, table: pd.DataFrame, keys: Tuple[str, ...]) -> pd.DataFrame:
+        """Order groups as a single-frame groupby would"""
+        if len(keys) == 1 and self._categories.get(keys[0]) is not None:
+            order = [c for c in self._categories[keys[0]].categories if c in table.index]
+            return table.reindex(pd.Index(order, name=keys[0]))
+        return table.sort_index()
+    
+    def table(self, spec: GroupSpec) -> Optional[pd.DataFrame]:
+        """The spec's table, or None when its keys or metrics never appeared"""
+        if any((spec.keys, metric) not in self._moments for metric in spec.metrics):
+            return None
+        if len(spec.metrics) > 1:
+            # One statistic per metric, metrics as columns
+            table = pd.DataFrame({
+                metric: self.statistics(spec.keys, metric)[spec.stats[0]] for metric in spec.metrics
+            })
+        elif spec.unstack:
+            table = self.statistics(spec.keys, spec.metrics[0])[spec.stats[0]].unstack()
+        else:
+            table = self.statistics(spec.keys, spec.metrics[0])[list(spec.stats)]
+        table = table.round(spec.decimals)
+        if len(spec.keys) == 1 and self._categories.get(spec.keys[0]) is not None:
+            # Labelled like groupby on the categorical column
+            table.index = pd.CategoricalIndex(table.index, dtype=self._categories[spec.keys[0]], name=spec.keys[0])
+        if spec.sort_by:
+            table = table.sort_values(spec.sort_by, ascending=False)
+        return table
+    
+    def results(self) -> Dict[str, pd.DataFrame]:
+        """Every spec's table, by spec name"""
+        tables = {}
+        for spec in self.specs:
+            with profile_step(spec.name):
+                tables[spec.name] = self.table(spec)
+        return {name: table for name, table in tables.items() if table is not None}
+
+
+class DataExplorer:
+    """Performs exploratory data analysis"""
+    
+    GROUP_SPECS = (
+        # Workout Type Summary
+        GroupSpec('workout_summary', ('Workout_Type',), ('Calories_Burned',),
+                  ('count', 'mean', 'std', 'min', 'max'), sort_by='mean'),
+        # Intensity Ranking (Calories per Minute)
+        GroupSpec('intensity_ranking', ('Workout_Type',), ('Calories_Burned_Per_Minute',),
+                  ('mean', 'median'), decimals=3, sort_by='mean'),
+        # Gender Analysis
+        GroupSpec('gender_summary', ('Gender',), ('Calories_Burned',), ('count', 'mean', 'std')),
+        # Age Group Analysis
+        GroupSpec('age_group_summary', ('Age_Group',), ('Calories_Burned',), ('count', 'mean', 'median')),
+        # Interaction: Workout Type × Gender
+        GroupSpec('workout_gender_interaction', ('Workout_Type', 'Gender'), ('Calories_Burned',),
+                  ('mean',), unstack=True),
+        # Workout Profile: average calories, duration and heart rate per workout type
+        GroupSpec('workout_profile', ('Workout_Type',),
+                  ('Calories_Burned', 'Session_Duration_Minutes', 'Avg_BPM'), ('mean',), decimals=1),
+        # Experience Level Analysis (skipped when the column is absent)
+        GroupSpec('experience_summary', ('Experience_Level',), ('Calories_Burned',), ('count', 'mean', 'median')),
+    )
+    
+    CONFIG_FIELDS = ('QUANTILE_SKETCH_ERROR', 'TARGET_COLUMN', 'CORRELATION_METHOD', 'CORRELATION_TARGET_ONLY')
+    
+    def __init__(self, sketch_error: Optional[float] = None, correlation_method: str = 'pearson',
+                 correlation_target: Optional[str] = None):
+        # Rank error of the sketches behind group medians; None computes them exactly
+        self.sketch_error = sketch_error
+        self.correlation_method = correlation_method
+        # Correlations with this column only; None computes the full matrix
+        self.correlation_target = correlation_target
+    
+    def get_descriptive_stats(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Calculate descriptive statistics"""
+        return df.describe(include='all')
+    
+    @profiled('correlation')
+    def calculate_correlation(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Calculate correlations of the numeric columns (with the target only, when one is set)
+        
+        In memory Spearman ranks are exact: the Pearson correlations of every column's average ranks.
+        """
+        if self.correlation_method == 'spearman':
+            df = df.select_dtypes(include=[np.number]).rank()
+        accumulator = CorrelationAccumulator('pearson', self.correlation_target)
+        accumulator.update(df)
+        return accumulator.result()
+    
+    @profiled('group_analysis')
+    def perform_group_analysis(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Perform every GROUP_SPECS analysis in one pass over the frame"""
+        aggregator = self.create_group_aggregator()
+        aggregator.update(df)
+        return self.summarize_groups(aggregator)
+    
+    def create_group_aggregator(self) -> GroupAggregator:
+        """Aggregator for GROUP_SPECS; feed it the whole frame or one chunk at a time"""
+        return GroupAggregator(self.GROUP_SPECS, self.sketch_error)
+    
+    def create_correlation_accumulator(self) -> CorrelationAccumulator:
+        """Accumulator for calculate_correlation, fed one chunk at a time (in spearman mode, twice: see
+        CorrelationAccumulator)"""
+        return CorrelationAccumulator(self.correlation_method, self.correlation_target)
+    
+    @profiled('summarize_groups')
+    def summarize_groups(self, aggregator: GroupAggregator) -> Dict[str, pd.DataFrame]:
+        """Build the group-analysis tables from an aggregator"""
+        results = aggregator.results()
+        print(f"✓ Completed {len(results)} group analyses")
+        return results
+
+
+def _linear_bin(values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """Linear binning onto a regular grid: each value's weight is split between its two nearest points"""
+    step = grid[1] - grid[0]
+    position = (values[np.isfinite(values)] - grid[0]) / step
+    position = np.clip(position, 0, len(grid) - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, len(grid) - 1)
+    fraction = position - lower
+    return (np.bincount(lower, weights=1 - fraction, minlength=len(grid))
+            + np.bincount(upper, weights=fraction, minlength=len(grid)))
+
+
+def _binned_kde(grid: np.ndarray, counts: np.ndarray, n: float, std: float) -> np.ndarray:
+    """Gaussian KDE (Scott's bandwidth) on a regular grid, by FFT convolution of linearly binned counts"""
+    if n < 2 or not std > 0:
+        return np.zeros_like(grid)
+    step = grid[1] - grid[0]
+    bandwidth = std * n ** (-1 / 5)
+    half = min(len(grid) - 1, int(np.ceil(4 * bandwidth / step)))
+    offsets = np.arange(-half, half + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    size = len(grid) + len(kernel) - 1
+    n_fft = 1 << (size - 1).bit_length()
+    convolved = np.fft.irfft(np.fft.rfft(counts, n_fft) * np.fft.rfft(kernel, n_fft), n_fft)[:size]
+    return np.maximum(convolved[half:half + len(grid)] / n, 0.0)
+
+
+def _value_range(low: float, high: float) -> Tuple[float, float]:
+    """(low, high), widened when a column holds a single value"""
+    return (low, high) if high > low else (low - 0.5, low + 0.5)
+
+
+def _bar_verts(positions: np.ndarray, width: float, lengths: np.ndarray, horizontal: bool = False) -> np.ndarray:
+    """(n, 4, 2) corners of bars centred on positions, running from 0 to lengths (missing lengths draw nothing)"""
+    lengths = np.nan_to_num(np.asarray(lengths, dtype=float))
+    low, high, zeros = positions - width / 2, positions + width / 2, np.zeros(len(positions))
+    verts = np.stack([np.stack(corner, axis=-1) for corner in
+                      ((low, zeros), (low, lengths), (high, lengths), (high, zeros))], axis=1)
+    return verts[..., ::-1] if horizontal else verts
+
+
+def _hexbin_lattice(ax: plt.Axes, extent: Tuple[float, float, float, float]) -> tuple:
+    """(PolyCollection, hexagon of every fine cell) of the hexagons Axes.hexbin lays over extent
+    
+    Axes.hexbin bins the centre of every ChartDataBuilder fine cell itself, and its reduce_C_function
+    collects each hexagon's cells, so the collection maps back to the cells without redoing its lattice.
+    Only hexagons holding a cell are kept, in the order of the collection's offsets.
+    """
+    x, y = ChartDataBuilder.hexbin_cells(extent)
+    members = []
+    
+    def collect(cells: list) -> int:
+        members.append(cells)
+        return len(members) - 1
+    
+    hexbin = ax.hexbin(x, y, C=np.arange(len(x)), reduce_C_function=collect, extent=extent,
+                       gridsize=ChartDataBuilder.HEXBIN_GRIDSIZE, cmap='YlOrRd')
+    cell_hexagons = np.full(len(x), -1, dtype=np.int64)
+    for hexagon, member in enumerate(np.asarray(hexbin.get_array(), dtype=np.int64)):
+        cell_hexagons[np.asarray(members[member], dtype=np.int64)] = hexagon
+    return hexbin, cell_hexagons
+
+
+@functools.lru_cache(maxsize=8)
+def _hexbin_cell_hexagons(extent: Tuple[float, float, float, float]) -> np.ndarray:
+    """The hexagon of every fine cell as _hexbin_lattice numbers them, laid out once per process"""
+    from matplotlib.figure import Figure
+    return _hexbin_lattice(Figure().add_subplot(), extent)[1]
+
+
+def _hexagon_counts(hexbin: tuple, cell_hexagons: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rows in every _hexbin_lattice hexagon, from ChartDataBuilder's hexbin (x, y, counts, extent) cells"""
+    x, y, counts, extent = hexbin
+    if cell_hexagons is None:
+        cell_hexagons = _hexbin_cell_hexagons(tuple(float(value) for value in extent))
+    hexagons = cell_hexagons[ChartDataBuilder.hexbin_cell_ids(x, y, extent)]
+    return np.bincount(hexagons, weights=counts, minlength=cell_hexagons.max() + 1)
+
+
+class RunningMoments:
+    """Count, mean and sum of squared deviations, merged chunk by chunk"""
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def update(self, values: np.ndarray) -> None:
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        n, mean = len(values), values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+    
+    @property
+    def std(self) -> float:
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+
+class ChartDataBuilder:
+    """Precomputes every row-level dashboard aggregate, so plotting cost no longer grows with row count"""
+    
+    HIST_BINS = 50
+    KDE_POINTS = 1000
+    HEXBIN_GRIDSIZE = 25
+    HEXBIN_FINE_BINS = 256
+    VIOLIN_POINTS = 512
+    VIOLIN_GROUPS = ('Female', 'Male')
+    # Value ranges fix every grid up front, which keeps the counts mergeable across chunks
+    RANGE_COLUMNS = ('Calories_Burned', 'Avg_BPM', 'BMI')
+    CONFIG_FIELDS = ('QUANTILE_SKETCH_ERROR',)
+    
+    def __init__(self, ranges: Dict[str, Tuple[float, float]], sketch_error: Optional[float] = None):
+        cal_low, cal_high = _value_range(*ranges['Calories_Burned'])
+        bpm_low, bpm_high = _value_range(*ranges['Avg_BPM'])
+        bmi_low, bmi_high = _value_range(*ranges['BMI'])
+        
+        self._hist_edges = np.linspace(cal_low, cal_high, self.HIST_BINS + 1)
+        self._hist_counts = np.zeros(self.HIST_BINS)
+        span = cal_high - cal_low
+        self._kde_grid = np.linspace(cal_low - 0.5 * span, cal_high + 0.5 * span, self.KDE_POINTS)
+        self._kde_counts = np.zeros(self.KDE_POINTS)
+        self._calories = RunningMoments()
+        # Median lines: exact value counts, or sketches when sketch_error is set
+        self._calorie_values = _quantile_accumulator(sketch_error)
+        
+        self._hex_extent = (bpm_low, bpm_high, cal_low, cal_high)
+        self._hex_edges = (np.linspace(bpm_low, bpm_high, self.HEXBIN_FINE_BINS + 1),
+                           np.linspace(cal_low, cal_high, self.HEXBIN_FINE_BINS + 1))
+        self._hex_counts = np.zeros((self.HEXBIN_FINE_BINS, self.HEXBIN_FINE_BINS))
+        
+        self._bmi_grid = np.linspace(bmi_low, bmi_high, self.VIOLIN_POINTS)
+        self._bmi = {group: {'counts': np.zeros(self.VIOLIN_POINTS), 'moments': RunningMoments(),
+                             'values': _quantile_accumulator(sketch_error), 'min': np.inf, 'max': -np.inf}
+                     for group in self.VIOLIN_GROUPS}
+    
+    @classmethod
+    def hexbin_cells(cls, extent: Tuple[float, float, float, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Centres of the fine hexbin cells over extent, numbered as hexbin_cell_ids numbers them"""
+        x_edges = np.linspace(extent[0], extent[1], cls.HEXBIN_FINE_BINS + 1)
+        y_edges = np.linspace(extent[2], extent[3], cls.HEXBIN_FINE_BINS + 1)
+        x, y = np.meshgrid((x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2, indexing='ij')
+        return x.ravel(), y.ravel()
+    
+    @classmethod
+    def hexbin_cell_ids(cls, x: np.ndarray, y: np.ndarray, extent: Tuple[float, float, float, float]) -> np.ndarray:
+        """Number of the fine cell each hexbin centre of result() lies in"""
+        bins = cls.HEXBIN_FINE_BINS
+        column = np.floor((np.asarray(x) - extent[0]) / (extent[1] - extent[0]) * bins).astype(np.int64)
+        row = np.floor((np.asarray(y) - extent[2]) / (extent[3] - extent[2]) * bins).astype(np.int64)
+        return np.clip(column, 0, bins - 1) * bins + np.clip(row, 0, bins - 1)
+    
+    @classmethod
+    def ranges_from_frame(cls, df: pd.DataFrame) -> Dict[str, Tuple[float, float]]:
+        return {col: (df[col].min(), df[col].max()) for col in cls.RANGE_COLUMNS}
+    
+    @classmethod
+    @profiled('chart_data')
+    def from_frame(cls, df: pd.DataFrame, sketch_error: Optional[float] = None) -> Dict[str, object]:
+        """Chart data for a whole frame in one pass"""
+        builder = cls(cls.ranges_from_frame(df), sketch_error)
+        builder.update(df)
+        return builder.result()
+    
+    @profiled('chart_update')
+    def update(self, df: pd.DataFrame) -> None:
+        """Fold one chunk of rows into every chart aggregate"""
+        calories = df['Calories_Burned'].to_numpy(dtype=float)
+        # Rows appended after the grids were fixed may fall outside them; they land in the edge bins
+        calories_in_range = np.clip(calories, self._hist_edges[0], self._hist_edges[-1])
+        self._hist_counts += np.histogram(calories_in_range, bins=self._hist_edges)[0]
+        self._kde_counts += _linear_bin(calories, self._kde_grid)
+        self._calories.update(calories)
+        self._calorie_values.update(df['Calories_Burned'])
+        
+        bpm = np.clip(df['Avg_BPM'].to_numpy(dtype=float), self._hex_extent[0], self._hex_extent[1])
+        both = np.isfinite(bpm) & np.isfinite(calories)
+        self._hex_counts += np.histogram2d(bpm[both], calories_in_range[both], bins=self._hex_edges)[0]
+        
+        for group, acc in self._bmi.items():
+            bmi = df.loc[df['Gender'] == group, 'BMI'].dropna()
+            if bmi.empty:
+                continue
+            values = bmi.to_numpy(dtype=float)
+            acc['counts'] += _linear_bin(values, self._bmi_grid)
+            acc['moments'].update(values)
+            acc['values'].update(bmi)
+            acc['min'] = min(acc['min'], values.min())
+            acc['max'] = max(acc['max'], values.max())
+    
+    def result(self) -> Dict[str, object]:
+        """Small arrays and numbers the Visualizer draws from"""
+        x_centers, y_centers = self.hexbin_cells(self._hex_extent)
+        occupied = self._hex_counts.ravel() > 0
+        
+        violins = {}
+        for group, acc in self._bmi.items():
+            moments = acc['moments']
+            density = _binned_kde(self._bmi_grid, acc['counts'], moments.count, moments.std)
+            inside = (self._bmi_grid >= acc['min']) & (self._bmi_grid <= acc['max'])
+            violins[group] = {
+                'coords': self._bmi_grid[inside], 'vals': density[inside], 'quantiles': [],
+                'mean': moments.mean if moments.count else np.nan, 'median': acc['values'].median(),
+                'min': acc['min'], 'max': acc['max'],
+            }
+        
+        return {
+            'calorie_hist': (self._hist_counts, self._hist_edges),
+            'calorie_kde': (self._kde_grid, _binned_kde(self._kde_grid, self._kde_counts,
+                                                        self._calories.count, self._calories.std)),
+            'calories_mean': self._calories.mean,
+            'calories_median': self._calorie_values.median(),
+            'hexbin': (x_centers[occupied], y_centers[occupied], self._hex_counts.ravel()[occupied], self._hex_extent),
+            'bmi_violins': violins,
+        }
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """How dashboards are rasterized and encoded: resolution, layout, Agg options and file format"""
+    dpi: int
+    # Measure every tick label with tight_layout, or place the axes with the precomputed Visualizer.LAYOUTS
+    # (as long as the category names fit them)
+    tight_layout: bool = False
+    # Crop to the drawn content with bbox_inches='tight' (an extra draw pass to measure it) instead of
+    # keeping the figure's own layout
+    tight_bbox: bool = False
+    # Agg path simplification: vertices closer than this many pixels to the line are merged
+    simplify_threshold: float = 1 / 9
+    # Vertices per Agg path chunk; 0 draws every path whole
+    path_chunksize: int = 0
+    # Draw each chart's value labels with one TextBatch artist instead of one Text artist per label
+    batch_labels: bool = True
+    # 'png', 'png-fast' (fast zlib level), 'png-optimized' (256-colour palette) or 'webp'
+    format: str = 'png'
+    # WebP quality
+    quality: int = 90
+    
+    # Format -> file extension; the canvas formats encode the drawn canvas themselves
+    EXTENSIONS = {'png': 'png', 'png-fast': 'png', 'png-optimized': 'png', 'webp': 'webp'}
+    CANVAS_FORMATS = ('png-fast', 'png-optimized')
+    
+    def __post_init__(self):
+        if self.format not in self.EXTENSIONS:
+            raise ValueError(f"Unknown chart format '{self.format}', expected one of {sorted(self.EXTENSIONS)}")
+        if self.tight_bbox and self.format in self.CANVAS_FORMATS:
+            raise ValueError(f"'{self.format}' encodes the figure canvas, which a tight bbox would crop")
+    
+    @property
+    def extension(self) -> str:
+        return self.EXTENSIONS[self.format]
+    
+    def with_format(self, format: str) -> 'RenderProfile':
+        """This profile saving another format; canvas formats keep the figure's own layout"""
+        return replace(self, format=format, tight_bbox=self.tight_bbox and format not in self.CANVAS_FORMATS)
+    
+    def rc_params(self) -> Dict[str, object]:
+        return {'path.simplify': True, 'path.simplify_threshold': self.simplify_threshold,
+                'agg.path.chunksize': self.path_chunksize}
+    
+    def save(self, fig: plt.Figure, filename: str) -> None:
+        if self.format not in self.CANVAS_FORMATS:
+            fig.savefig(filename, format=self.extension, dpi=self.dpi, bbox_inches='tight' if self.tight_bbox else None,
+                        pil_kwargs={'quality': self.quality} if self.format == 'webp' else None)
+            return
+        fig.set_dpi(self.dpi)
+        fig.canvas.draw()
+        self.encode(fig.canvas, filename)
+    
+    def encode(self, canvas, filename: str) -> None:
+        """Write a drawn Agg canvas in one of the CANVAS_FORMATS"""
+        from PIL import Image
+        rgba = np.asarray(canvas.buffer_rgba())
+        image = Image.frombuffer('RGBA', (rgba.shape[1], rgba.shape[0]), rgba, 'raw', 'RGBA', 0, 1)
+        if self.format == 'png-fast':
+            # Opaque RGB at a fast zlib level: a few times quicker to encode than the default, for slightly larger files
+            image.convert('RGB').save(filename, format='png', compress_level=1)
+            return
+        # Dashboards are flat colours and antialiased edges: a 256-colour palette keeps them intact
+        image.convert('RGB').quantize(256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE).save(
+            filename, format='png', optimize=True)
+
+
+@functools.lru_cache(maxsize=None)
+def _text_batch_class() -> type:
+    """TextBatch, defined on first use like _pyplot so runs that draw nothing never import matplotlib"""
+    from matplotlib import rcParams
+    from matplotlib.artist import Artist
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.transforms import Bbox
+    
+    class TextBatch(Artist):
+        """Labels sharing one style, laid out and drawn by a single artist instead of a Text artist each"""
+        
+        # Above patches and lines, like Text
+        zorder = 3
+        
+        def __init__(self, xs: np.ndarray, ys: np.ndarray, texts: List[str], transform, ha: str = 'left',
+                     va: str = 'baseline', color: Optional[str] = None, fontsize: float = 10,
+                     fontweight: str = 'normal'):
+            super().__init__()
+            self._points = np.column_stack([xs, ys]).astype(float)
+            self._texts = list(texts)
+            self._ha, self._va = ha, va
+            self._color = color or rcParams['text.color']
+            self._font = FontProperties(size=fontsize, weight=fontweight)
+            self.set_transform(transform)
+            # Like Axes.text, labels may sit outside the axes
+            self.set_clip_on(False)
+        
+        def _layout(self, renderer) -> List[Tuple[float, float, float, float, float]]:
+            """(left, bottom, width, height, descent) in display pixels of every label"""
+            # Every label is at least as tall as 'lp', so labels of one row share a baseline
+            _, lp_height, lp_descent = renderer.get_text_width_height_descent('lp', self._font, ismath=False)
+            boxes = []
+            for (x, y), text in zip(self.get_transform().transform(self._points), self._texts):
+                width, height, descent = renderer.get_text_width_height_descent(text, self._font, ismath=False)
+                descent = max(descent, lp_descent)
+                height = max(height - descent, lp_height - lp_descent) + descent
+                left = x - {'left': 0, 'center': width / 2, 'right': width}[self._ha]
+                bottom = y - {'bottom': 0, 'center': height / 2, 'top': height, 'baseline': descent}[self._va]
+                boxes.append((left, bottom, width, height, descent))
+            return boxes
+        
+        def get_window_extent(self, renderer=None) -> Bbox:
+            boxes = self._layout(renderer or self.figure.canvas.get_renderer())
+            if not boxes:
+                return Bbox.null()
+            return Bbox.union([Bbox.from_bounds(*box[:4]) for box in boxes])
+        
+        def draw(self, renderer) -> None:
+            if not self.get_visible():
+                return
+            gc = renderer.new_gc()
+            gc.set_foreground(self._color)
+            gc.set_alpha(self.get_alpha())
+            gc.set_antialiased(True)
+            canvas_height = renderer.get_canvas_width_height()[1]
+            for (left, bottom, _, _, descent), text in zip(self._layout(renderer), self._texts):
+                baseline = bottom + descent
+                renderer.draw_text(gc, left, canvas_height - baseline if renderer.flipy() else baseline,
+                                   text, self._font, 0)
+            gc.restore()
+            self.stale = False
+    
+    return TextBatch
+
+
+class DashboardFigure(abc.ABC):
+    """One dashboard's figure, laid out from its scales and drawn from data
+    
+    Scales are axis limits, colour ranges and category orders. Visualizer builds one for every dashboard
+    it saves, with the scales of the data it draws. SegmentFanout builds one per process with scales
+    covering every segment and freezes it: everything static is rasterized once into a background, and
+    each segment only redraws the artists that follow its data.
+    """
+    
+    FIGSIZE: Tuple[float, float] = (16, 6)
+    TITLE = ''
+    TITLE_Y = 0.98
+    # Scales listing the category names written along the axes, which the margins have to make room for
+    CATEGORY_SCALES: Tuple[str, ...] = ()
+    
+    def __init__(self, scales: Dict[str, object], dpi: Optional[float] = None, batch_labels: bool = True):
+        _pyplot()  # chart style and the Agg backend
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        self.fig = Figure(figsize=self.FIGSIZE, dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        self.batch_labels = batch_labels
+        # Characters in the longest category name on the axes
+        self.label_chars = max((len(str(name)) for key in self.CATEGORY_SCALES for name in scales[key]), default=0)
+        # Artists that follow the data, and the ones every update replaces, by name
+        self._dynamic = []
+        self._replaced = {}
+        self._background = None
+        self._title = self._follows(self.fig.suptitle(self.TITLE, fontsize=20, fontweight='bold', y=self.TITLE_Y))
+        self._build(scales)
+    
+    @classmethod
+    @abc.abstractmethod
+    def scales(cls, data: Dict[str, object]) -> Dict[str, object]:
+        """Scales covering data, whose tables may stack the rows of many segments"""
+    
+    @abc.abstractmethod
+    def _build(self, scales: Dict[str, object]) -> None:
+        """Lay out the axes and every artist that only depends on the scales"""
+    
+    @abc.abstractmethod
+    def _draw_data(self, data: Dict[str, object]) -> None:
+        """Point the artists that follow the data at data"""
+    
+    def update(self, data: Dict[str, object]) -> None:
+        """Draw data, titled with data['title'] when it has one"""
+        self._title.set_text(f"{self.TITLE}: {data['title']}" if data.get('title') else self.TITLE)
+        self._draw_data(data)
+    
+    def _follows(self, artist):
+        """Register an artist that changes with the data; a frozen figure redraws it on every blit"""
+        self._dynamic.append(artist)
+        return artist
+    
+    def _replace(self, name: str, artists: list) -> None:
+        """Swap the artists drawn under name for new ones"""
+        for artist in self._replaced.pop(name, []):
+            artist.remove()
+            self._dynamic.remove(artist)
+        self._replaced[name] = [self._follows(artist) for artist in artists]
+    
+    def _labels(self, ax: plt.Axes, xs: np.ndarray, ys: np.ndarray, texts: List[str], **style) -> list:
+        """Value labels at data coordinates: one TextBatch artist, or a Text artist each without batch_labels"""
+        if self.batch_labels:
+            return [ax.add_artist(_text_batch_class()(xs, ys, texts, ax.transData, **style))]
+        return [ax.text(x, y, text, **style) for x, y, text in zip(xs, ys, texts)]
+    
+    def freeze(self) -> None:
+        """Lay the figure out and keep the pixels of everything static as the background blit draws over"""
+        self.fig.tight_layout()
+        for artist in self._dynamic:
+            artist.set_visible(False)
+        self.fig.canvas.draw()
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self._dynamic:
+            artist.set_visible(True)
+    
+    def blit(self, data: Dict[str, object], filename: str, profile: RenderProfile) -> None:
+        """Draw data over the frozen background and encode the canvas in one of profile's canvas formats"""
+        self.update(data)
+        self.fig.canvas.restore_region(self._background)
+        # In the order a full draw takes: axes by axes, then figure artists like the title
+        order = {ax: position for position, ax in enumerate(self.fig.axes)}
+        for artist in sorted(self._dynamic, key=lambda artist: (order.get(artist.axes, len(order)), artist.get_zorder())):
+            self.fig.draw_artist(artist)
+        profile.encode(self.fig.canvas, filename)
+
+
+class SummaryDashboard(DashboardFigure):
+    """Calorie distribution, heart rate vs calories density, workout metrics and calories by gender × workout"""
+    
+    FIGSIZE = (18, 12)
+    TITLE = 'Fitness Performance Analysis Dashboard'
+    TITLE_Y = 0.995
+    CATEGORY_SCALES = ('workouts', 'genders', 'heat_workouts')
+    # workout_stats column, divisor, legend label and colour of each metric bar
+    METRICS = (('Calories_Burned', 10, 'Calories (÷10)', '#FF6B6B'),
+               ('Session_Duration_Minutes', 1, 'Duration (min)', '#4ECDC4'),
+               ('Avg_BPM', 1, 'BPM', '#FFA07A'))
+    BAR_WIDTH = 0.25
+    METRIC_OFFSETS = (-0.25, 0.0, 0.25)
+    
+    @classmethod
+    def scales(cls, data: Dict[str, object]) -> Dict[str, object]:
+        counts, edges = data['calorie_hist']
+        grid, density = data['calorie_kde']
+        workout_stats, gender_workout = data['workout_stats'], data['gender_workout']
+        metrics = np.concatenate([workout_stats[column].to_numpy(dtype=float) / divisor
+                                  for column, divisor, _, _ in cls.METRICS])
+        heat = gender_workout.to_numpy(dtype=float)
+        heat = heat[np.isfinite(heat)]
+        return {
+            'calorie_edges': edges,
+            'kde_grid': grid,
+            'hist_max': counts.max(initial=0),
+            'kde_max': density.max(initial=0),
+            'hex_extent': data['hexbin'][3],
+            'hex_max': float(_hexagon_counts(data['hexbin']).max(initial=0)),
+            'workouts': sorted(workout_stats.index.unique()),
+            'metrics_max': np.nanmax(metrics, initial=1.0),
+            'genders': sorted(gender_workout.index.unique()),
+            'heat_workouts': sorted(gender_workout.columns.unique()),
+            'heat_range': (heat.min(), heat.max()) if heat.size else (0.0, 1.0),
+        }
+    
+    def _build(self, scales: Dict[str, object]) -> None:
+        axes = self.fig.subplots(2, 2)
+        self._build_calorie_distribution(axes[0, 0], scales)
+        self._build_bpm_calorie_density(axes[0, 1], scales)
+        self._build_workout_metrics(axes[1, 0], scales)
+        self._build_gender_workout_heatmap(axes[1, 1], scales)
+    
+    def _build_calorie_distribution(self, ax: plt.Axes, scales: Dict[str, object]) -> None:
+        """Calories Burned Distribution (Histogram with KDE)"""
+        from matplotlib.collections import PolyCollection
+        edges, grid = scales['calorie_edges'], scales['kde_grid']
+        self._hist_x, self._hist_width = (edges[:-1] + edges[1:]) / 2, edges[1] - edges[0]
+        self._hist = self._follows(ax.add_collection(PolyCollection(
+            _bar_verts(self._hist_x, self._hist_width, np.zeros(len(self._hist_x))),
+            facecolor='steelblue', alpha=0.7, edgecolor='black')))
+        ax_twin = ax.twinx()
+        self._kde = self._follows(ax_twin.plot(grid, np.zeros_like(grid), color='red', linewidth=2.5)[0])
+        margin = 0.05 * (grid[-1] - grid[0])
+        ax.set_xlim(grid[0] - margin, grid[-1] + margin)
+        ax.set_ylim(0, scales['hist_max'] * 1.05 or 1)
+        ax_twin.set_ylim(0, scales['kde_max'] * 1.05 or 1)
+    
+        ax.set_xlabel('Calories Burned', fontsize=11, fontweight='bold')
+        ax.set_ylabel('Frequency', fontsize=11, fontweight='bold')
+        ax_twin.set_ylabel('Density', fontsize=11, fontweight='bold', color='red')
+        ax.set_title('Calories Burned Distribution', fontsize=14, fontweight='bold')
+        ax.grid(axis='y', alpha=0.3)
+    
+        # Add statistics; the legend starts sized for the widest value any data can show
+        widest = edges[-1]
+        self._mean_line = self._follows(ax.axvline(widest, color='green', linestyle='--', linewidth=2,
+                                                   label=f'Mean: {widest:.0f}'))
+        self._median_line = self._follows(ax.axvline(widest, color='orange', linestyle='--', linewidth=2,
+                                                     label=f'Median: {widest:.0f}'))
+        self._legend = self._follows(ax.legend(loc='upper right', fontsize=9))
+    
+    def _build_bpm_calorie_density(self, ax: plt.Axes, scales: Dict[str, object]) -> None:
+        """Average BPM vs Calories (Hexbin for density)"""
+        extent = scales['hex_extent']
+        # One hexagon collection over the whole lattice; every data keeps the hexagons it fills and recolours
+        # them on a colour scale the scales fix
+        self._hexbin, self._hex_cells = _hexbin_lattice(ax, extent)
+        self._hex_offsets = self._hexbin.get_offsets().copy()
+        self._follows(self._hexbin)
+        self._hexbin.set_clim(1, max(scales['hex_max'], 1))
+        ax.set_xlim(extent[0], extent[1])
+        ax.set_ylim(extent[2], extent[3])
+        ax.set_xlabel('Average BPM', fontsize=11, fontweight='bold')
+        ax.set_ylabel('Calories Burned', fontsize=11, fontweight='bold')
+        ax.set_title('Heart Rate vs Calories Burned (Density)', fontsize=14, fontweight='bold')
+        self.fig.colorbar(self._hexbin, ax=ax).set_label('Count', fontsize=10)
+        ax.grid(alpha=0.3)
+    
+    def _build_workout_metrics(self, ax: plt.Axes, scales: Dict[str, object]) -> None:
+        """Workout Performance Comparison (Grouped Bar Chart)"""
+        from matplotlib.collections import PolyCollection
+        from matplotlib.patches import Patch
+        self._workouts = scales['workouts']
+        self._metric_x = np.arange(len(self._workouts))
+        self._metric_bars = [self._follows(ax.add_collection(PolyCollection(
+            _bar_verts(self._metric_x + offset, self.BAR_WIDTH, np.zeros(len(self._metric_x))),
+            facecolor=color, alpha=0.8))) for offset, (_, _, _, color) in zip(self.METRIC_OFFSETS, self.METRICS)]
+        ax.set_xlim(-0.5, max(len(self._workouts), 1) - 0.5)
+        # Headroom for the value labels
+        ax.set_ylim(0, scales['metrics_max'] * 1.1)
+        self._metric_axes = ax
+    
+        ax.set_xlabel('Workout Type', fontsize=11, fontweight='bold')
+        ax.set_ylabel('Normalized Values', fontsize=11, fontweight='bold')
+        ax.set_title('Workout Performance Metrics Comparison', fontsize=14, fontweight='bold')
+        ax.set_xticks(self._metric_x)
+        ax.set_xticklabels(self._workouts, rotation=45, ha='right')
+        ax.legend(handles=[Patch(facecolor=color, alpha=0.8, label=label) for _, _, label, color in self.METRICS],
+                  loc='upper left', fontsize=9)
+        ax.grid(axis='y', alpha=0.3)
+    
+    def _build_gender_workout_heatmap(self, ax: plt.Axes, scales: Dict[str, object]) -> None:
+        """Gender vs Workout Type Performance Heatmap"""
+        self._genders, self._heat_workouts = scales['genders'], scales['heat_workouts']
+        shape = (len(self._genders), len(self._heat_workouts))
+        self._heatmap = self._follows(ax.imshow(np.zeros(shape), cmap='RdYlGn', aspect='auto',
+                                                vmin=scales['heat_range'][0], vmax=scales['heat_range'][1]))
+        ax.set_xticks(np.arange(shape[1]))
+        ax.set_yticks(np.arange(shape[0]))
+        ax.set_xticklabels(self._heat_workouts, rotation=45, ha='right')
+        ax.set_yticklabels(self._genders)
+        ax.set_title('Calories by Gender × Workout Type', fontsize=14, fontweight='bold')
+        self.fig.colorbar(self._heatmap, ax=ax).set_label('Avg Calories', fontsize=10)
+        self._heat_axes = ax
+    
+    def _draw_data(self, data: Dict[str, object]) -> None:
+        counts, _ = data['calorie_hist']
+        self._hist.set_verts(_bar_verts(self._hist_x, self._hist_width, counts))
+        self._kde.set_ydata(data['calorie_kde'][1])
+        for line, text, name, value in zip((self._mean_line, self._median_line), self._legend.get_texts(),
+                                           ('Mean', 'Median'), (data['calories_mean'], data['calories_median'])):
+            line.set_xdata([value, value])
+            text.set_text(f'{name}: {value:.0f}')
+    
+        # Fine-grid counts are summed into the hexagons their cells fall in; empty hexagons are not drawn
+        counts = _hexagon_counts(data['hexbin'], self._hex_cells)
+        filled = counts >= 1
+        self._hexbin.set_offsets(self._hex_offsets[filled])
+        self._hexbin.set_array(counts[filled])
+    
+        # Add value labels on bars; workouts the data lacks get neither
+        stats = data['workout_stats'].reindex(self._workouts)
+        xs, heights = [], []
+        for bars, offset, (column, divisor, _, _) in zip(self._metric_bars, self.METRIC_OFFSETS, self.METRICS):
+            values = stats[column].to_numpy(dtype=float) / divisor
+            bars.set_verts(_bar_verts(self._metric_x + offset, self.BAR_WIDTH, values))
+            xs.append(self._metric_x + offset)
+            heights.append(values)
+        xs, heights = np.concatenate(xs), np.concatenate(heights)
+        shown = ~np.isnan(heights)
+        self._replace('metric_labels', self._labels(self._metric_axes, xs[shown], heights[shown],
+                                                    [f'{height:.0f}' for height in heights[shown]],
+                                                    ha='center', va='bottom', fontsize=7))
+    
+        heat = data['gender_workout'].reindex(index=self._genders, columns=self._heat_workouts).to_numpy(dtype=float)
+        self._heatmap.set_data(np.ma.masked_invalid(heat))
+        rows, columns = np.indices(heat.shape)
+        shown = ~np.isnan(heat)
+        self._replace('heat_labels', self._labels(self._heat_axes, columns[shown], rows[shown],
+                                                  [f'{value:.0f}' for value in heat[shown]],
+                                                  ha="center", va="center", color="black", fontsize=11,
+                                                  fontweight='bold'))
+
+
+class InsightsDashboard(DashboardFigure):
+    """Workout intensity ranking and BMI distribution by gender"""
+    
+    FIGSIZE = (16, 6)
+    TITLE = 'Fitness Insights Dashboard'
+    TITLE_Y = 0.98
+    CATEGORY_SCALES = ('intensity_workouts',)
+    VIOLIN_COLORS = ('#66c2a5', '#fc8d62')
+    # Axes.violin's default width; a body spans half of it either side of its position, the lines a quarter
+    VIOLIN_WIDTH = 0.5
+    VIOLIN_LINES = ('cmeans', 'cmedians', 'cmins', 'cmaxes', 'cbars')
+    
+    @classmethod
+    def scales(cls, data: Dict[str, object]) -> Dict[str, object]:
+        intensity, violins = data['intensity_ranking'], data['bmi_violins'].values()
+        lows = [violin['min'] for violin in violins if np.isfinite(violin['min'])]
+        highs = [violin['max'] for violin in violins if np.isfinite(violin['max'])]
+        return {
+            # Longest names first, so the layout leaves room for them before any data is drawn
+            'intensity_workouts': sorted(intensity.index.unique(), key=lambda name: -len(str(name))),
+            'intensity_max': np.nanmax(intensity['mean'].to_numpy(dtype=float), initial=0.0),
+            'bmi_range': _value_range(min(lows), max(highs)) if lows else (0.0, 1.0),
+        }
+    
+    def _build(self, scales: Dict[str, object]) -> None:
+        axes = self.fig.subplots(1, 2)
+        self._build_intensity_ranking(axes[0], scales)
+        self._build_bmi_violins(axes[1], scales)
+    
+    def _build_intensity_ranking(self, ax: plt.Axes, scales: Dict[str, object]) -> None:
+        """Workout Intensity Ranking (calories per minute, with medians)"""
+        from matplotlib.collections import LineCollection, PolyCollection
+        from matplotlib.lines import Line2D
+        workouts = scales['intensity_workouts']
+        self._rank_y = np.arange(len(workouts))
+        self._rank_bars = self._follows(ax.add_collection(PolyCollection(
+            [], facecolor='none', alpha=0.85, edgecolor='black', linewidth=1.5)))
+        self._rank_medians = self._follows(ax.add_collection(LineCollection([], color='darkblue', linewidth=2,
+                                                                            alpha=0.7)))
+        margin = 0.05 * (max(len(workouts), 1) - 0.2)
+        ax.set_ylim(-0.4 - margin, max(len(workouts), 1) - 0.6 + margin)
+        ax.set_xlim(0, scales['intensity_max'] * 1.15 or 1)
+        # The tick labels follow each data's order; they start with the longest names for the layout
+        ax.set_yticks(self._rank_y, [str(name) for name in workouts])
+        self._follows(ax.yaxis)
+        self._rank_axes = ax
+    
+        ax.set_xlabel('Calories Burned per Minute', fontsize=12, fontweight='bold')
+        ax.set_title('Workout Intensity Ranking - Calories Burned per Minute', fontsize=13, fontweight='bold', pad=15)
+        ax.grid(axis='x', alpha=0.4, linestyle='--')
+        # Add legend for median line
+        ax.legend(handles=[Line2D([0], [0], color='darkblue', linewidth=2, label='Median')], loc='lower right',
+                  fontsize=10)
+    
+    def _build_bmi_violins(self, ax: plt.Axes, scales: Dict[str, object]) -> None:
+        """BMI Distribution by Gender"""
+        low, high = scales['bmi_range']
+        # Drawn once on placeholder statistics; every data moves the bodies and lines it made
+        placeholder = {'coords': np.array([low, high]), 'vals': np.ones(2), 'mean': low, 'median': low,
+                       'min': low, 'max': high}
+        positions = np.arange(len(ChartDataBuilder.VIOLIN_GROUPS))
+        parts = ax.violin([placeholder] * len(positions), positions=positions, widths=self.VIOLIN_WIDTH,
+                          showmeans=True, showmedians=True)
+        for body, color in zip(parts['bodies'], self.VIOLIN_COLORS):
+            body.set_facecolor(color)
+            body.set_alpha(0.7)
+            self._follows(body)
+        self._violin_bodies = parts['bodies']
+        self._violin_lines = {name: self._follows(parts[name]) for name in self.VIOLIN_LINES}
+        margin = 0.05 * (high - low)
+        # Headroom for the mean labels above the violins
+        ax.set_ylim(low - margin, high + margin + 3)
+        ax.set_xlim(-0.5, len(ChartDataBuilder.VIOLIN_GROUPS) - 0.5)
+        ax.set_xticks(np.arange(len(ChartDataBuilder.VIOLIN_GROUPS)))
+        ax.set_xticklabels(ChartDataBuilder.VIOLIN_GROUPS, fontsize=11)
+        ax.set_ylabel('BMI', fontsize=11, fontweight='bold')
+        ax.set_title('BMI Distribution by Gender', fontsize=13, fontweight='bold')
+        ax.grid(axis='y', alpha=0.3)
+        self._violin_axes = ax
+    
+    def _draw_data(self, data: Dict[str, object]) -> None:
+        # Ascending means, the best workout on top; workouts the data lacks leave the lowest rows empty
+        intensity = data['intensity_ranking'].sort_values('mean')
+        y = self._rank_y[len(self._rank_y) - len(intensity):]
+        means = intensity['mean'].to_numpy(dtype=float)
+        self._rank_bars.set_verts(_bar_verts(y, 0.8, means, horizontal=True))
+        # Create gradient colors from low to high
+        self._rank_bars.set_facecolor(_pyplot().cm.RdYlGn(np.linspace(0.3, 0.9, len(means))))
+        self._rank_axes.set_yticks(y, [str(name) for name in intensity.index])
+        self._rank_medians.set_segments([[(median, i - 0.3), (median, i + 0.3)]
+                                         for i, median in zip(y, intensity['median'])])
+        self._replace('intensity_labels', self._labels(self._rank_axes, means + 0.15, y,
+                                                       [f"{mean:.2f} cal/min" for mean in means],
+                                                       va='center', fontsize=11, fontweight='bold'))
+    
+        # Groups without rows draw no violin
+        violins = data['bmi_violins']
+        shown = []
+        for position, (group, body) in enumerate(zip(ChartDataBuilder.VIOLIN_GROUPS, self._violin_bodies)):
+            violin = violins[group]
+            if not len(violin['coords']):
+                body.set_verts([])
+                continue
+            # Scaled as Axes.violin scales a body: its widest density spans the violin width
+            half = 0.5 * self.VIOLIN_WIDTH * violin['vals'] / violin['vals'].max()
+            body.set_verts([np.concatenate([np.column_stack([position - half, violin['coords']]),
+                                            np.column_stack([position + half, violin['coords']])[::-1]])])
+            shown.append((position, violin))
+        ends = self.VIOLIN_WIDTH / 4
+        for name, stat in (('cmeans', 'mean'), ('cmedians', 'median'), ('cmins', 'min'), ('cmaxes', 'max')):
+            self._violin_lines[name].set_segments([[(position - ends, violin[stat]), (position + ends, violin[stat])]
+                                                   for position, violin in shown])
+        self._violin_lines['cbars'].set_segments([[(position, violin['min']), (position, violin['max'])]
+                                                  for position, violin in shown])
+        # Add mean values as text
+        positions = np.array([position for position, _ in shown], dtype=float)
+        means = np.array([violin['mean'] for _, violin in shown], dtype=float)
+        self._replace('violin_labels', self._labels(self._violin_axes, positions, means + 2,
+                                                    [f'μ={mean:.1f}' for mean in means], ha='center', fontsize=10,
+                                                    fontweight='bold'))
+
+
+class Visualizer:
+    """Handles all visualization generation"""
+    
+    # RenderJob.kind -> method drawing it from prepared data
+    RENDERERS = {
+        'summary': 'render_summary_dashboard',
+        'insights': 'render_insights_dashboard',
+    }
+    
+    # Config.RENDER_PROFILE choices; print is the full-resolution, tightly laid out dashboard of earlier releases
+    PROFILES = {
+        'preview': RenderProfile(dpi=60, simplify_threshold=0.5, path_chunksize=10_000, format='png-fast'),
+        'web': RenderProfile(dpi=110, simplify_threshold=0.3, path_chunksize=10_000, format='png-optimized'),
+        'print': RenderProfile(dpi=300, tight_layout=True, tight_bbox=True, batch_labels=False),
+    }
+    # Subplot parameters tight_layout settles on for each dashboard when its category names (workout types,
+    # genders) have up to LAYOUT_LABEL_CHARS characters; figures with longer names are measured with tight_layout
+    LAYOUTS = {
+        'summary': {'left': 0.06, 'right': 0.99, 'top': 0.93, 'bottom': 0.105, 'wspace': 0.22, 'hspace': 0.19},
+        'insights': {'left': 0.078, 'right': 0.99, 'top': 0.845, 'bottom': 0.105, 'wspace': 0.17},
+    }
+    LAYOUT_LABEL_CHARS = 8
+    CONFIG_FIELDS = ('RENDER_PROFILE', 'CHART_FORMAT')
+    
+    def __init__(self, output_manager: OutputManager, profile: Optional[RenderProfile] = None):
+        self.output_manager = output_manager
+        self.profile = profile or self.PROFILES['print']
+    
+    @classmethod
+    def profile_for(cls, config: Config) -> RenderProfile:
+        """The configured profile, saving CHART_FORMAT when one is set"""
+        if config.RENDER_PROFILE not in cls.PROFILES:
+            raise ValueError(f"Unknown render profile '{config.RENDER_PROFILE}', expected one of {sorted(cls.PROFILES)}")
+        profile = cls.PROFILES[config.RENDER_PROFILE]
+        return profile.with_format(config.CHART_FORMAT) if config.CHART_FORMAT else profile
+    
+    def _arrange(self, figure: DashboardFigure, kind: str) -> None:
+        if self.profile.tight_layout or figure.label_chars > self.LAYOUT_LABEL_CHARS:
+            figure.fig.tight_layout()
+        else:
+            figure.fig.subplots_adjust(**self.LAYOUTS[kind])
+    
+    def _render(self, dashboard: type, kind: str, data: Dict[str, object], filename: str) -> None:
+        """Build a DashboardFigure on the scales of data, draw data and save it"""
+        with _pyplot().rc_context(self.profile.rc_params()):
+            figure = dashboard(dashboard.scales(data), batch_labels=self.profile.batch_labels)
+            figure.update(data)
+            self._arrange(figure, kind)
+            self.output_manager.save_plot(figure.fig, filename, self.profile)
+    
+    def create_summary_dashboard(self, chart_data: Dict[str, object], grouped_stats: Dict[str, pd.DataFrame],
+                                 filename: str) -> None:
+        """Create comprehensive summary dashboard with 4 key visualizations"""
+        self.render_summary_dashboard(self.summary_dashboard_data(chart_data, grouped_stats), filename)
+    
+    def summary_dashboard_data(self, chart_data: Dict[str, object],
+                               grouped_stats: Dict[str, pd.DataFrame]) -> Dict[str, object]:
+        """Everything the summary dashboard draws, taken from ChartDataBuilder and group analysis results"""
+        return {
+            'calorie_hist': chart_data['calorie_hist'],
+            'calorie_kde': chart_data['calorie_kde'],
+            'calories_mean': chart_data['calories_mean'],
+            'calories_median': chart_data['calories_median'],
+            'hexbin': chart_data['hexbin'],
+            'workout_stats': grouped_stats['workout_profile'],
+            'gender_workout': grouped_stats['workout_gender_interaction'].T,
+        }
+    
+    @profiled('summary_dashboard')
+    def render_summary_dashboard(self, data: Dict[str, object], filename: str) -> None:
+        """Draw and save the summary dashboard from summary_dashboard_data"""
+        self._render(SummaryDashboard, 'summary', data, filename)
+    
+    def create_advanced_insights_dashboard(self, chart_data: Dict[str, object], grouped_stats: Dict[str, pd.DataFrame],
+                                           filename: str) -> None:
+        """Create fitness insights dashboard with 2 practical visualizations"""
+        self.render_insights_dashboard(self.insights_dashboard_data(chart_data, grouped_stats), filename)
+    
+    def insights_dashboard_data(self, chart_data: Dict[str, object],
+                                grouped_stats: Dict[str, pd.DataFrame]) -> Dict[str, object]:
+        """Everything the insights dashboard draws: the intensity table and BMI violin statistics"""
+        return {
+            'intensity_ranking': grouped_stats['intensity_ranking'],
+            'bmi_violins': chart_data['bmi_violins'],
+        }
+    
+    @profiled('insights_dashboard')
+    def render_insights_dashboard(self, data: Dict[str, object], filename: str) -> None:
+        """Draw and save the insights dashboard from insights_dashboard_data"""
+        self._render(InsightsDashboard, 'insights', data, filename)
+
+
+@dataclass
+class RenderJob:
+    """One dashboard to draw: which renderer, its prepared data, the output file and how to rasterize it"""
+    kind: str
+    data: Dict[str, object]
+    filename: str
+    profile: Optional[RenderProfile] = None
+
+
+def _render_job(job: RenderJob, profile: bool = False,
+                trace_memory: bool = False) -> Tuple[str, Optional[Dict[str, Dict[str, object]]]]:
+    """Draw one dashboard; runs in a worker process, so it only gets the job's prepared data
+    
+    With profile, the worker records its own steps and returns them for the parent's report.
+    """
+    if profile:
+        profiler = RunProfiler(trace_memory)
+        with profiling(profiler):
+            return _render_job(job)[0], profiler.steps
+    visualizer = Visualizer(OutputManager(os.path.dirname(job.filename)), job.profile)
+    getattr(visualizer, Visualizer.RENDERERS[job.kind])(job.data, job.filename)
+    return job.filename, None
+
+
+class RenderScheduler:
+    """Renders dashboard jobs on a process pool, or in-process with one worker"""
+    
+    def __init__(self, workers: int):
+        self.workers = workers
+    
+    @profiled('render')
+    def render(self, jobs: List[RenderJob]) -> List[str]:
+        """Render all jobs and return their filenames in submission order"""
+        workers = min(self.workers, len(jobs))
+        if workers <= 1:
+            results = [_render_job(job) for job in jobs]
+        else:
+            # Imported before the pool starts, so forked workers inherit matplotlib instead of each importing it
+            _pyplot()
+            # Workers profile themselves when this run is profiled; their steps are merged here
+            profiler = _active_profiler
+            render_job = functools.partial(_render_job, profile=profiler is not None,
+                                           trace_memory=profiler is not None and profiler.trace_memory)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(render_job, jobs))
+            for _, steps in results:
+                if steps:
+                    profiler.merge(steps)
+        return [filename for filename, _ in results]
+
+
+# Frozen dashboards of the worker process (or of the parent, when segments render in-process), by RenderJob.kind
+_segment_dashboards: Dict[str, DashboardFigure] = {}
+
+
+def _init_segment_dashboards(scales: Dict[str, Dict[str, object]], profile: RenderProfile) -> None:
+    """Pool initializer: lay out and freeze every segment dashboard once per process"""
+    _segment_dashboards.clear()
+    for kind, dashboard in SegmentFanout.DASHBOARDS.items():
+        figure = dashboard(scales[kind], profile.dpi, profile.batch_labels)
+        figure.freeze()
+        _segment_dashboards[kind] = figure
+
 
+@profiled('render_segments')
+def _render_segment_batch(jobs: List[RenderJob]) -> int:
+    """Draw a batch of segment dashboards on this process's frozen figures"""
+    for job in jobs:
+        _segment_dashboards[job.kind].blit(job.data, job.filename, job.profile)
+    return len(jobs)
 
-class OutputManager:
-    """Manages output directory structure and file saving operations"""
+
+def _segment_slug(label: tuple) -> str:
+    """File name stem of a segment: its key values, with anything but letters, digits, '.' and '-' replaced"""
+    return '_'.join(re.sub(r'[^\w.-]+', '-', str(value)).strip('-') or 'NA' for value in label)
+
+
+class SegmentFanout:
+    """Summary and insights dashboards for every segment of the processed rows (e.g. per gym, cohort or month)
     
-    def __init__(self, chart_dir: str):
-        self.chart_dir = chart_dir
+    The rows are partitioned once by the segment keys. One GroupAggregator pass with the keys prefixed to
+    the dashboards' group specs yields every segment's tables, and a ChartDataBuilder over the global value
+    ranges each segment's chart aggregates, built only as the renderer reaches the segment. All segments
+    share one set of scales, so every worker lays the dashboards out once and only redraws the artists that
+    follow the data per segment.
+    """
     
-    def setup_output_directories(self) -> None:
-        """Create output directories if they don't exist"""
-        os.makedirs(self.chart_dir, exist_ok=True)
-        print(f"✓ Output directories created: {self.chart_dir}")
+    # Group tables the dashboards draw, and the columns they and the chart aggregates read
+    GROUP_SPECS = tuple(spec for spec in DataExplorer.GROUP_SPECS
+                        if spec.name in ('workout_profile', 'workout_gender_interaction', 'intensity_ranking'))
+    COLUMNS = ('Calories_Burned', 'Avg_BPM', 'BMI', 'Gender', 'Workout_Type', 'Session_Duration_Minutes',
+               'Calories_Burned_Per_Minute')
+    DASHBOARDS = {'summary': SummaryDashboard, 'insights': InsightsDashboard}
+    # Segments per worker task, and tasks in flight per worker (bounds the prepared data held at once)
+    BATCH_SIZE = 8
+    TASKS_PER_WORKER = 2
+    CONFIG_FIELDS = ('SEGMENT_BY', 'SEGMENT_DPI', 'QUANTILE_SKETCH_ERROR')
     
-    def save_dataframe(self, df: pd.DataFrame, filename: str) -> None:
-        """Save DataFrame to CSV file"""
-        df.to_csv(filename, index=True)
-        print(f"✓ Saved: {filename}")
+    def __init__(self, keys: Tuple[str, ...], output_dir: str, dpi: int = 50, workers: int = 1,
+                 sketch_error: Optional[float] = None):
+        self.keys = tuple(keys)
+        self.output_dir = output_dir
+        self.dpi = dpi
+        self.workers = workers
+        self.sketch_error = sketch_error
+        self.visualizer = Visualizer(OutputManager(output_dir))
+        # Frozen figures are blitted and encoded straight from the canvas
+        self.profile = RenderProfile(dpi=dpi, format='png-fast')
     
-    def save_plot(self, fig: plt.Figure, filename: str) -> None:
-        """Save matplotlib figure to file"""
-        fig.savefig(filename, bbox_inches='tight', dpi=300)
-        plt.close(fig)
-        print(f"✓ Saved: {filename}")
-
-
-class DataIngestor:
-    """Handles data loading and backup operations"""
+    @profiled('segment_fanout')
+    def run(self, df: pd.DataFrame) -> str:
+        """Render both dashboards of every segment of df; returns the path of the index.json listing them"""
+        return self.write(*self.prepare(df))
     
-    def load_data(self) -> pd.DataFrame:
-        """Load data from Kaggle using kagglehub"""
-        print("📥 Downloading dataset from Kaggle...")
-        print(f"   Dataset: {Config.KAGGLE_DATASET}")
-        
-        try:
-            # Download dataset using kagglehub
-            path = kagglehub.dataset_download(Config.KAGGLE_DATASET)
-            print(f"✓ Dataset downloaded to: {path}")
-            
-            # Find the CSV file in the downloaded path
-            csv_files = []
-            for root, dirs, files in os.walk(path):
-                for file in files:
-                    if file.endswith('.csv'):
-                        csv_files.append(os.path.join(root, file))
-            
-            if not csv_files:
-                raise FileNotFoundError(f"No CSV files found in downloaded dataset at {path}")
-            
-            # Use the first CSV file found (or the one matching expected name)
-            data_file = csv_files[0]
-            for csv_file in csv_files:
-                if 'Final_data' in csv_file or 'final' in csv_file.lower():
-                    data_file = csv_file
-                    break
-            
-            print(f"✓ Loading data from: {os.path.basename(data_file)}")
-            df = pd.read_csv(data_file)
-            print(f"✓ Loaded data: {df.shape[0]} rows, {df.shape[1]} columns")
-            
-            return df
-            
-        except Exception as e:
-            print(f"❌ Error loading data from Kaggle: {str(e)}")
-            print("\n⚠️  Please ensure:")
-            print("   1. You have kagglehub installed: pip install kagglehub")
-            print("   2. Your Kaggle API credentials are configured")
-            print("   3. You have internet connection")
-            raise
+    def write(self, scales: Dict[str, Dict[str, object]],
+              segments: Iterator[Tuple[tuple, int, Dict[str, object]]]) -> str:
+        """Render prepared segments into output_dir and list them in its index.json"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        index, slugs = [], set()
     
-    def backup_raw_data(self, df: pd.DataFrame, path: str) -> None:
-        """Create backup of raw data"""
-        df.to_csv(path, index=False)
-        print(f"✓ Raw data backed up to: {path}")
-
-
-class DataCleaner:
-    """Handles all data cleaning operations"""
+        def jobs() -> Iterator[RenderJob]:
+            for label, rows, data in segments:
+                slug = _segment_slug(label)
+                while slug in slugs:
+                    slug += '_'
+                slugs.add(slug)
+                entry = {'segment': {key: value.item() if isinstance(value, np.generic) else value
+                                     for key, value in zip(self.keys, label)}, 'rows': rows}
+                for kind in self.DASHBOARDS:
+                    entry[kind] = f"{slug}_{kind}.png"
+                    yield RenderJob(kind, data[kind], os.path.join(self.output_dir, entry[kind]), self.profile)
+                index.append(entry)
     
-    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Orchestrate all cleaning operations"""
-        print("  → Handling missing values...")
-        df = self._handle_missing_values(df)
-        
-        print("  → Correcting data types...")
-        df = self._correct_data_types(df)
-        
-        print("  → Removing duplicates...")
-        df = self._remove_duplicates(df)
-        
-        print("  → Capping outliers...")
-        for col in ['Age', 'Weight (kg)', 'Height (m)', 'Avg_BPM']:
-            if col in df.columns:
-                df = self._cap_outliers(df, col)
-        
-        return df
+        start = time.perf_counter()
+        rendered = self.render(scales, jobs())
+        seconds = time.perf_counter() - start
+        print(f"✓ Rendered {rendered} dashboards for {len(index)} segments in {seconds:.1f}s "
+              f"({rendered / max(seconds, 1e-9):.0f}/s)")
     
-    def _handle_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Fill missing values: median for numeric, mode for categorical"""
-        for col in Config.NUMERIC_COLS:
-            if col in df.columns and df[col].isnull().any():
-                df[col].fillna(df[col].median(), inplace=True)
-        
-        for col in Config.CATEGORICAL_COLS:
-            if col in df.columns and df[col].isnull().any():
-                mode_val = df[col].mode()[0] if not df[col].mode().empty else 'Unknown'
-                df[col].fillna(mode_val, inplace=True)
-        
-        return df
+        path = os.path.join(self.output_dir, 'index.json')
+        self._remove_stale(path, index)
+        with open(path, 'w') as f:
+            json.dump({'keys': list(self.keys), 'segments': index}, f, indent=2, default=str)
+        print(f"✓ Saved: {path}")
+        return path
     
-    def _correct_data_types(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Convert columns to appropriate data types"""
-        for col in Config.NUMERIC_COLS:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        for col in Config.CATEGORICAL_COLS:
-            if col in df.columns:
-                df[col] = df[col].astype('category')
+    def _remove_stale(self, path: str, index: List[Dict[str, object]]) -> None:
+        """Delete the dashboards of segments the previous index.json listed and this run no longer has"""
+        if not os.path.exists(path):
+            return
+        with open(path) as f:
+            previous = json.load(f)['segments']
+        current = {entry[kind] for entry in index for kind in self.DASHBOARDS}
+        for entry in previous:
+            for kind in self.DASHBOARDS:
+                stale = os.path.join(self.output_dir, entry.get(kind, ''))
+                if entry.get(kind) not in current and os.path.isfile(stale):
+                    os.remove(stale)
+    
+    @profiled('segment_data')
+    def prepare(self, df: pd.DataFrame) -> Tuple[Dict[str, Dict[str, object]],
+                                                 Iterator[Tuple[tuple, int, Dict[str, object]]]]:
+        """Scales of each dashboard covering every segment, and an iterator of (label, rows, summary and insights data)
         
-        return df
+        Segments come in key order; each one's chart aggregates are only built when the iterator reaches it.
+        """
+        missing = [key for key in self.keys if key not in df.columns]
+        if missing:
+            raise KeyError(f"Segment keys not in the processed data: {missing}")
+        key_codes = {}
+        for key in self.keys:
+            codes, uniques = pd.factorize(df[key])
+            key_codes[key] = (codes.astype(np.int64), np.asarray(uniques, dtype=object))
+        codes, labels = _factorize_groups(self.keys, key_codes)
+        if not len(labels):
+            return {}, iter(())
+        if not isinstance(labels, pd.MultiIndex):
+            labels = pd.MultiIndex.from_arrays([labels])
+        # Renumber the segments in key order
+        by_label = labels.argsort()
+        labels = labels[by_label]
+        rank = np.empty(len(by_label), dtype=np.int64)
+        rank[by_label] = np.arange(len(by_label))
+        codes = np.where(codes >= 0, rank[np.maximum(codes, 0)], -1)
     
-    def _remove_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Remove duplicate rows"""
-        original_shape = df.shape[0]
-        df = df.drop_duplicates()
-        removed = original_shape - df.shape[0]
-        if removed > 0:
-            print(f"  → Removed {removed} duplicate rows")
-        return df
+        # One stable sort puts every segment's rows together; each segment is then a slice
+        order = np.argsort(codes, kind='stable')
+        order = order[codes[order] >= 0]
+        bounds = np.r_[0, np.cumsum(np.bincount(codes[order], minlength=len(labels)))]
+        rows = df.take(order)
     
-    def _cap_outliers(self, df: pd.DataFrame, column: str) -> pd.DataFrame:
-        """Cap outliers using IQR method"""
-        Q1 = df[column].quantile(0.25)
-        Q3 = df[column].quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        original_min = df[column].min()
-        original_max = df[column].max()
-        
-        df[column] = df[column].clip(lower=lower_bound, upper=upper_bound)
+        tables = self._segment_tables(df)
+        ranges = ChartDataBuilder.ranges_from_frame(df)
+        return (self._scales(labels, bounds, rows, ranges, tables),
+                self._segments(labels, bounds, rows, ranges, tables))
+    
+    def _segments(self, labels: pd.MultiIndex, bounds: np.ndarray, rows: pd.DataFrame,
+                  ranges: Dict[str, Tuple[float, float]],
+                  tables: Dict[str, Tuple[Dict[tuple, pd.DataFrame], pd.DataFrame]]
+                  ) -> Iterator[Tuple[tuple, int, Dict[str, object]]]:
+        """(label, rows, summary and insights data) of each segment, chart aggregates built one segment at a time"""
+        for position, label in enumerate(labels):
+            builder = ChartDataBuilder(ranges, self.sketch_error)
+            builder.update(rows.iloc[bounds[position]:bounds[position + 1]])
+            chart_data = builder.result()
+            grouped_stats = {name: parts.get(label, empty) for name, (parts, empty) in tables.items()}
+            title = ', '.join(f"{key} {value}" for key, value in zip(self.keys, label))
+            summary = self.visualizer.summary_dashboard_data(chart_data, grouped_stats)
+            insights = self.visualizer.insights_dashboard_data(chart_data, grouped_stats)
+            yield (label, int(bounds[position + 1] - bounds[position]),
+                   {'summary': dict(summary, title=title), 'insights': dict(insights, title=title)})
+    
+    def _segment_tables(self, df: pd.DataFrame) -> Dict[str, Tuple[Dict[tuple, pd.DataFrame], pd.DataFrame]]:
+        """Each dashboard table for every segment at once: spec name -> (segment label -> table, empty table)"""
+        specs = [GroupSpec(spec.name, self.keys + spec.keys, spec.metrics, spec.stats, spec.decimals,
+                           spec.sort_by, spec.unstack) for spec in self.GROUP_SPECS]
+        aggregator = GroupAggregator(specs, self.sketch_error)
+        aggregator.update(df)
+        levels = list(range(len(self.keys)))
+        tables = {}
+        for spec in specs:
+            table = aggregator.table(spec)
+            parts = {label if isinstance(label, tuple) else (label,): part.droplevel(levels)
+                     for label, part in table.groupby(level=levels, sort=False)}
+            tables[spec.name] = (parts, table.iloc[:0].droplevel(levels))
+        return tables
+    
+    def _scales(self, labels: pd.MultiIndex, bounds: np.ndarray, rows: pd.DataFrame,
+                ranges: Dict[str, Tuple[float, float]],
+                tables: Dict[str, Tuple[Dict[tuple, pd.DataFrame], pd.DataFrame]]) -> Dict[str, Dict[str, object]]:
+        """Scales of each dashboard covering every segment
         
-        if original_min < lower_bound or original_max > upper_bound:
-            print(f"  → Capped outliers in {column}: [{lower_bound:.2f}, {upper_bound:.2f}]")
+        The grids come from the global value ranges and the categories from every segment's tables
+        stacked. The y-limits and the hexbin colour scale need each segment's tallest histogram bin,
+        density and fullest hexagon, which one pass over the segments collects without keeping their data.
+        """
+        chart_data = ChartDataBuilder(ranges, self.sketch_error).result()
+        grouped_stats = {name: pd.concat(list(parts.values())) if parts else empty
+                         for name, (parts, empty) in tables.items()}
+        summary = SummaryDashboard.scales(self.visualizer.summary_dashboard_data(chart_data, grouped_stats))
+        insights = InsightsDashboard.scales(self.visualizer.insights_dashboard_data(chart_data, grouped_stats))
+        hist_max = kde_max = hex_max = 0.0
+        for _, _, data in self._segments(labels, bounds, rows, ranges, tables):
+            hist_max = max(hist_max, data['summary']['calorie_hist'][0].max())
+            kde_max = max(kde_max, data['summary']['calorie_kde'][1].max())
+            hex_max = max(hex_max, _hexagon_counts(data['summary']['hexbin']).max(initial=0))
+        summary.update(hist_max=hist_max, kde_max=kde_max, hex_max=float(hex_max))
+        insights.update(bmi_range=_value_range(*ranges['BMI']))
+        return {'summary': summary, 'insights': insights}
+    
+    def render(self, scales: Dict[str, Dict[str, object]], jobs: Iterator[RenderJob]) -> int:
+        """Render jobs in batches as they are prepared; returns how many were rendered
         
-        return df
+        Batches go to up to workers processes, with at most TASKS_PER_WORKER batches in flight each.
+        """
+        jobs = iter(jobs)
+        batches = iter(lambda: list(itertools.islice(jobs, self.BATCH_SIZE)), [])
+        first = next(batches, None)
+        if first is None:
+            return 0
+        batches = itertools.chain([first], batches)
+        if self.workers <= 1:
+            _init_segment_dashboards(scales, self.profile)
+            return sum(_render_segment_batch(batch) for batch in batches)
+    
+        # Imported before the pool starts, so forked workers inherit matplotlib instead of each importing it
+        _pyplot()
+        profiler = _active_profiler
+        task = functools.partial(_worker_task, profiler is not None, profiler is not None and profiler.trace_memory,
+                                 _render_segment_batch)
+        rendered = 0
+    
+        def collect(done) -> int:
+            count = 0
+            for future in done:
+                batch_size, steps = future.result()
+                count += batch_size
+                if steps:
+                    profiler.merge(steps)
+            return count
+    
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_segment_dashboards,
+                                 initargs=(scales, self.profile)) as pool:
+            pending = set()
+            for batch in batches:
+                if len(pending) >= self.workers * self.TASKS_PER_WORKER:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    rendered += collect(done)
+                pending.add(pool.submit(task, batch))
+            rendered += collect(wait(pending)[0])
+        return rendered
 
 
-class FeatureEngineer:
-    """Creates new features from existing data"""
+def _plain_value(value: object) -> object:
+    """A partition or cube key as a plain Python value, None for missing"""
+    if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class _AllValues:
+    """Cube key value of a dimension rolled up over all its values, which None (a missing value) cannot stand for"""
     
-    def create_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Generate all engineered features"""
-        # Age Group
-        df['Age_Group'] = pd.cut(
-            df['Age'],
-            bins=[0, 25, 35, 45, 55, 100],
-            labels=['18-25', '26-35', '36-45', '46-55', '55+']
-        )
-        
-        # Session Duration in Minutes
-        df['Session_Duration_Minutes'] = df['Session_Duration (hours)'] * 60
-        
-        # Calories Burned Per Minute
-        df['Calories_Burned_Per_Minute'] = df.apply(
-            lambda row: row['Calories_Burned'] / row['Session_Duration_Minutes']
-            if row['Session_Duration_Minutes'] > 0 else 0,
-            axis=1
-        )
-        
-        print(f"✓ Created 3 new features: Age_Group, Session_Duration_Minutes, Calories_Burned_Per_Minute")
-        print(f"✓ Using existing BMI column from dataset")
-        
-        return df
+    def __repr__(self) -> str:
+        return 'ALL'
 
 
-class DataExplorer:
-    """Performs exploratory data analysis"""
+_ALL_VALUES = _AllValues()
+
+
+class ResultsStoreWriter:
+    """Builds a ResultsStore from processed rows, chunk by chunk, in a directory swapped in on close
     
-    def get_descriptive_stats(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate descriptive statistics"""
-        return df.describe(include='all')
+    Rows go to Parquet files per combination of the dimensions present. Their moments and median
+    sketches are kept per finest combination only, a missing value counting as a value of its own;
+    every coarser cube cell is rolled up from those. The aggregator holding them is saved with the
+    store, so append=True adds rows in place: new part files for the new rows, the cube rolled up again,
+    and no earlier rows read or rewritten.
+    """
     
-    def calculate_correlation(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate correlation matrix for numeric columns"""
-        return df.select_dtypes(include=[np.number]).corr()
+    def __init__(self, path: str, sketch_error: Optional[float] = None, source: Optional[str] = None,
+                 append: bool = False):
+        self.path = path
+        self._tmp_path = f"{path}.tmp"
+        # Cube medians come from mergeable sketches, so coarser cells can be rolled up from the finest ones
+        self.sketch_error = sketch_error or ResultsStore.MEDIAN_ERROR
+        # What the rows are processed by; only a store of the same source and rows is appended to (see can_append)
+        self.source = source
+        self._dimensions: Optional[Tuple[str, ...]] = None
+        self._metrics: Tuple[str, ...] = ()
+        self._aggregator: Optional[GroupAggregator] = None
+        self._schema: Optional[pa.Schema] = None
+        self._writers: Dict[tuple, pq.ParquetWriter] = {}
+        # Partition label -> its part files and rows, earlier ones included when appending
+        self._files: Dict[tuple, List[str]] = {}
+        self._rows: Dict[tuple, int] = {}
+        self._parts = 0
+        # Manifest of the store appended to
+        self._previous: Optional[dict] = None
+        if append:
+            self._reopen()
+            return
+        if os.path.exists(self._tmp_path):
+            shutil.rmtree(self._tmp_path)
+        os.makedirs(self._tmp_path)
     
-    def perform_group_analysis(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-        """Perform various group-by analyses"""
-        results = {}
-        
-        # Workout Type Summary
-        results['workout_summary'] = df.groupby('Workout_Type')['Calories_Burned'].agg([
-            'count', 'mean', 'std', 'min', 'max'
-        ]).round(2).sort_values('mean', ascending=False)
-        
-        # Intensity Ranking (Calories per Minute)
-        results['intensity_ranking'] = df.groupby('Workout_Type')['Calories_Burned_Per_Minute'].agg([
-            'mean', 'median'
-        ]).round(3).sort_values('mean', ascending=False)
-        
-        # Gender Analysis
-        results['gender_summary'] = df.groupby('Gender')['Calories_Burned'].agg([
-            'count', 'mean', 'std'
-        ]).round(2)
-        
-        # Age Group Analysis
-        results['age_group_summary'] = df.groupby('Age_Group')['Calories_Burned'].agg([
-            'count', 'mean', 'median'
-        ]).round(2)
-        
-        # Interaction: Workout Type × Gender
-        results['workout_gender_interaction'] = df.groupby(
-            ['Workout_Type', 'Gender']
-        )['Calories_Burned'].mean().unstack().round(2)
+    @staticmethod
+    def can_append(path: str, source: Optional[str], rows: int, sketch_error: Optional[float] = None) -> bool:
+        """Whether the store at path holds exactly rows processed rows of source, with these cube medians"""
+        try:
+            with open(os.path.join(path, ResultsStore.MANIFEST)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return (source is not None and manifest.get('version') == ResultsStore.VERSION
+                and manifest.get('source') == source and manifest.get('rows') == rows
+                and manifest.get('median_error') == (sketch_error or ResultsStore.MEDIAN_ERROR))
+    
+    def _reopen(self) -> None:
+        with open(os.path.join(self.path, ResultsStore.MANIFEST)) as f:
+            self._previous = json.load(f)
+        self._dimensions = tuple(self._previous['dimensions'])
+        self._metrics = tuple(self._previous['metrics'])
+        for entry in self._previous['partitions']:
+            label = tuple(entry['values'][key] for key in self._dimensions)
+            self._files[label] = list(entry['files'])
+            self._rows[label] = entry['rows']
+        self._parts = sum(len(files) for files in self._files.values())
+        if self._previous['state']:
+            with open(os.path.join(self.path, self._previous['state']), 'rb') as f:
+                self._aggregator = pickle.load(f)
+        if self._files:
+            self._schema = pq.read_schema(os.path.join(self.path, next(iter(self._files.values()))[0]))
+    
+    @property
+    def _dir(self) -> str:
+        """Where part files are written: the store itself when appending"""
+        return self.path if self._previous is not None else self._tmp_path
+    
+    @profiled('store_chunk')
+    def write(self, df: pd.DataFrame) -> None:
+        """Append a chunk's rows to their partitions and fold them into the cube"""
+        if self._dimensions is None:
+            self._start(df)
+        if self._dimensions:
+            key_codes = {}
+            for key in self._dimensions:
+                # Missing values get a partition of their own instead of being dropped
+                codes, uniques = pd.factorize(df[key], use_na_sentinel=False)
+                key_codes[key] = (codes.astype(np.int64), np.asarray(uniques, dtype=object))
+            codes, labels = _factorize_groups(self._dimensions, key_codes)
+            labels = list(labels) if isinstance(labels, pd.MultiIndex) else [(label,) for label in labels]
+        else:
+            codes, labels = np.zeros(len(df), dtype=np.int64), [()]
         
-        # Experience Level Analysis
-        if 'Experience_Level' in df.columns:
-            results['experience_summary'] = df.groupby('Experience_Level')['Calories_Burned'].agg([
-                'count', 'mean', 'median'
-            ]).round(2)
+        # One Arrow conversion per chunk; each partition then gets a zero-copy slice of the sorted rows
+        order = np.argsort(codes, kind='stable')
+        bounds = np.r_[0, np.cumsum(np.bincount(codes, minlength=len(labels)))]
+        table = pa.Table.from_pandas(df.take(order), preserve_index=True)
+        if self._schema is None:
+            self._schema = table.schema
+        elif not table.schema.equals(self._schema):
+            table = table.cast(self._schema)
+        for position, label in enumerate(labels):
+            label = tuple(_plain_value(value) for value in label)
+            if label not in self._writers:
+                # One new file per partition and writer; an appended partition keeps its earlier files
+                name = f"part-{self._parts:05d}.parquet"
+                self._parts += 1
+                self._files.setdefault(label, []).append(name)
+                self._writers[label] = pq.ParquetWriter(os.path.join(self._dir, name), self._schema,
+                                                        compression='zstd')
+                self._rows.setdefault(label, 0)
+            start, stop = bounds[position], bounds[position + 1]
+            self._writers[label].write_table(table.slice(start, stop - start))
+            self._rows[label] += int(stop - start)
+        if self._aggregator is not None:
+            self._aggregator.update(df)
+    
+    def _start(self, df: pd.DataFrame) -> None:
+        self._dimensions = tuple(key for key in ResultsStore.DIMENSIONS if key in df.columns)
+        self._metrics = tuple(metric for metric in ResultsStore.METRICS if metric in df.columns)
+        if self._dimensions and self._metrics:
+            self._aggregator = GroupAggregator([GroupSpec('cube', self._dimensions, self._metrics, ResultsStore.STATS)],
+                                               self.sketch_error, dropna=False)
+    
+    def _cube(self) -> pd.DataFrame:
+        """Every (dimension values, metric) cell in long form
         
-        print(f"✓ Completed {len(results)} group analyses")
+        A rolled-up dimension's column holds None, like a missing value; the grouping bitmask (bit i set
+        when dimension i is rolled up, as SQL's GROUPING) tells them apart.
+        """
+        frames = []
+        for size in range(len(self._dimensions) + 1):
+            for by in itertools.combinations(self._dimensions, size):
+                grouping = sum(1 << i for i, key in enumerate(self._dimensions) if key not in by)
+                for metric in self._metrics:
+                    try:
+                        table = self._aggregator.statistics(self._dimensions, metric, by)
+                    except KeyError:  # the metric never had a value
+                        continue
+                    columns = {key: [_plain_value(value) for value in table.index.get_level_values(key)] if key in by
+                               else [None] * len(table) for key in self._dimensions}
+                    columns.update(grouping=grouping, metric=metric)
+                    columns.update((stat, table[stat].to_numpy()) for stat in ResultsStore.STATS)
+                    frames.append(pd.DataFrame(columns))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=ResultsStore.cube_columns(self._dimensions))
+    
+    @profiled('store_close')
+    def close(self) -> None:
+        """Write the cube, its aggregator and the manifest, then replace the previous store
         
-        return results
+        When appending, the manifest is replaced last: until then the store reads as it was, and the
+        new part files it does not list are never read.
+        """
+        for writer in self._writers.values():
+            writer.close()
+        self._dimensions = self._dimensions or ()
+        generation = self._previous['generation'] + 1 if self._previous is not None else 0
+        cube_name, state_name = f"cube-{generation:05d}.parquet", None
+        if self._aggregator is not None:
+            cube = self._cube()
+            state_name = f"cube_state-{generation:05d}.pkl"
+            with open(os.path.join(self._dir, state_name), 'wb') as f:
+                pickle.dump(self._aggregator, f, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            cube = pd.DataFrame(columns=ResultsStore.cube_columns(self._dimensions))
+        cube.astype({key: object for key in self._dimensions}).to_parquet(os.path.join(self._dir, cube_name),
+                                                                          index=False)
+        partitions = sorted(
+            ({'values': dict(zip(self._dimensions, label)), 'files': self._files[label], 'rows': self._rows[label]}
+             for label in self._files),
+            key=lambda entry: [(value is None, str(value)) for value in entry['values'].values()],
+        )
+        manifest = {
+            'version': ResultsStore.VERSION,
+            'created': (self._previous['created'] if self._previous is not None
+                        else datetime.datetime.now().isoformat(timespec='seconds')),
+            'source': self.source,
+            'generation': generation,
+            'dimensions': list(self._dimensions),
+            'metrics': list(self._metrics),
+            'columns': [name for name in (self._schema.names if self._schema else []) if not name.startswith('__')],
+            'rows': sum(self._rows.values()),
+            'median_error': self.sketch_error,
+            'cube': cube_name,
+            'state': state_name,
+            'partitions': partitions,
+        }
+        manifest_path = os.path.join(self._dir, ResultsStore.MANIFEST)
+        with open(f"{manifest_path}.tmp", 'w') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+        if self._previous is not None:
+            for name in (self._previous['cube'], self._previous['state']):
+                if name:
+                    os.remove(os.path.join(self.path, name))
+            return
+        old_path = f"{self.path}.old"
+        if os.path.exists(self.path):
+            os.replace(self.path, old_path)
+        os.replace(self._tmp_path, self.path)
+        if os.path.exists(old_path):
+            shutil.rmtree(old_path)
+    
+    def abort(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        if self._previous is None:
+            shutil.rmtree(self._tmp_path, ignore_errors=True)
+            return
+        # Only the part files of this append; the manifest still lists the earlier ones
+        listed = {name for entry in self._previous['partitions'] for name in entry['files']}
+        for files in self._files.values():
+            for name in files:
+                if name not in listed:
+                    os.remove(os.path.join(self.path, name))
+    
+    def __enter__(self) -> 'ResultsStoreWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
 
 
-class Visualizer:
-    """Handles all visualization generation"""
+class ResultsStore:
+    """Query API over a results store directory: processed rows partitioned by segment, and an aggregate cube
     
-    def __init__(self, output_manager: OutputManager):
-        self.output_manager = output_manager
+    aggregate() answers segment statistics from the cube, kept in memory and indexed by dimension
+    values once loaded; rows() reads only the partition files matching the filters.
+    """
     
-    def create_summary_dashboard(self, df: pd.DataFrame, corr_matrix: pd.DataFrame, filename: str) -> None:
-        """Create comprehensive summary dashboard with 4 key visualizations"""
-        fig, axes = plt.subplots(2, 2, figsize=(18, 12))
-        fig.suptitle('Fitness Performance Analysis Dashboard', fontsize=20, fontweight='bold', y=0.995)
-        
-        # Subplot 1: Calories Burned Distribution (Histogram with KDE)
-        axes[0, 0].hist(df['Calories_Burned'], bins=50, color='steelblue', alpha=0.7, edgecolor='black')
-        ax_twin = axes[0, 0].twinx()
-        df['Calories_Burned'].plot(kind='kde', ax=ax_twin, color='red', linewidth=2.5)
-        
-        axes[0, 0].set_xlabel('Calories Burned', fontsize=11, fontweight='bold')
-        axes[0, 0].set_ylabel('Frequency', fontsize=11, fontweight='bold')
-        ax_twin.set_ylabel('Density', fontsize=11, fontweight='bold', color='red')
-        axes[0, 0].set_title('Calories Burned Distribution', fontsize=14, fontweight='bold')
-        axes[0, 0].grid(axis='y', alpha=0.3)
-        
-        # Add statistics
-        mean_cal = df['Calories_Burned'].mean()
-        median_cal = df['Calories_Burned'].median()
-        axes[0, 0].axvline(mean_cal, color='green', linestyle='--', linewidth=2, label=f'Mean: {mean_cal:.0f}')
-        axes[0, 0].axvline(median_cal, color='orange', linestyle='--', linewidth=2, label=f'Median: {median_cal:.0f}')
-        axes[0, 0].legend(loc='upper right', fontsize=9)
-        
-        # Subplot 2: Average BPM vs Calories (Hexbin for density)
-        hexbin = axes[0, 1].hexbin(df['Avg_BPM'], df['Calories_Burned'], 
-                                   gridsize=25, cmap='YlOrRd', mincnt=1)
-        axes[0, 1].set_xlabel('Average BPM', fontsize=11, fontweight='bold')
-        axes[0, 1].set_ylabel('Calories Burned', fontsize=11, fontweight='bold')
-        axes[0, 1].set_title('Heart Rate vs Calories Burned (Density)', fontsize=14, fontweight='bold')
-        cb = plt.colorbar(hexbin, ax=axes[0, 1])
-        cb.set_label('Count', fontsize=10)
-        axes[0, 1].grid(alpha=0.3)
-        
-        # Subplot 3: Workout Performance Comparison (Grouped Bar Chart)
-        workout_stats = df.groupby('Workout_Type').agg({
-            'Calories_Burned': 'mean',
-            'Session_Duration_Minutes': 'mean',
-            'Avg_BPM': 'mean'
-        }).round(1)
-        
-        # Normalize for better visualization
-        workout_stats_norm = workout_stats.copy()
-        workout_stats_norm['Calories_Burned'] = workout_stats_norm['Calories_Burned'] / 10
-        workout_stats_norm['Session_Duration_Minutes'] = workout_stats_norm['Session_Duration_Minutes']
-        workout_stats_norm['Avg_BPM'] = workout_stats_norm['Avg_BPM']
-        
-        x = np.arange(len(workout_stats_norm.index))
-        width = 0.25
-        
-        bars1 = axes[1, 0].bar(x - width, workout_stats_norm['Calories_Burned'], width, 
-                              label='Calories (÷10)', color='#FF6B6B', alpha=0.8)
-        bars2 = axes[1, 0].bar(x, workout_stats_norm['Session_Duration_Minutes'], width, 
-                              label='Duration (min)', color='#4ECDC4', alpha=0.8)
-        bars3 = axes[1, 0].bar(x + width, workout_stats_norm['Avg_BPM'], width, 
-                              label='BPM', color='#FFA07A', alpha=0.8)
-        
-        axes[1, 0].set_xlabel('Workout Type', fontsize=11, fontweight='bold')
-        axes[1, 0].set_ylabel('Normalized Values', fontsize=11, fontweight='bold')
-        axes[1, 0].set_title('Workout Performance Metrics Comparison', fontsize=14, fontweight='bold')
-        axes[1, 0].set_xticks(x)
-        axes[1, 0].set_xticklabels(workout_stats_norm.index, rotation=45, ha='right')
-        axes[1, 0].legend(loc='upper left', fontsize=9)
-        axes[1, 0].grid(axis='y', alpha=0.3)
-        
-        # Add value labels on bars
-        for bars in [bars1, bars2, bars3]:
-            for bar in bars:
-                height = bar.get_height()
-                axes[1, 0].text(bar.get_x() + bar.get_width()/2., height,
-                              f'{height:.0f}', ha='center', va='bottom', fontsize=7)
-        
-        # Subplot 4: Gender vs Workout Type Performance Heatmap
-        gender_workout = df.pivot_table(
-            values='Calories_Burned', 
-            index='Gender', 
-            columns='Workout_Type', 
-            aggfunc='mean'
-        )
-        
-        im = axes[1, 1].imshow(gender_workout.values, cmap='RdYlGn', aspect='auto')
-        
-        # Set ticks
-        axes[1, 1].set_xticks(np.arange(len(gender_workout.columns)))
-        axes[1, 1].set_yticks(np.arange(len(gender_workout.index)))
-        axes[1, 1].set_xticklabels(gender_workout.columns, rotation=45, ha='right')
-        axes[1, 1].set_yticklabels(gender_workout.index)
-        
-        # Add text annotations
-        for i in range(len(gender_workout.index)):
-            for j in range(len(gender_workout.columns)):
-                text = axes[1, 1].text(j, i, f'{gender_workout.values[i, j]:.0f}',
-                                      ha="center", va="center", color="black", 
-                                      fontsize=11, fontweight='bold')
-        
-        axes[1, 1].set_title('Calories by Gender × Workout Type', fontsize=14, fontweight='bold')
-        cbar = plt.colorbar(im, ax=axes[1, 1])
-        cbar.set_label('Avg Calories', fontsize=10)
-        
-        plt.tight_layout()
-        self.output_manager.save_plot(fig, filename)
+    DIMENSIONS = ('Workout_Type', 'Gender', 'Age_Group', 'Experience_Level')
+    METRICS = ('Calories_Burned', 'Calories_Burned_Per_Minute', 'Session_Duration_Minutes', 'Avg_BPM', 'BMI',
+               'Fat_Percentage', 'Water_Intake (liters)')
+    STATS = ('count', 'mean', 'std', 'min', 'max', 'median')
+    # Rank error of the cube's medians unless QUANTILE_SKETCH_ERROR sets one
+    MEDIAN_ERROR = 0.001
+    MANIFEST = 'manifest.json'
+    # 2: cube cells carry a grouping bitmask; 3: partitions list their part files, and the cube's aggregator
+    # is saved for appends
+    VERSION = 3
+    CONFIG_FIELDS = ('QUANTILE_SKETCH_ERROR',)
     
-    def create_advanced_insights_dashboard(self, df: pd.DataFrame, grouped_stats: Dict[str, pd.DataFrame], filename: str) -> None:
-        """Create fitness insights dashboard with 2 practical visualizations"""
-        fig, axes = plt.subplots(1, 2, figsize=(16, 6))
-        fig.suptitle('Fitness Insights Dashboard', fontsize=20, fontweight='bold', y=0.98)
-        
-        # 1. Workout Intensity Ranking
-        ax1 = axes[0]
-        intensity = grouped_stats['intensity_ranking'].sort_values('mean')
-        
-        # Create gradient colors from low to high
-        colors = plt.cm.RdYlGn(np.linspace(0.3, 0.9, len(intensity)))
-        bars = ax1.barh(intensity.index, intensity['mean'], color=colors, alpha=0.85, edgecolor='black', linewidth=1.5)
-        
-        # Add value labels on bars
-        for i, (idx, row) in enumerate(intensity.iterrows()):
-            ax1.text(row['mean'] + 0.15, i, f"{row['mean']:.2f} cal/min", 
-                    va='center', fontsize=11, fontweight='bold')
-            # Add median as vertical line
-            ax1.plot([row['median'], row['median']], [i-0.3, i+0.3], 
-                    color='darkblue', linewidth=2, alpha=0.7)
-        
-        ax1.set_xlabel('Calories Burned per Minute', fontsize=12, fontweight='bold')
-        ax1.set_title('Workout Intensity Ranking - Calories Burned per Minute', 
-                     fontsize=13, fontweight='bold', pad=15)
-        ax1.grid(axis='x', alpha=0.4, linestyle='--')
-        ax1.set_xlim(0, max(intensity['mean']) * 1.15)
-        
-        # Add legend for median line
-        from matplotlib.lines import Line2D
-        legend_elements = [Line2D([0], [0], color='darkblue', linewidth=2, label='Median')]
-        ax1.legend(handles=legend_elements, loc='lower right', fontsize=10)
-        
-        # 2. BMI Distribution by Gender
-        ax2 = axes[1]
-        violin_parts = ax2.violinplot([df[df['Gender']=='Female']['BMI'].dropna(),
-                                       df[df['Gender']=='Male']['BMI'].dropna()],
-                                      positions=[0, 1], showmeans=True, showmedians=True)
-        
-        # Color violins
-        colors_violin = ['#66c2a5', '#fc8d62']
-        for pc, color in zip(violin_parts['bodies'], colors_violin):
-            pc.set_facecolor(color)
-            pc.set_alpha(0.7)
-        
-        ax2.set_xticks([0, 1])
-        ax2.set_xticklabels(['Female', 'Male'], fontsize=11)
-        ax2.set_ylabel('BMI', fontsize=11, fontweight='bold')
-        ax2.set_title('BMI Distribution by Gender', fontsize=13, fontweight='bold')
-        ax2.grid(axis='y', alpha=0.3)
-        
-        # Add mean values as text
-        female_mean = df[df['Gender']=='Female']['BMI'].mean()
-        male_mean = df[df['Gender']=='Male']['BMI'].mean()
-        ax2.text(0, female_mean + 2, f'μ={female_mean:.1f}', ha='center', fontsize=10, fontweight='bold')
-        ax2.text(1, male_mean + 2, f'μ={male_mean:.1f}', ha='center', fontsize=10, fontweight='bold')
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, self.MANIFEST)) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != self.VERSION:
+            raise ValueError(f"Results store {path} has version {self.manifest.get('version')}, expected "
+                             f"{self.VERSION}; rebuild it from processed_data")
+        self.dimensions = tuple(self.manifest['dimensions'])
+        self.metrics = tuple(self.manifest['metrics'])
+        self._cube: Optional[pd.DataFrame] = None
+        self._cells: Dict[Tuple[tuple, str], int] = {}
+        self._values: Optional[np.ndarray] = None
+    
+    @classmethod
+    def cube_columns(cls, dimensions: Tuple[str, ...]) -> List[str]:
+        return list(dimensions) + ['grouping', 'metric'] + list(cls.STATS)
+    
+    @property
+    def cube(self) -> pd.DataFrame:
+        """The whole aggregate cube (see ResultsStoreWriter._cube), loaded on first use"""
+        self._ensure_loaded()
+        return self._cube
+    
+    def _ensure_loaded(self) -> None:
+        """Read the cube and index its cells by (dimension values, metric), rolled-up dimensions as _ALL_VALUES"""
+        if self._cube is not None:
+            return
+        cube = pd.read_parquet(os.path.join(self.path, self.manifest['cube']))
+        grouping = cube['grouping'].to_numpy(dtype=np.int64)
+        columns = [[_ALL_VALUES if rolled_up else _plain_value(value)
+                    for value, rolled_up in zip(cube[key].tolist(), (grouping >> i) & 1)]
+                   for i, key in enumerate(self.dimensions)]
+        keys = zip(*(columns + [cube['metric'].tolist()]))
+        self._cells = {(tuple(key[:-1]), key[-1]): position for position, key in enumerate(keys)}
+        self._values = cube[list(self.STATS)].to_numpy(dtype=float)
+        self._cube = cube
+    
+    def aggregate(self, metric: Optional[str] = None, **filters) -> Union[pd.Series, pd.DataFrame]:
+        """Statistics of the rows matching filters (dimension=value; dimensions left out are all values)
         
-        plt.tight_layout()
-        self.output_manager.save_plot(fig, filename)
+        One metric gives a Series of STATS, no metric a DataFrame with a row per metric;
+        a segment without rows has a count of 0. A None filter selects the rows missing that
+        dimension's value, which every rolled-up cell also counts.
+        """
+        self._ensure_loaded()
+        key = self._cell_key(filters)
+        metrics = self.metrics if metric is None else (metric,)
+        unknown = [name for name in metrics if name not in self.metrics]
+        if unknown:
+            raise KeyError(f"No metric {unknown[0]!r} in the results store; it has {list(self.metrics)}")
+        empty = np.array([0.0] + [np.nan] * (len(self.STATS) - 1))
+        values = [self._values[self._cells[(key, name)]] if (key, name) in self._cells else empty for name in metrics]
+        if metric is not None:
+            return pd.Series(values[0], index=self.STATS, name=metric)
+        return pd.DataFrame(values, index=pd.Index(metrics, name='metric'), columns=self.STATS)
+    
+    def _cell_key(self, filters: Dict[str, object]) -> tuple:
+        unknown = [name for name in filters if name not in self.dimensions]
+        if unknown:
+            raise KeyError(f"No dimension {unknown[0]!r} in the results store; it has {list(self.dimensions)}")
+        return tuple(_plain_value(filters[key]) if key in filters else _ALL_VALUES for key in self.dimensions)
+    
+    def segments(self) -> pd.DataFrame:
+        """One row per partition: its dimension values, row count and part files"""
+        return pd.DataFrame([dict(entry['values'], rows=entry['rows'], files=entry['files'])
+                             for entry in self.manifest['partitions']])
+    
+    @profiled('store_rows')
+    def rows(self, columns: Optional[List[str]] = None, **filters) -> pd.DataFrame:
+        """Processed rows matching filters, read from the matching partitions only
         
+        A filter is one value or a list of values of a dimension.
+        """
+        self._cell_key(filters)
+        allowed = {key: {_plain_value(value) for value in (values if isinstance(values, (list, tuple, set)) else [values])}
+                   for key, values in filters.items()}
+        files = [os.path.join(self.path, name) for entry in self.manifest['partitions']
+                 if all(entry['values'][key] in values for key, values in allowed.items()) for name in entry['files']]
+        if not files:
+            return pd.DataFrame(columns=columns or self.manifest['columns'])
+        # One pandas conversion for all partitions: converting each small file on its own costs more than reading it
+        tables = [pq.ParquetFile(path).read(columns, use_pandas_metadata=True) for path in files]
+        return pa.concat_tables(tables).to_pandas()
+
+
+@dataclass
+class IncrementalState:
+    """Mergeable results of every row processed so far, saved next to processed_data for --append runs"""
+    code_key: str
+    stats: CleaningStats
+    # Hashes of the raw rows, so a re-submitted row is skipped even after the imputation values moved
+    raw_seen: RowHashSet
+    # Hashes of the imputed rows, the duplicates clean_data removes
+    seen: RowHashSet
+    correlation: CorrelationAccumulator
+    groups: GroupAggregator
+    charts: ChartDataBuilder
+    rows_in: int = 0
+    rows_out: int = 0
+    batches: int = 1
+    
+    CONFIG_FIELDS = ('STREAMING_SKETCH_ERROR',)
+    
+    @profiled('aggregate_chunk')
+    def update(self, featured: pd.DataFrame) -> None:
+        """Fold one cleaned, featured chunk into every accumulator (Spearman correlations only observe it,
+        until their rank grid is fixed)"""
+        if self.correlation.needs_rank_grid:
+            self.correlation.observe(featured)
+        else:
+            self.correlation.update(featured)
+        self.groups.update(featured)
+        self.charts.update(featured)
+        self.rows_out += len(featured)
+    
+    @staticmethod
+    def hash_dir(path: str) -> str:
+        """Directory beside the state file at path holding the row-hash runs of its RowHashSets"""
+        return f"{os.path.splitext(path)[0]}_hashes"
+    
+    @profiled('save_state')
+    def save(self, path: str) -> None:
+        """Pickle the state; row hashes already spilled to hash_dir(path) are referenced, not rewritten"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.code_key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        # Only now is no saved state using the runs merged away since the last save
+        RowHashSet.remove_unused_runs(self.raw_seen, self.seen)
+    
+    @staticmethod
+    def load(path: str, code_key: str) -> Optional['IncrementalState']:
+        """The saved state, or None when there is none or it was built by other code or settings"""
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            # The key is pickled first, so a state of other code is never unpickled
+            if pickle.load(f) != code_key:
+                return None
+            try:
+                return pickle.load(f)
+            except FileNotFoundError:
+                # Its row-hash runs were deleted
+                return None
+
 
 class FitnessDataAnalyzer:
     """Main orchestrator class that coordinates the entire analysis pipeline"""
     
-    def __init__(self):
-        self.config = Config()
-        self.output_manager = OutputManager(self.config.CHART_DIR)
-        self.ingestor = DataIngestor()
-        self.cleaner = DataCleaner()
+    # Stages a run can stop after (the CLI subcommands); each one runs the stages before it too
+    STAGES = ('ingest', 'clean', 'analyze', 'render')
+    
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
+        storage = get_storage_format(self.config.STORAGE_FORMAT, self.config)
+        self.output_manager = OutputManager(self.config.CHART_DIR, storage)
+        schema = SchemaLoader(self.config.CHUNK_SIZE, self.config.USECOLS) if self.config.COMPACT_DTYPES else None
+        self.ingestor = DataIngestor(storage, schema, get_data_source(self.config))
+        self.processed_data_path = storage.path(self.config.PROCESSED_DATA_PATH)
+        self.cleaner = DataCleaner(self.config.QUANTILE_SKETCH_ERROR)
         self.feature_engineer = FeatureEngineer()
-        self.explorer = DataExplorer()
-        self.visualizer = Visualizer(self.output_manager)
+        correlation_target = self.config.TARGET_COLUMN if self.config.CORRELATION_TARGET_ONLY else None
+        self.explorer = DataExplorer(self.config.QUANTILE_SKETCH_ERROR, self.config.CORRELATION_METHOD, correlation_target)
+        # Streaming and --append runs: sketches instead of value counts, unless both sketch errors are None
+        self.streaming_sketch_error = (self.config.STREAMING_SKETCH_ERROR if self.config.QUANTILE_SKETCH_ERROR is None
+                                       else self.config.QUANTILE_SKETCH_ERROR)
+        self.streaming_cleaner = DataCleaner(self.streaming_sketch_error)
+        self.streaming_explorer = DataExplorer(self.streaming_sketch_error, self.config.CORRELATION_METHOD,
+                                               correlation_target)
+        self.visualizer = Visualizer(self.output_manager, Visualizer.profile_for(self.config))
+        self.cache = StageCache(self.config.CACHE_DIR, self.config.CACHE_MAX_BYTES)
+        self.render_scheduler = RenderScheduler(self.config.RENDER_WORKERS)
+        self.segment_fanout = SegmentFanout(self.config.SEGMENT_BY or (), self.config.SEGMENT_DIR,
+                                            self.config.SEGMENT_DPI, self.config.RENDER_WORKERS,
+                                            self.config.QUANTILE_SKETCH_ERROR)
+        self.parallel_cleaner = ParallelCleaner(self.ingestor, self.cleaner, self.config.INGEST_WORKERS)
+    
+    def serve(self) -> None:
+        """Answer key findings, group summaries and dashboards over HTTP until interrupted (see AnalyticsService)"""
+        AnalyticsService(self).serve()
+    
+    def run_analysis(self, streaming: bool = False, append: Optional[List[str]] = None, stage: str = 'render') -> None:
+        """Execute the analysis pipeline up to stage, or fold only the new session files in append into it"""
+        if stage not in self.STAGES:
+            raise ValueError(f"Unknown stage '{stage}', expected one of {self.STAGES}")
+        if append and stage in ('ingest', 'clean'):
+            raise ValueError("Appending updates the analysis state; run it with the analyze or render stage")
+        profiler = RunProfiler(self.config.PROFILE_MEMORY) if self.config.PROFILE or self.config.PROFILE_MEMORY else None
+        cprofile = cProfile.Profile() if self.config.CPROFILE_PATH else None
+        with profiling(profiler):
+            if cprofile:
+                cprofile.enable()
+            try:
+                with profile_step('run'):
+                    self._run_pipeline(streaming, append, stage)
+            finally:
+                if cprofile:
+                    cprofile.disable()
+        
+        if cprofile:
+            cprofile.dump_stats(self.config.CPROFILE_PATH)
+            print(f"✓ cProfile stats saved to: {self.config.CPROFILE_PATH}")
+        if profiler:
+            mode = 'append' if append else 'streaming' if streaming else 'in-memory'
+            self._save_run_report(profiler, mode, stage)
+    
+    def _save_run_report(self, profiler: RunProfiler, mode: str, stage: str) -> None:
+        """Write the profiler's JSON run report and print the time of each top-level stage"""
+        report = profiler.report(
+            created=datetime.datetime.now().isoformat(timespec='seconds'),
+            mode=mode,
+            stage=stage,
+            python=platform.python_version(),
+            pandas=pd.__version__,
+            numpy=np.__version__,
+            config={name: getattr(self.config, name) for name in self.config.__dataclass_fields__},
+        )
+        path = self.config.RUN_REPORT_PATH
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2, default=repr)
+        print(f"\n✓ Run report saved to: {path}")
+        for step in report['steps']:
+            if step['depth'] == 1:
+                print(f"  → {step['path'].split('/')[-1]}: {step['wall_s']:.2f}s wall, {step['cpu_s']:.2f}s CPU")
     
-    def run_analysis(self) -> None:
-        """Execute the complete analysis pipeline"""
+    def _run_pipeline(self, streaming: bool, append: Optional[List[str]], stage: str) -> None:
+        """Steps 1-6 and the key findings, stopping after stage"""
         print("\n" + "="*70)
         print("  FITNESS & NUTRITION DATA ANALYSIS PIPELINE")
         print("="*70 + "\n")
@@ -455,88 +4071,763 @@ class FitnessDataAnalyzer:
         print("[1/6] Setting up output directories...")
         self.output_manager.setup_output_directories()
         
+        if stage == 'ingest':
+            self._run_ingest_stage(streaming)
+            return
+        
+        explore = stage != 'clean'
+        if append:
+            chart_data, corr_matrix, grouped_stats = self._run_append_stages(append)
+            chart_key = None
+        elif streaming:
+            chart_data, corr_matrix, grouped_stats = self._run_streaming_stages(explore)
+            chart_key = None
+        else:
+            chart_data, corr_matrix, grouped_stats, chart_key = self._run_in_memory_stages(explore)
+        
+        if not explore:
+            print(f"\n✓ Cleaned and featured data saved to: {self.processed_data_path}")
+            return
+        
+        if stage == 'render':
+            self._render_dashboards(chart_data, grouped_stats, chart_key)
+            if self.config.SEGMENT_BY:
+                self._render_segment_dashboards(chart_key)
+        # --append runs add their rows to the store themselves
+        if self.config.RESULTS_STORE_DIR and not append:
+            if streaming:
+                self._write_results_store(chart_key, self.streaming_sketch_error, self._state_key())
+            else:
+                self._write_results_store(chart_key, self.config.QUANTILE_SKETCH_ERROR)
+        
+        # Final Summary
+        print("\n" + "="*70)
+        print("  ✓ ANALYSIS COMPLETE")
+        print("="*70)
+        print(f"\nAll outputs saved to '{self.config.OUTPUT_DIR}' folder:")
+        if stage == 'render':
+            print(f"  • Charts: {self.config.CHART_DIR}/")
+            if self.config.SEGMENT_BY:
+                print(f"  • Segment dashboards: {self.config.SEGMENT_DIR}/")
+        print(f"  • Processed Data: {self.processed_data_path}")
+        if self.config.RESULTS_STORE_DIR:
+            print(f"  • Results Store: {self.config.RESULTS_STORE_DIR}/")
+        
+        # Key Findings
+        self._print_key_findings(corr_matrix, grouped_stats)
+    
+    @profiled('ingest_stage')
+    def _run_ingest_stage(self, streaming: bool) -> None:
+        """Step 2 alone: locate the input, downloading it at most once, and back up its raw rows"""
+        print("\n[2/6] Loading data...")
+        data_files = self.ingestor.locate_data_files()
+        if streaming:
+            rows = 0
+            with self.ingestor.open_backup_writer(self.config.RAW_DATA_BACKUP_PATH) as raw_writer:
+                for chunk in self.ingestor.iter_chunks(data_files, self.config.CHUNK_SIZE):
+                    rows += len(chunk)
+                    raw_writer.write(chunk)
+            print(f"✓ Raw data backed up to: {self.ingestor.storage.path(self.config.RAW_DATA_BACKUP_PATH)} ({rows} rows)")
+        else:
+            raw_df = self.ingestor.load_data(data_files)
+            self.ingestor.backup_raw_data(raw_df, self.config.RAW_DATA_BACKUP_PATH)
+    
+    def _render_dashboards(self, chart_data: Dict[str, object], grouped_stats: Dict[str, pd.DataFrame],
+                           chart_key: Optional[str]) -> None:
+        """Step 6: draw the dashboards whose inputs changed"""
+        print("\n[6/6] Generating visualizations...")
+        summary_path, insights_path = self._chart_paths()
+        
+        # Core comprehensive dashboards only; data is prepared here, drawing happens on the render pool
+        jobs = []
+        if self._chart_is_current(summary_path, chart_key):
+            print("  → Summary dashboard unchanged, skipping")
+        else:
+            print("  → Creating summary dashboard...")
+            jobs.append(RenderJob('summary', self.visualizer.summary_dashboard_data(chart_data, grouped_stats),
+                                  summary_path, self.visualizer.profile))
+        
+        if self._chart_is_current(insights_path, chart_key):
+            print("  → Fitness insights dashboard unchanged, skipping")
+        else:
+            print("  → Creating fitness insights dashboard...")
+            jobs.append(RenderJob('insights', self.visualizer.insights_dashboard_data(chart_data, grouped_stats),
+                                  insights_path, self.visualizer.profile))
+        
+        for path in self.render_scheduler.render(jobs):
+            self._mark_chart(path, chart_key)
+    
+    def _render_segment_dashboards(self, chart_key: Optional[str]) -> None:
+        """Step 6, fanned out: both dashboards for every segment of the processed data"""
+        keys = ', '.join(self.config.SEGMENT_BY)
+        index_path = os.path.join(self.config.SEGMENT_DIR, 'index.json')
+        segment_key = chart_key
+        if chart_key:
+            segment_key = StageCache.stage_key(chart_key, SegmentFanout, self.config)
+        if self._chart_is_current(index_path, segment_key):
+            print(f"  → Dashboards per {keys} unchanged, skipping")
+            return
+        print(f"  → Creating dashboards per {keys}...")
+        # Read back from processed_data, which every run mode leaves complete on disk
+        columns = list(dict.fromkeys(self.config.SEGMENT_BY + SegmentFanout.COLUMNS))
+        df = self.output_manager.load_dataframe(self.config.PROCESSED_DATA_PATH, columns)
+        self._mark_chart(self.segment_fanout.run(df), segment_key)
+    
+    @profiled('results_store')
+    def _write_results_store(self, data_key: Optional[str], sketch_error: Optional[float],
+                             source: Optional[str] = None) -> None:
+        """Partition processed_data by segment and build its aggregate cube (medians with sketch_error), for
+        ResultsStore queries; --append runs add to a store of the same source (the incremental state's key)"""
+        path = self.config.RESULTS_STORE_DIR
+        manifest_path = os.path.join(path, ResultsStore.MANIFEST)
+        store_key = data_key
+        if data_key:
+            for stage in (ResultsStoreWriter, ResultsStore):
+                store_key = StageCache.stage_key(store_key, stage, self.config)
+        if self._chart_is_current(manifest_path, store_key):
+            print(f"\n✓ Results store unchanged: {path}/")
+            return
+        # Streamed back from processed_data, so the store never holds more than one chunk of rows
+        with ResultsStoreWriter(path, sketch_error, source) as writer:
+            for chunk in self.output_manager.iter_dataframe_chunks(self.config.PROCESSED_DATA_PATH,
+                                                                    self.config.CHUNK_SIZE):
+                writer.write(chunk)
+        self._mark_chart(manifest_path, store_key)
+        store = ResultsStore(path)
+        print(f"\n✓ Results store saved to: {path}/ ({store.manifest['rows']} rows in "
+              f"{len(store.manifest['partitions'])} partitions, {len(store.cube)} cube cells)")
+    
+    def _chart_paths(self) -> Tuple[str, str]:
+        extension = self.visualizer.profile.extension
+        return (f"{self.config.CHART_DIR}/summary_dashboard.{extension}",
+                f"{self.config.CHART_DIR}/fitness_insights_dashboard.{extension}")
+    
+    def _chart_is_current(self, path: str, chart_key: Optional[str]) -> bool:
+        return bool(chart_key) and self.config.USE_CACHE and self.cache.output_is_current(path, chart_key)
+    
+    def _mark_chart(self, path: str, chart_key: Optional[str]) -> None:
+        self.cache.mark_output(path, chart_key if self.config.USE_CACHE else None)
+    
+    @profiled('in_memory_stages')
+    def _run_in_memory_stages(self, explore: bool = True) -> Tuple[Dict[str, object], pd.DataFrame,
+                                                                   Dict[str, pd.DataFrame], str]:
+        """Steps 2-5 (2-4 without explore) on the whole dataset loaded at once, reusing cached stage outputs"""
+        cache = self.cache if self.config.USE_CACHE else None
+        
         # Step 2: Data Loading
         print("\n[2/6] Loading data...")
-        raw_df = self.ingestor.load_data()
-        self.ingestor.backup_raw_data(raw_df, self.config.RAW_DATA_BACKUP_PATH)
+        data_files = self.ingestor.locate_data_files()
+        _, clean_key, feature_key, explore_key, chart_key = self._stage_keys(data_files)
+        
+        explored = cache.get(explore_key) if cache and explore else None
+        needs_rows = (
+            (explore and explored is None) or cache is None
+            or not cache.output_is_current(self.processed_data_path, feature_key)
+        )
         
-        # Step 3: Data Cleaning
-        print("\n[3/6] Cleaning data...")
-        clean_df = self.cleaner.clean_data(raw_df.copy())
+        featured_df = None
+        if needs_rows:
+            featured_df = cache.get(feature_key) if cache else None
+            if featured_df is None:
+                clean_df = cache.get(clean_key) if cache else None
+                if clean_df is None:
+                    if len(data_files) > 1 and self.config.INGEST_WORKERS > 1:
+                        # Steps 2-3 together: every file is parsed and cleaned on its own worker
+                        print(f"✓ Loading data from: {_describe_files(data_files)}")
+                        print("\n[3/6] Cleaning data...")
+                        clean_df = self.parallel_cleaner.clean_files(data_files, self.config.RAW_DATA_BACKUP_PATH)
+                    else:
+                        raw_df = self.ingestor.load_data(data_files)
+                        self.ingestor.backup_raw_data(raw_df, self.config.RAW_DATA_BACKUP_PATH)
+                        
+                        # Step 3: Data Cleaning
+                        print("\n[3/6] Cleaning data...")
+                        clean_df = self.cleaner.clean_data(raw_df)
+                    if cache:
+                        cache.put(clean_key, clean_df)
+                else:
+                    print("\n[3/6] Cleaning data...")
+                    print(f"✓ Loaded cleaned data from cache ({clean_key[:12]})")
+                
+                # Step 4: Feature Engineering
+                print("\n[4/6] Engineering features...")
+                featured_df = self.feature_engineer.create_features(clean_df)
+                if cache:
+                    cache.put(feature_key, featured_df)
+            else:
+                print("\n[3/6] Cleaning data...")
+                print("\n[4/6] Engineering features...")
+                print(f"✓ Loaded featured data from cache ({feature_key[:12]})")
+            
+            if cache is None or not cache.output_is_current(self.processed_data_path, feature_key):
+                self.output_manager.save_dataframe(featured_df, self.config.PROCESSED_DATA_PATH)
+                self.cache.mark_output(self.processed_data_path, feature_key if cache else None)
+        else:
+            print("\n[3/6] Cleaning data...")
+            print("\n[4/6] Engineering features...")
+            print(f"✓ Cleaned and featured data unchanged, outputs are current")
         
-        # Step 4: Feature Engineering
-        print("\n[4/6] Engineering features...")
-        featured_df = self.feature_engineer.create_features(clean_df)
-        self.output_manager.save_dataframe(featured_df, self.config.PROCESSED_DATA_PATH)
+        if not explore:
+            return None, None, None, chart_key
         
         # Step 5: Data Exploration
         print("\n[5/6] Running data exploration...")
+        if explored is None:
+            explored = self._explore(featured_df)
+            if cache:
+                cache.put(explore_key, explored)
+        else:
+            print(f"✓ Loaded exploration results from cache ({explore_key[:12]})")
+        corr_matrix, grouped_stats, chart_data = explored
         
+        return chart_data, corr_matrix, grouped_stats, chart_key
+    
+    def _stage_keys(self, data_files: List[str]) -> Tuple[str, str, str, str, str]:
+        """Cache keys of these input files and of the clean, feature, explore and chart stages after them"""
+        input_key = self.ingestor.input_digest(data_files)
+        clean_key = StageCache.stage_key(input_key, self.cleaner, self.config)
+        feature_key = StageCache.stage_key(clean_key, self.feature_engineer, self.config)
+        explore_key = feature_key
+        for stage in (self.explorer, GroupAggregator, ChartDataBuilder):
+            explore_key = StageCache.stage_key(explore_key, stage, self.config)
+        chart_key = explore_key
+        for stage in (self.visualizer, DashboardFigure, SummaryDashboard, InsightsDashboard):
+            chart_key = StageCache.stage_key(chart_key, stage, self.config)
+        return input_key, clean_key, feature_key, explore_key, chart_key
+    
+    def _explore(self, featured_df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame], Dict[str, object]]:
+        """Step 5 on a featured frame: (correlations, group analyses, chart data)"""
         # Correlation Analysis
         corr_matrix = self.explorer.calculate_correlation(featured_df)
         
         # Group Analyses
         grouped_stats = self.explorer.perform_group_analysis(featured_df)
         
-        # Step 6: Visualizations
-        print("\n[6/6] Generating visualizations...")
+        # Chart aggregates (histograms, densities, hexbin counts)
+        chart_data = ChartDataBuilder.from_frame(featured_df, self.config.QUANTILE_SKETCH_ERROR)
+        return corr_matrix, grouped_stats, chart_data
+    
+    @profiled('streaming_stages')
+    def _run_streaming_stages(self, explore: bool = True) -> Tuple[Dict[str, object], pd.DataFrame,
+                                                                   Dict[str, pd.DataFrame]]:
+        """Steps 2-5 (2-4 without explore) over bounded chunks; no rows are kept once a chunk has been aggregated"""
+        # Step 2: Data Loading
+        print("\n[2/6] Locating data...")
+        data_files = self.ingestor.locate_data_files()
+        print(f"✓ Streaming data from: {_describe_files(data_files)} ({self.config.CHUNK_SIZE} rows per chunk)")
+        chunks = lambda: self.ingestor.iter_chunks(data_files, self.config.CHUNK_SIZE)
+        # Statistics of no rows are undefined; stops at the first chunk with rows
+        if not any(len(chunk) for chunk in chunks()):
+            raise ValueError(f"No rows in {_describe_files(data_files)}")
         
-        # Core comprehensive dashboards only
-        print("  → Creating summary dashboard...")
-        self.visualizer.create_summary_dashboard(featured_df, corr_matrix,
-                                                f"{self.config.CHART_DIR}/summary_dashboard.png")
+        # Step 3: Global cleaning statistics
+        print("\n[3/6] Computing cleaning statistics...")
+        stats = self.streaming_cleaner.fit_streaming_stats(chunks)
         
-        print("  → Creating fitness insights dashboard...")
-        self.visualizer.create_advanced_insights_dashboard(featured_df, grouped_stats,
-                                                           f"{self.config.CHART_DIR}/fitness_insights_dashboard.png")
+        # Step 4: Clean, engineer and aggregate each chunk
+        print("\n[4/6] Cleaning and engineering features per chunk...")
+        self.cache.mark_output(self.processed_data_path, None)
+        hash_dir = IncrementalState.hash_dir(self.config.STATE_PATH)
+        state = IncrementalState(
+            self._state_key(), stats, RowHashSet(hash_dir), RowHashSet(hash_dir),
+            self.streaming_explorer.create_correlation_accumulator(),
+            self.streaming_explorer.create_group_aggregator(), ChartDataBuilder(stats.value_ranges, self.streaming_sketch_error)
+        )
+        with self.ingestor.open_backup_writer(self.config.RAW_DATA_BACKUP_PATH) as raw_writer, \
+                self.output_manager.open_dataframe_writer(self.config.PROCESSED_DATA_PATH) as processed_writer:
+            chunk_count = 0
+            for chunk in chunks():
+                chunk_count += 1
+                state.rows_in += len(chunk)
+                raw_writer.write(chunk)
+                # Identical raw rows are imputed identically, so skipping them here changes nothing
+                chunk = state.raw_seen.drop_seen(chunk)
+                featured = self.feature_engineer.create_features(
+                    self.streaming_cleaner.clean_chunk(chunk, stats, state.seen), verbose=False
+                )
+                processed_writer.write(featured)
+                if explore:
+                    state.update(featured)
+                else:
+                    state.rows_out += len(featured)
+        print(f"✓ Processed {state.rows_in} rows in {chunk_count} chunks "
+              f"({state.rows_in - state.rows_out} duplicates removed)")
+        if explore and state.correlation.needs_rank_grid:
+            # Spearman ranks come from quantiles of all rows, so correlations take a second pass;
+            # appended batches are later ranked in this same grid
+            print("  → Ranking processed rows for Spearman correlations...")
+            state.correlation.fix_rank_grid()
+            for chunk in self.output_manager.iter_dataframe_chunks(self.config.PROCESSED_DATA_PATH, self.config.CHUNK_SIZE):
+                state.correlation.update(chunk)
+        print(f"✓ Raw data backed up to: {self.ingestor.storage.path(self.config.RAW_DATA_BACKUP_PATH)}")
+        print(f"✓ Saved: {self.processed_data_path}")
+        if not explore:
+            # processed_data was rewritten without the state, so --append must rebuild it
+            if os.path.exists(self.config.STATE_PATH):
+                os.remove(self.config.STATE_PATH)
+            shutil.rmtree(hash_dir, ignore_errors=True)
+            return None, None, None
         
-        # Final Summary
-        print("\n" + "="*70)
-        print("  ✓ ANALYSIS COMPLETE")
-        print("="*70)
-        print(f"\nAll outputs saved to '{self.config.OUTPUT_DIR}' folder:")
-        print(f"  • Charts: {self.config.CHART_DIR}/")
-        print(f"  • Processed Data: {self.config.PROCESSED_DATA_PATH}")
+        # Step 5: Data Exploration
+        print("\n[5/6] Finalizing data exploration...")
+        state.save(self.config.STATE_PATH)
+        print(f"✓ Incremental state saved to: {self.config.STATE_PATH}")
+        return self._state_results(state)
+    
+    @profiled('append_stages')
+    def _run_append_stages(self, paths: List[str]) -> Tuple[Dict[str, object], pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """Steps 2-5 on new session files only, updating the state saved by the last streaming run"""
+        # Step 2: Load the saved state
+        print("\n[2/6] Loading incremental state...")
+        state = IncrementalState.load(self.config.STATE_PATH, self._state_key())
+        if state is None or not os.path.exists(self.processed_data_path):
+            print("  → No incremental state for this code and configuration, building it from the full dataset")
+            self._run_streaming_stages()
+            state = IncrementalState.load(self.config.STATE_PATH, self._state_key())
+        print(f"✓ State covers {state.rows_out} processed rows from {state.batches} batch(es)")
         
-        # Key Findings
-        self._print_key_findings(featured_df, corr_matrix, grouped_stats)
+        # Steps 3-4: Clean, engineer and aggregate only the new rows
+        print("\n[3/6] Cleaning new sessions against the saved statistics...")
+        print("\n[4/6] Engineering features and updating aggregates...")
+        self.cache.mark_output(self.processed_data_path, None)
+        rows_in, rows_out = state.rows_in, state.rows_out
+        # The results store takes the new rows only when it holds exactly the processed rows the state covers;
+        # otherwise it is rebuilt from processed_data afterwards
+        store_path, store_writer = self.config.RESULTS_STORE_DIR, None
+        with contextlib.ExitStack() as stack:
+            raw_writer = stack.enter_context(self.ingestor.open_backup_append_writer(self.config.RAW_DATA_BACKUP_PATH))
+            processed_writer = stack.enter_context(
+                self.output_manager.open_dataframe_append_writer(self.config.PROCESSED_DATA_PATH))
+            if store_path and ResultsStoreWriter.can_append(store_path, self._state_key(), state.rows_out,
+                                                            self.streaming_sketch_error):
+                store_writer = stack.enter_context(ResultsStoreWriter(
+                    store_path, self.streaming_sketch_error, self._state_key(), append=True))
+            for path in paths:
+                for chunk in self.ingestor.iter_chunks(path, self.config.CHUNK_SIZE):
+                    # Continue the raw row numbering of the earlier batches
+                    chunk.index = pd.RangeIndex(state.rows_in, state.rows_in + len(chunk))
+                    state.rows_in += len(chunk)
+                    raw_writer.write(chunk)
+                    chunk = state.raw_seen.drop_seen(chunk)
+                    featured = self.feature_engineer.create_features(
+                        self.streaming_cleaner.clean_delta(chunk, state.stats, state.seen), verbose=False
+                    )
+                    processed_writer.write(featured)
+                    if store_writer is not None:
+                        store_writer.write(featured)
+                    state.update(featured)
+        state.batches += 1
+        added = state.rows_in - rows_in
+        print(f"✓ Appended {added} rows from {len(paths)} file(s) ({added - (state.rows_out - rows_out)} duplicates removed)")
+        
+        if store_writer is not None:
+            self._mark_chart(os.path.join(store_path, ResultsStore.MANIFEST), None)
+            print(f"✓ Results store updated: {store_path}/ (+{state.rows_out - rows_out} rows)")
+        elif store_path:
+            self._write_results_store(None, self.streaming_sketch_error, self._state_key())
+        
+        # Step 5: Data Exploration
+        print("\n[5/6] Finalizing data exploration...")
+        state.save(self.config.STATE_PATH)
+        print(f"✓ Incremental state saved to: {self.config.STATE_PATH}")
+        return self._state_results(state)
+    
+    @profiled('finalize')
+    def _state_results(self, state: IncrementalState) -> Tuple[Dict[str, object], pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """Chart data, correlation matrix and group tables from the accumulated state"""
+        return state.charts.result(), state.correlation.result(), self.streaming_explorer.summarize_groups(state.groups)
+    
+    def _state_key(self) -> str:
+        """Version of the code and settings an IncrementalState was built with"""
+        key = f"incremental:{self.config.STORAGE_FORMAT}"
+        for stage in (self.streaming_cleaner, self.feature_engineer, self.streaming_explorer, GroupAggregator,
+                      CorrelationAccumulator, ChartDataBuilder, IncrementalState):
+            key = StageCache.stage_key(key, stage, self.config)
+        return key
     
-    def _print_key_findings(self, df: pd.DataFrame, corr: pd.DataFrame, 
-                           grouped: Dict[str, pd.DataFrame]) -> None:
+    def key_findings(self, corr: pd.DataFrame, grouped: Dict[str, pd.DataFrame]) -> Dict[str, object]:
+        """Key findings as plain data, for printing or serving as JSON"""
+        def records(table: pd.DataFrame, label: str, columns: Tuple[str, ...]) -> List[Dict[str, object]]:
+            return [dict({label: _plain_value(name)}, **{column: _plain_value(row[column]) for column in columns})
+                    for name, row in table.iterrows()]
+        
+        # Finding 1: Correlation insights
+        target_corr = corr[self.config.TARGET_COLUMN].drop(self.config.TARGET_COLUMN).sort_values(ascending=False)
+        return {
+            'correlation_method': self.config.CORRELATION_METHOD,
+            'strongest_predictors': [{'feature': feature, 'correlation': _plain_value(corr_val)}
+                                     for feature, corr_val in target_corr.head(3).items()],
+            # Finding 2: Workout intensity ranking
+            'intensity_ranking': records(grouped['intensity_ranking'].head(3), 'workout', ('mean', 'median')),
+            # Finding 3: Gender differences
+            'gender': records(grouped['gender_summary'], 'gender', ('mean', 'std', 'count')),
+            # Finding 4: Age group insights
+            'age_groups': records(grouped['age_group_summary'].sort_values('mean', ascending=False).head(3),
+                                  'age_group', ('mean', 'median')),
+        }
+    
+    def _print_key_findings(self, corr: pd.DataFrame, grouped: Dict[str, pd.DataFrame]) -> None:
         """Print key findings from the analysis"""
+        findings = self.key_findings(corr, grouped)
         print("\n" + "="*70)
         print("  KEY FINDINGS")
         print("="*70 + "\n")
         
-        # Finding 1: Correlation insights
-        target_corr = corr[self.config.TARGET_COLUMN].drop(self.config.TARGET_COLUMN).sort_values(ascending=False)
-        top_correlates = target_corr.head(3)
         print("1. STRONGEST PREDICTORS OF CALORIES BURNED:")
-        for feature, corr_val in top_correlates.items():
-            print(f"   • {feature}: {corr_val:.3f} correlation")
+        kind = 'rank correlation' if findings['correlation_method'] == 'spearman' else 'correlation'
+        for entry in findings['strongest_predictors']:
+            print(f"   • {entry['feature']}: {entry['correlation']:.3f} {kind}")
         
-        # Finding 2: Workout intensity ranking
         print("\n2. WORKOUT INTENSITY RANKING (Calories/Minute):")
-        intensity = grouped['intensity_ranking'].head(3)
-        for idx, (workout, row) in enumerate(intensity.iterrows(), 1):
-            print(f"   {idx}. {workout}: {row['mean']:.3f} cal/min (median: {row['median']:.3f})")
+        for idx, entry in enumerate(findings['intensity_ranking'], 1):
+            print(f"   {idx}. {entry['workout']}: {entry['mean']:.3f} cal/min (median: {entry['median']:.3f})")
         
-        # Finding 3: Gender differences
         print("\n3. GENDER ANALYSIS:")
-        gender_summary = grouped['gender_summary']
-        for gender, row in gender_summary.iterrows():
-            print(f"   • {gender}: {row['mean']:.1f} ± {row['std']:.1f} calories (n={int(row['count'])})")
+        for entry in findings['gender']:
+            print(f"   • {entry['gender']}: {entry['mean']:.1f} ± {entry['std']:.1f} calories (n={int(entry['count'])})")
         
-        # Finding 4: Age group insights
         print("\n4. AGE GROUP PERFORMANCE:")
-        age_summary = grouped['age_group_summary'].sort_values('mean', ascending=False).head(3)
-        for age_group, row in age_summary.iterrows():
-            print(f"   • {age_group} years: {row['mean']:.1f} calories (median: {row['median']:.1f})")
+        for entry in findings['age_groups']:
+            print(f"   • {entry['age_group']} years: {entry['mean']:.1f} calories (median: {entry['median']:.1f})")
         
         print("\n" + "="*70 + "\n")
 
 
+class LRUCache:
+    """Bounded in-memory mapping that drops its least recently used entry when full"""
+    
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+    
+    def get(self, key: tuple) -> object:
+        """The entry's value (now the most recently used), or None"""
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+    
+    def put(self, key: tuple, value: object) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AnalyticsService:
+    """Local HTTP service for the key findings, group summaries and dashboards of FitnessDataAnalyzer's input
+    
+    Processed data is loaded once per input version. Requests are parsed on an asyncio event loop,
+    while loading, exploring and rendering run on one executor thread, so pandas and matplotlib
+    never run concurrently and cached answers keep flowing meanwhile. Answers are cached in an
+    LRU keyed by the stage cache keys; concurrent requests for the same missing entry share one
+    computation. The input files are re-checked every SERVE_POLL_SECONDS and reloaded on change;
+    requests keep being answered from the previous version until the new one is loaded.
+    """
+    
+    # Dashboard name -> index into FitnessDataAnalyzer._chart_paths(); served as /charts/<name>.<profile extension>
+    CHARTS = {'summary': 0, 'insights': 1}
+    ROUTES = ('/health', '/findings', '/groups', '/groups/<name>', '/charts/summary.<ext>', '/charts/insights.<ext>')
+    REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               500: 'Internal Server Error'}
+    
+    def __init__(self, analyzer: FitnessDataAnalyzer):
+        self.analyzer = analyzer
+        # Work runs on a thread beside the event loop, and a process forked from a threaded one can hang on
+        # a lock another thread held: the two dashboards are drawn in-process, cleaning workers are spawned
+        analyzer.render_scheduler = RenderScheduler(1)
+        analyzer.parallel_cleaner.mp_context = multiprocessing.get_context('spawn')
+        self.config = analyzer.config
+        self.chart_extension = analyzer.visualizer.profile.extension
+        self.cache = LRUCache(self.config.SERVE_CACHE_ITEMS)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='analytics')
+        self._pending: Dict[tuple, asyncio.Future] = {}
+        # Loaded input version: data files, their stat signature, stage keys and the processed frame
+        self._paths: Optional[List[str]] = None
+        self._signature: Optional[tuple] = None
+        self._keys: Optional[Tuple[str, str, str, str, str]] = None
+        self._frame: Optional[pd.DataFrame] = None
+    
+    def serve(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        except KeyboardInterrupt:
+            print("\n✓ Analytics service stopped")
+    
+    async def _serve(self) -> None:
+        self.analyzer.output_manager.setup_output_directories()
+        await self._snapshot()
+        server = await asyncio.start_server(self._handle, self.config.SERVE_HOST, self.config.SERVE_PORT)
+        routes = ', '.join(self.routes())
+        print(f"\n✓ Serving on http://{self.config.SERVE_HOST}:{self.config.SERVE_PORT} ({routes})")
+        watcher = asyncio.create_task(self._watch_input())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            self._executor.shutdown(wait=False)
+    
+    async def _shared(self, key: tuple, func: Callable, *args) -> object:
+        """func(*args) on the executor; callers asking for the same key meanwhile await the same call"""
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+            self._pending[key] = future
+            future.add_done_callback(lambda done: self._pending.pop(key) if self._pending.get(key) is done else None)
+        # A client hanging up must not cancel work other requests are waiting on
+        return await asyncio.shield(future)
+    
+    async def _cached(self, key: tuple, func: Callable, *args) -> object:
+        value = self.cache.get(key)
+        if value is None:
+            value = await self._shared(key, func, *args)
+            self.cache.put(key, value)
+        return value
+    
+    async def _snapshot(self) -> Tuple[Tuple[str, str, str, str, str], pd.DataFrame]:
+        """Stage keys and processed frame of the loaded input, loading it first if needed"""
+        if self._keys is None:
+            await self._reload()
+        return self._keys, self._frame
+    
+    async def _reload(self) -> None:
+        """Load the input and swap it in at once; until then requests are answered from the loaded version"""
+        paths, signature, keys, frame = await self._shared(('load',), self._load)
+        if keys != self._keys:
+            self.cache.clear()
+        self._paths, self._signature, self._keys, self._frame = paths, signature, keys, frame
+    
+    def _load(self) -> Tuple[List[str], tuple, Tuple[str, str, str, str, str], pd.DataFrame]:
+        """Bring processed_data up to date with the input and read it back (on the executor)"""
+        data_files = self.analyzer.ingestor.locate_data_files()
+        # Taken before the pipeline reads the files, so a change while it runs triggers another reload
+        signature = self._input_signature(data_files)
+        self.analyzer._run_in_memory_stages(explore=False)
+        keys = self.analyzer._stage_keys(data_files)
+        frame = self.analyzer.output_manager.load_dataframe(self.config.PROCESSED_DATA_PATH)
+        print(f"✓ Loaded {len(frame)} processed rows for input {keys[0][:12]}")
+        return data_files, signature, keys, frame
+    
+    @staticmethod
+    def _input_signature(paths: List[str]) -> tuple:
+        """Size and mtime of the data files and of their directories, which change when a shard is added"""
+        signature = []
+        for path in sorted(set(paths) | {os.path.dirname(os.path.abspath(path)) for path in paths}):
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+    
+    async def _watch_input(self) -> None:
+        """Reload when the input files change; a failed reload is retried at the next check"""
+        while True:
+            await asyncio.sleep(self.config.SERVE_POLL_SECONDS)
+            if self._paths is None or self._input_signature(self._paths) == self._signature:
+                continue
+            print("\n✓ Input changed, reloading")
+            try:
+                await self._reload()
+            except Exception as exc:
+                self._signature = None
+                print(f"✗ Reload failed: {exc!r}")
+    
+    def _explore(self, explore_key: str, frame: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame],
+                                                                       Dict[str, object]]:
+        """DataExplorer results of the loaded frame, from the stage cache when it has them (on the executor)"""
+        cache = self.analyzer.cache if self.config.USE_CACHE else None
+        explored = cache.get(explore_key) if cache else None
+        if explored is None:
+            explored = self.analyzer._explore(frame)
+            if cache:
+                cache.put(explore_key, explored)
+        return explored
+    
+    def _render_chart(self, chart_key: str, explored: tuple, chart: str) -> bytes:
+        """Image bytes of a dashboard, drawing both dashboards first unless they are current (on the executor)"""
+        corr_matrix, grouped_stats, chart_data = explored
+        self.analyzer._render_dashboards(chart_data, grouped_stats, chart_key)
+        with open(self.analyzer._chart_paths()[self.CHARTS[chart]], 'rb') as f:
+            return f.read()
+    
+    async def _respond(self, path: str) -> Tuple[int, str, bytes]:
+        """(status, content type, body) of a GET request"""
+        parts = [unquote(part) for part in urlsplit(path).path.split('/') if part]
+        keys, frame = await self._snapshot()
+        input_key, clean_key, feature_key, explore_key, chart_key = keys
+        if parts in ([], ['health']):
+            return self._json({'status': 'ok', 'input': input_key[:12], 'rows': len(frame), 'cache': {
+                'items': len(self.cache), 'hits': self.cache.hits, 'misses': self.cache.misses}})
+        
+        explored = await self._cached(('explore', explore_key), self._explore, explore_key, frame)
+        corr_matrix, grouped_stats, chart_data = explored
+        if parts == ['findings']:
+            return 200, 'application/json', await self._cached(
+                ('findings', explore_key), lambda: json.dumps(self.analyzer.key_findings(corr_matrix, grouped_stats),
+                                                              default=str).encode())
+        if parts == ['groups']:
+            return self._json({'groups': list(grouped_stats)})
+        if len(parts) == 2 and parts[0] == 'groups' and parts[1] in grouped_stats:
+            table = grouped_stats[parts[1]]
+            return 200, 'application/json', await self._cached(
+                ('group', explore_key, parts[1]), lambda: table.reset_index().to_json(orient='records').encode())
+        chart, _, extension = parts[-1].rpartition('.') if parts else ('', '', '')
+        if len(parts) == 2 and parts[0] == 'charts' and chart in self.CHARTS and extension == self.chart_extension:
+            return 200, f'image/{extension}', await self._cached(
+                ('chart', chart_key, chart), self._render_chart, chart_key, explored, chart)
+        return self._json({'error': f"Unknown path '{path}'", 'routes': self.routes()}, 404)
+    
+    def routes(self) -> List[str]:
+        return [route.replace('<ext>', self.chart_extension) for route in self.ROUTES]
+    
+    @staticmethod
+    def _json(value: object, status: int = 200) -> Tuple[int, str, bytes]:
+        return status, 'application/json', json.dumps(value, default=str).encode()
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of one (keep-alive) connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get('content-length'):
+                    await reader.readexactly(int(headers['content-length']))
+                
+                request = request_line.decode('latin-1').split()
+                if len(request) != 3:
+                    status, content_type, body = self._json({'error': 'Malformed request line'}, 400)
+                elif request[0] != 'GET':
+                    status, content_type, body = self._json({'error': f"{request[0]} is not supported"}, 405)
+                else:
+                    try:
+                        status, content_type, body = await self._respond(request[1])
+                    except Exception as exc:
+                        print(f"✗ GET {request[1]} failed: {exc!r}")
+                        status, content_type, body = self._json({'error': repr(exc)}, 500)
+                keep_alive = (len(request) == 3 and request[2] == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+                writer.write(
+                    f"HTTP/1.1 {status} {self.REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode('latin-1') + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fitness & Nutrition data analysis pipeline")
+    parser.add_argument('stage', nargs='?', choices=FitnessDataAnalyzer.STAGES, default='render',
+                        help="run the pipeline up to this stage: ingest (fetch and back up the data), clean "
+                             "(plus processed_data), analyze (plus statistics and key findings, no plotting "
+                             "libraries loaded) or render (everything, the default)")
+    parser.add_argument('--data', metavar='PATH', default=Config.DATA_FILE,
+                        help="analyze this local CSV/Parquet/Feather file, directory or quoted glob of shards "
+                             "(e.g. 'data/part-*.csv') instead of the Kaggle dataset")
+    parser.add_argument('--verify-data', action='store_true',
+                        help="re-check the checksum of the cached Kaggle dataset before using it")
+    parser.add_argument('--streaming', action='store_true',
+                        help="read the dataset in bounded chunks instead of loading it at once")
+    parser.add_argument('--chunk-size', type=int, default=Config.CHUNK_SIZE,
+                        help="rows per chunk in streaming mode")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="recompute every stage instead of reusing cached outputs")
+    parser.add_argument('--storage-format', choices=sorted(STORAGE_FORMATS), default=Config.STORAGE_FORMAT,
+                        help="file format for raw_data and processed_data")
+    parser.add_argument('--compact', action='store_true',
+                        help="load with float32/small-int/categorical dtypes to cut memory")
+    parser.add_argument('--usecols', nargs='+', default=None,
+                        help="load only these columns (with --compact)")
+    parser.add_argument('--render-workers', type=int, default=Config.RENDER_WORKERS,
+                        help="processes drawing dashboards in parallel (1 = serial)")
+    parser.add_argument('--segment-by', nargs='+', metavar='COL', default=None,
+                        help=f"also render both dashboards for every value combination of these columns "
+                             f"(e.g. Workout_Type Gender) into {Config.SEGMENT_DIR}/, on --render-workers processes")
+    parser.add_argument('--segment-dpi', type=int, default=Config.SEGMENT_DPI,
+                        help="resolution of the per-segment dashboards")
+    parser.add_argument('--render-profile', choices=sorted(Visualizer.PROFILES), default=Config.RENDER_PROFILE,
+                        help="dashboard rasterization: preview (60 dpi, fast PNG), web (110 dpi, palette PNG) or "
+                             "print (300 dpi, tight bbox, as earlier releases)")
+    parser.add_argument('--chart-format', choices=sorted(RenderProfile.EXTENSIONS), default=Config.CHART_FORMAT,
+                        help="save the dashboards in this format instead of the profile's own")
+    parser.add_argument('--no-results-store', action='store_true',
+                        help=f"skip writing the partitioned rows and aggregate cube to {Config.RESULTS_STORE_DIR}/")
+    parser.add_argument('--ingest-workers', type=int, default=Config.INGEST_WORKERS,
+                        help="processes parsing and cleaning the files of a sharded --data input (1 = serial)")
+    parser.add_argument('--append', nargs='+', metavar='FILE', default=None,
+                        help="fold only these new session files into the state saved by the last streaming run")
+    parser.add_argument('--quantile-sketch', type=float, metavar='ERROR', default=Config.QUANTILE_SKETCH_ERROR,
+                        help="approximate outlier bounds and medians with quantile sketches of this rank error "
+                             "(e.g. 0.001)")
+    parser.add_argument('--exact-streaming', action='store_true',
+                        help="keep exact value counts for medians and quartiles in --streaming and --append runs "
+                             "(their memory then grows with the number of distinct values)")
+    parser.add_argument('--correlation', choices=CorrelationAccumulator.METHODS, default=Config.CORRELATION_METHOD,
+                        help="correlation method; spearman ranks exactly in memory and approximately, in a second "
+                             "pass, when streaming")
+    parser.add_argument('--full-correlation', action='store_true',
+                        help=f"compute the full correlation matrix, not only the correlations with "
+                             f"{Config.TARGET_COLUMN}")
+    parser.add_argument('--profile', nargs='?', const=Config.RUN_REPORT_PATH, default=None, metavar='REPORT',
+                        help=f"time every stage and sub-step and write a JSON run report "
+                             f"(default {Config.RUN_REPORT_PATH})")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="also trace Python allocation peaks per step (slower; implies --profile)")
+    parser.add_argument('--cprofile', metavar='FILE', default=None,
+                        help="dump cProfile stats of the whole run to FILE (view with python -m pstats or snakeviz)")
+    parser.add_argument('--serve', action='store_true',
+                        help="instead of a single run, serve key findings, group summaries and dashboards over "
+                             "HTTP, reloading when the input changes")
+    parser.add_argument('--host', default=Config.SERVE_HOST, help="address the --serve service listens on")
+    parser.add_argument('--port', type=int, default=Config.SERVE_PORT, help="port the --serve service listens on")
+    args = parser.parse_args()
+    if args.append and args.stage in ('ingest', 'clean'):
+        parser.error("--append updates the analysis state; use it with the analyze or render stage")
+    if args.serve and (args.streaming or args.append):
+        parser.error("--serve loads the processed data in memory; it cannot be combined with --streaming or --append")
+    
     # Initialize and run the analysis
-    analyzer = FitnessDataAnalyzer()
-    analyzer.run_analysis()
+    config = Config(DATA_FILE=args.data, VERIFY_DATA=args.verify_data, CHUNK_SIZE=args.chunk_size,
+                    USE_CACHE=not args.no_cache, STORAGE_FORMAT=args.storage_format, COMPACT_DTYPES=args.compact,
+                    USECOLS=tuple(args.usecols) if args.usecols else None,
+                    RENDER_WORKERS=args.render_workers, INGEST_WORKERS=args.ingest_workers,
+                    SEGMENT_BY=tuple(args.segment_by) if args.segment_by else None, SEGMENT_DPI=args.segment_dpi,
+                    RENDER_PROFILE=args.render_profile, CHART_FORMAT=args.chart_format,
+                    RESULTS_STORE_DIR=None if args.no_results_store else Config.RESULTS_STORE_DIR,
+                    QUANTILE_SKETCH_ERROR=args.quantile_sketch,
+                    STREAMING_SKETCH_ERROR=None if args.exact_streaming else Config.STREAMING_SKETCH_ERROR,
+                    CORRELATION_METHOD=args.correlation,
+                    CORRELATION_TARGET_ONLY=not args.full_correlation,
+                    PROFILE=args.profile is not None, RUN_REPORT_PATH=args.profile or Config.RUN_REPORT_PATH,
+                    PROFILE_MEMORY=args.profile_memory,
+                    CPROFILE_PATH=args.cprofile, SERVE_HOST=args.host, SERVE_PORT=args.port)
+    analyzer = FitnessDataAnalyzer(config)
+    if args.serve:
+        analyzer.serve()
+    else:
+        analyzer.run_analysis(streaming=args.streaming, append=args.append, stage=args.stage)
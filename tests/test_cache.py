@@ -0,0 +1,27 @@
+"""Stage cache keys and output records"""
+
+import inspect
+import os
+
+from fitness_nutrition_analysis import DataCleaner, FeatureEngineer, StageCache, _iqr_bounds, _safe_divide, _stage_source
+
+
+def test_stage_source_covers_module_helpers():
+    assert inspect.getsource(_iqr_bounds).strip() in _stage_source(DataCleaner)
+    assert inspect.getsource(_safe_divide).strip() in _stage_source(FeatureEngineer)
+    assert inspect.getsource(_iqr_bounds).strip() not in _stage_source(FeatureEngineer)
+
+
+def test_unrecorded_output_leaves_no_cache_files(tmp_path):
+    cache = StageCache(str(tmp_path / 'cache'), 1 << 20)
+    cache.mark_output(str(tmp_path / 'processed.parquet'), None)
+    assert not os.path.exists(cache.cache_dir)
+
+
+def test_dropping_a_record_is_saved(tmp_path):
+    output = tmp_path / 'processed.parquet'
+    output.write_bytes(b'')
+    cache = StageCache(str(tmp_path / 'cache'), 1 << 20)
+    cache.mark_output(str(output), 'key')
+    cache.mark_output(str(output), None)
+    assert not StageCache(cache.cache_dir, 1 << 20).output_is_current(str(output), 'key')
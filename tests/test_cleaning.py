@@ -0,0 +1,29 @@
+"""DataCleaner: the input frame is never written to"""
+
+import numpy as np
+import pandas as pd
+
+from fitness_nutrition_analysis import DataCleaner, RowHashSet
+from datagen import SyntheticDataGenerator
+
+
+def test_cleaning_leaves_input_unchanged():
+    df = SyntheticDataGenerator(seed=3).generate(5_000)
+    assert df.isna().any().any()
+    original = df.copy(deep=True)
+    cleaner = DataCleaner()
+    cleaned = cleaner.clean_data(df)
+    assert not cleaned.isna().any().any()
+    pd.testing.assert_frame_equal(df, original)
+    
+    stats = cleaner.fit_streaming_stats(lambda: iter([df]))
+    cleaner.clean_chunk(df, stats, RowHashSet())
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_compact_columns_keep_their_dtype():
+    df = pd.DataFrame({'Age': np.array([20.0, np.nan, 40.0], dtype=np.float32)})
+    original = df.copy(deep=True)
+    cleaned = DataCleaner().clean_data(df)
+    assert cleaned['Age'].dtype == np.float32 and cleaned['Age'].tolist() == [20.0, 30.0, 40.0]
+    pd.testing.assert_frame_equal(df, original)
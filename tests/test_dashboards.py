@@ -0,0 +1,87 @@
+"""Dashboard figures: precomputed layouts for short category names, measured ones for longer names, and the
+same bytes whether rendered in-process or on a pool"""
+
+import numpy as np
+
+from bench_segments import make_frame
+from fitness_nutrition_analysis import (ChartDataBuilder, GroupAggregator, InsightsDashboard, OutputManager,
+                                        RenderJob, RenderScheduler, SegmentFanout, SummaryDashboard, Visualizer,
+                                        _text_batch_class)
+
+
+def chart_inputs(workout_suffix=''):
+    """(chart data, group tables) of a synthetic frame"""
+    df = make_frame(2_000, 2)
+    df['Workout_Type'] = df['Workout_Type'].astype(str) + workout_suffix
+    builder = ChartDataBuilder(ChartDataBuilder.ranges_from_frame(df))
+    builder.update(df)
+    grouped_stats = {}
+    for spec in SegmentFanout.GROUP_SPECS:
+        aggregator = GroupAggregator([spec])
+        aggregator.update(df)
+        grouped_stats[spec.name] = aggregator.table(spec)
+    return builder.result(), grouped_stats
+
+
+def insights_data(visualizer, workout_suffix=''):
+    return visualizer.insights_dashboard_data(*chart_inputs(workout_suffix))
+
+
+def test_long_category_names_get_a_measured_layout(tmp_path):
+    visualizer = Visualizer(OutputManager(str(tmp_path)), Visualizer.PROFILES['preview'])
+    lefts = []
+    for suffix in ('', ' (high intensity)'):
+        data = insights_data(visualizer, suffix)
+        figure = InsightsDashboard(InsightsDashboard.scales(data))
+        figure.update(data)
+        visualizer._arrange(figure, 'insights')
+        lefts.append(figure.fig.subplotpars.left)
+    assert lefts[0] == Visualizer.LAYOUTS['insights']['left']
+    assert lefts[1] > lefts[0]
+
+
+def test_updates_move_the_artists_built_once(tmp_path):
+    visualizer = Visualizer(OutputManager(str(tmp_path)), Visualizer.PROFILES['preview'])
+    chart_data, grouped_stats = chart_inputs()
+    summary_data = visualizer.summary_dashboard_data(chart_data, grouped_stats)
+    insights = visualizer.insights_dashboard_data(chart_data, grouped_stats)
+    summary = SummaryDashboard(SummaryDashboard.scales(summary_data))
+    violins = InsightsDashboard(InsightsDashboard.scales(insights))
+    hexbin, bodies, collections = summary._hexbin, list(violins._violin_bodies), len(violins.fig.axes[1].collections)
+    axes = len(summary.fig.axes)
+    for _ in range(2):
+        summary.update(summary_data)
+        violins.update(insights)
+    assert summary._hexbin is hexbin and hexbin in hexbin.axes.collections and len(summary.fig.axes) == axes
+    assert hexbin.get_array().sum() == chart_data['hexbin'][2].sum()
+    assert len(hexbin.get_offsets()) == len(hexbin.get_array())
+    assert violins._violin_bodies == bodies and len(violins.fig.axes[1].collections) == collections
+    assert all(len(body.get_paths()[0].vertices) for body in bodies)
+
+
+def test_text_batch_extent_without_a_renderer():
+    figure = InsightsDashboard({'intensity_workouts': ['Yoga'], 'intensity_max': 1.0, 'bmi_range': (18.0, 30.0)})
+    ax = figure.fig.axes[0]
+    batch = ax.add_artist(_text_batch_class()(np.array([0.5]), np.array([0.0]), ['5.00 cal/min'], ax.transData))
+    extent = batch.get_window_extent()
+    assert extent.width > 0 and extent.height > 0
+
+
+def test_pooled_renders_equal_serial_renders(tmp_path):
+    chart_data, grouped_stats = chart_inputs()
+    jobs = {}
+    for workers in (1, 2):
+        for name in ('preview', 'web'):
+            profile = Visualizer.PROFILES[name]
+            visualizer = Visualizer(OutputManager(str(tmp_path)), profile)
+            jobs.setdefault(workers, []).extend([
+                RenderJob('summary', visualizer.summary_dashboard_data(chart_data, grouped_stats),
+                          str(tmp_path / f"{workers}-{name}-summary.png"), profile),
+                RenderJob('insights', visualizer.insights_dashboard_data(chart_data, grouped_stats),
+                          str(tmp_path / f"{workers}-{name}-insights.png"), profile),
+            ])
+    serial = RenderScheduler(1).render(jobs[1])
+    pooled = RenderScheduler(2).render(jobs[2])
+    for serial_path, pooled_path in zip(serial, pooled):
+        with open(serial_path, 'rb') as a, open(pooled_path, 'rb') as b:
+            assert a.read() == b.read(), pooled_path
@@ -0,0 +1,18 @@
+"""FeatureEngineer's vectorized features against the row-wise implementation they replaced"""
+
+import numpy as np
+import pandas as pd
+
+from bench_feature_engineering import legacy_create_features
+from fitness_nutrition_analysis import FeatureEngineer
+
+
+def test_calories_per_minute_is_zero_without_a_positive_duration():
+    df = pd.DataFrame({
+        'Age': [22, 30, 41, 50, 60, 35],
+        'Session_Duration (hours)': [1.5, 0.0, np.nan, -0.5, 0.75, 1.0],
+        'Calories_Burned': [900.0, 500.0, 400.0, 300.0, np.nan, 0.0],
+    })
+    vector = FeatureEngineer().create_features(df.copy(), verbose=False)
+    pd.testing.assert_frame_equal(vector, legacy_create_features(df.copy()))
+    assert vector['Calories_Burned_Per_Minute'].tolist()[:4] == [10.0, 0.0, 0.0, 0.0]
@@ -0,0 +1,16 @@
+"""GroupAggregator's single pass against the one-groupby-per-table analysis it replaced"""
+
+import pandas as pd
+
+from bench_group_analysis import legacy_group_analysis, make_frame
+from fitness_nutrition_analysis import DataExplorer
+
+
+def test_group_tables_equal_pandas_groupby():
+    df = make_frame(40_000)
+    legacy = legacy_group_analysis(df)
+    tables = DataExplorer().perform_group_analysis(df)
+    assert list(tables) == list(legacy)
+    for name, table in legacy.items():
+        # The aggregator labels groups with object arrays, pandas 3 groupby with its string dtype
+        pd.testing.assert_frame_equal(tables[name], table, check_index_type=False, check_column_type=False, obj=name)
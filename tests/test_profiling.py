@@ -0,0 +1,20 @@
+"""Profiled steps with and without an active profiler"""
+
+from fitness_nutrition_analysis import RunProfiler, profile_step, profiling
+
+
+def test_steps_without_profiler_keep_no_state():
+    with profile_step('read') as step:
+        step.rows_out = 5
+    with profile_step('read') as other:
+        assert other.rows_out is None
+
+
+def test_steps_record_rows():
+    profiler = RunProfiler()
+    with profiling(profiler):
+        for rows in (3, 4):
+            with profile_step('read', rows_in=rows) as step:
+                step.rows_out = rows - 1
+    assert profiler.steps['read']['calls'] == 2
+    assert (profiler.steps['read']['rows_in'], profiler.steps['read']['rows_out']) == (7, 5)
@@ -0,0 +1,77 @@
+"""ResultsStore: missing dimension values are cube cells of their own, counted by every roll-up and kept apart
+from it; --append runs add to the store without rewriting it"""
+
+import os
+
+import pandas as pd
+
+from bench_segments import make_frame
+from datagen import SyntheticDataGenerator
+from fitness_nutrition_analysis import Config, FitnessDataAnalyzer, ResultsStore, ResultsStoreWriter
+
+
+def build_store(tmp_path):
+    df = make_frame(2_000, 2).drop(columns='Gym')
+    df['Gender'] = df['Gender'].astype(object)
+    df.loc[df.index[::19][:100], 'Gender'] = None
+    path = os.path.join(tmp_path, 'store')
+    with ResultsStoreWriter(path) as writer:
+        # The missing genders fall in both chunks
+        writer.write(df.iloc[:1_000])
+        writer.write(df.iloc[1_000:])
+    return df, ResultsStore(path)
+
+
+def test_missing_filter_is_not_the_rollup(tmp_path):
+    df, store = build_store(tmp_path)
+    total = store.aggregate('BMI')
+    assert total['count'] == len(df)
+    missing = store.aggregate('BMI', Gender=None)
+    assert missing['count'] == 100
+    assert abs(missing['mean'] - df.loc[df['Gender'].isna(), 'BMI'].mean()) < 1e-9
+    by_gender = sum(store.aggregate('BMI', Gender=gender)['count'] for gender in ('Female', 'Male', None))
+    assert by_gender == total['count']
+    assert len(store.rows(Gender=None)) == 100
+
+
+def test_cube_marks_rolled_up_dimensions(tmp_path):
+    _, store = build_store(tmp_path)
+    cube = store.cube
+    everything = cube[cube['grouping'] == (1 << len(store.dimensions)) - 1]
+    assert set(everything['metric']) == set(store.metrics)
+    assert everything[list(store.dimensions)].isna().all().all()
+    by_gender = cube[(cube['grouping'] & 1 << store.dimensions.index('Gender')) == 0]
+    assert set(by_gender['Gender'].dropna()) == {'Female', 'Male'} and by_gender['Gender'].isna().any()
+
+
+def test_append_adds_part_files_without_rewriting_partitions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_file = SyntheticDataGenerator(seed=7).write(str(tmp_path / 'sessions.csv'), 6_000)
+    delta_file = SyntheticDataGenerator(seed=8).write(str(tmp_path / 'delta.csv'), 500)
+    store_path = str(tmp_path / 'store')
+    analyzer = FitnessDataAnalyzer(Config(DATA_FILE=data_file, USE_CACHE=False, RESULTS_STORE_DIR=store_path,
+                                          CHUNK_SIZE=2_000, INGEST_WORKERS=1))
+    analyzer.run_analysis(streaming=True, stage='analyze')
+    before = ResultsStore(store_path)
+    written = {name: os.stat(os.path.join(store_path, name)).st_mtime_ns
+               for entry in before.manifest['partitions'] for name in entry['files']}
+    
+    analyzer.run_analysis(append=[delta_file], stage='analyze')
+    after = ResultsStore(store_path)
+    assert after.manifest['generation'] == before.manifest['generation'] + 1
+    for entry in after.manifest['partitions']:
+        old = [name for name in entry['files'] if name in written]
+        assert entry['files'][:len(old)] == old
+    assert {name: os.stat(os.path.join(store_path, name)).st_mtime_ns for name in written} == written
+    
+    # The same cube as a store rebuilt from all processed rows
+    processed = analyzer.output_manager.load_dataframe(analyzer.config.PROCESSED_DATA_PATH)
+    assert after.manifest['rows'] == len(processed) > before.manifest['rows']
+    assert len(after.rows()) == len(processed)
+    with ResultsStoreWriter(str(tmp_path / 'rebuilt'), after.manifest['median_error']) as writer:
+        writer.write(processed)
+    rebuilt = ResultsStore(str(tmp_path / 'rebuilt'))
+    for filters in ({}, {'Workout_Type': 'HIIT'}, {'Gender': 'Female', 'Experience_Level': 2}):
+        expected = rebuilt.aggregate(**filters)
+        pd.testing.assert_frame_equal(after.aggregate(**filters)[['count', 'mean', 'min', 'max']],
+                                      expected[['count', 'mean', 'min', 'max']], rtol=1e-9)
@@ -0,0 +1,50 @@
+"""Row hashes: duplicates confirmed within a frame, and RowHashSet across chunks, spilled to run files"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fitness_nutrition_analysis import RowHashSet, _row_hashes
+
+
+@pytest.fixture
+def small_runs(monkeypatch):
+    monkeypatch.setattr(RowHashSet, 'SPILL_HASHES', 2_000)
+    monkeypatch.setattr(RowHashSet, 'MERGE_BLOCK', 777)
+
+
+def test_drop_seen_keeps_first_occurrences(small_runs, tmp_path):
+    values = np.random.default_rng(0).integers(0, 30_000, 100_000)
+    hash_set, seen = RowHashSet(str(tmp_path)), set()
+    for start in range(0, values.size, 3_000):
+        chunk = pd.DataFrame({'x': values[start:start + 3_000]})
+        expected = [value for value in chunk['x'] if not (value in seen or seen.add(value))]
+        assert chunk.loc[hash_set.drop_seen(chunk).index, 'x'].tolist() == expected
+        # Reloading mid-way must not lose or duplicate a run
+        hash_set = pickle.loads(pickle.dumps(hash_set))
+    assert len(hash_set) == len(seen)
+    assert any(name for name in hash_set._files)
+
+
+def test_pickle_references_spilled_runs(small_runs, tmp_path):
+    hash_set = RowHashSet(str(tmp_path))
+    hash_set.drop_seen(pd.DataFrame({'x': np.arange(10_000)}))
+    spilled = set(os.listdir(tmp_path))
+    assert spilled and len(pickle.dumps(hash_set)) < 1_000
+    
+    hash_set.drop_seen(pd.DataFrame({'x': np.arange(10_000, 10_100)}))
+    RowHashSet.remove_unused_runs(hash_set)
+    # A small new run stays in memory; the spilled history is neither rewritten nor deleted
+    assert set(os.listdir(tmp_path)) == spilled
+
+
+def test_hash_collisions_keep_distinct_rows(monkeypatch):
+    df = pd.DataFrame({'x': [1.0, 2.0, np.nan, 1.0, np.nan, 3.0], 'y': ['a', 'b', None, 'a', None, 'a']})
+    # Every row hashes alike, so only the value comparison tells rows apart
+    monkeypatch.setattr(pd.util, 'hash_pandas_object',
+                        lambda frame, index: pd.Series(np.zeros(len(frame), dtype=np.uint64)))
+    _, duplicated = _row_hashes(df)
+    assert duplicated.tolist() == [False, False, False, True, True, False]
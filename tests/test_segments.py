@@ -0,0 +1,40 @@
+"""SegmentFanout: dashboards per segment from shared scales, built as the renderer reaches each segment"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+from bench_segments import make_frame
+from fitness_nutrition_analysis import SegmentFanout
+
+
+def test_renders_every_segment(tmp_path):
+    df = make_frame(3_000, 3)
+    # One gym without Yoga sessions, so its dashboards leave that workout empty
+    df = df[~((df['Gym'] == 'gym-00000') & (df['Workout_Type'] == 'Yoga'))]
+    fanout = SegmentFanout(('Gym',), str(tmp_path))
+    scales, segments = fanout.prepare(df)
+    assert not isinstance(segments, list)
+    
+    with open(fanout.write(scales, segments)) as f:
+        index = json.load(f)
+    assert [entry['segment']['Gym'] for entry in index['segments']] == ['gym-00000', 'gym-00001', 'gym-00002']
+    assert sum(entry['rows'] for entry in index['segments']) == len(df)
+    sizes = set()
+    for entry in index['segments']:
+        for kind in SegmentFanout.DASHBOARDS:
+            with Image.open(os.path.join(tmp_path, entry[kind])) as image:
+                sizes.add((kind, image.size))
+    assert len(sizes) == len(SegmentFanout.DASHBOARDS)
+
+
+def test_no_segments_writes_an_empty_index(tmp_path):
+    df = make_frame(500, 2)
+    df['Gym'] = pd.Series(np.nan, index=df.index, dtype=object)
+    fanout = SegmentFanout(('Gym',), str(tmp_path))
+    with open(fanout.run(df)) as f:
+        assert json.load(f)['segments'] == []
+    assert os.listdir(tmp_path) == ['index.json']
@@ -0,0 +1,52 @@
+"""AnalyticsService: reloads on input changes without blocking requests, and never forks from its executor"""
+
+import asyncio
+import threading
+
+import pandas as pd
+
+from fitness_nutrition_analysis import AnalyticsService, Config, FitnessDataAnalyzer
+
+
+def test_requests_use_the_loaded_input_during_a_reload():
+    config = Config(SERVE_POLL_SECONDS=0.01, RENDER_WORKERS=4, INGEST_WORKERS=4)
+    service = AnalyticsService(FitnessDataAnalyzer(config))
+    assert service.analyzer.render_scheduler.workers == 1
+    assert service.analyzer.parallel_cleaner.mp_context.get_start_method() == 'spawn'
+
+    release = threading.Event()
+    loads = []
+
+    def load():
+        loads.append(len(loads))
+        if len(loads) > 1:
+            release.wait(5)
+        version = str(len(loads))
+        return [], (), (version,) * 5, pd.DataFrame({'rows': range(len(loads))})
+
+    service._load = load
+
+    async def scenario():
+        keys, _ = await service._snapshot()
+        assert keys[0] == '1'
+        service.cache.put(('findings', keys[3]), b'{}')
+        # The input changes: the reload waits on release while requests are answered from version 1
+        service._signature = ('changed',)
+        watcher = asyncio.create_task(service._watch_input())
+        while len(loads) < 2:
+            await asyncio.sleep(0.01)
+        keys, frame = await asyncio.wait_for(service._snapshot(), 1)
+        assert keys[0] == '1' and len(frame) == 1
+        assert service.cache.get(('findings', keys[3])) == b'{}'
+
+        release.set()
+        while service._keys[0] != '2':
+            await asyncio.sleep(0.01)
+        watcher.cancel()
+        assert len(service.cache) == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        service._executor.shutdown(wait=True)
@@ -0,0 +1,25 @@
+"""Data sources: the Kaggle manifest is read once per locate()"""
+
+import pytest
+
+from fitness_nutrition_analysis import DataSource, KaggleSource, StageCache
+
+
+def test_kaggle_manifest_read_once(tmp_path, monkeypatch):
+    data_file = tmp_path / 'sessions.csv'
+    data_file.write_text('Age\n30\n')
+    source = KaggleSource('owner/dataset', str(tmp_path / 'cache'))
+    source._record({}, str(data_file), StageCache.file_digest(str(data_file)))
+    
+    loads = []
+    load_manifest = source._load_manifest
+    monkeypatch.setattr(source, '_load_manifest', lambda: loads.append(1) or load_manifest())
+    paths = source.locate()
+    assert paths == [str(data_file)]
+    assert [source.digest(path) for path in paths * 3] == [StageCache.file_digest(str(data_file))] * 3
+    assert len(loads) == 1
+
+
+def test_data_source_is_abstract():
+    with pytest.raises(TypeError):
+        DataSource()
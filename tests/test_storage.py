@@ -0,0 +1,35 @@
+"""Storage formats: what read and iter_chunks give back"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fitness_nutrition_analysis import FeatherStorage, ParquetStorage, StorageFormat
+
+
+@pytest.fixture(params=[ParquetStorage, FeatherStorage])
+def stored(request, tmp_path):
+    storage = request.param()
+    df = pd.DataFrame({'a': np.arange(10.0), 'b': pd.Categorical(list('abcabcabca'))},
+                      index=pd.Index(np.arange(100, 110), name='row'))
+    path = storage.path(str(tmp_path / 'frame'))
+    storage.write(df, path, index=True)
+    return storage, path, df
+
+
+def test_read_honours_index(stored):
+    storage, path, df = stored
+    pd.testing.assert_frame_equal(storage.read(path, index=True), df)
+    pd.testing.assert_frame_equal(storage.read(path, columns=['a'], index=True), df[['a']])
+    pd.testing.assert_frame_equal(storage.read(path), df.reset_index(drop=True))
+
+
+def test_chunks_are_indexed_like_the_whole_file(stored):
+    storage, path, df = stored
+    pd.testing.assert_frame_equal(pd.concat(storage.iter_chunks(path, 4, index=True)), df)
+    pd.testing.assert_frame_equal(pd.concat(storage.iter_chunks(path, 4)), df.reset_index(drop=True))
+
+
+def test_storage_format_is_abstract():
+    with pytest.raises(TypeError):
+        StorageFormat()
@@ -0,0 +1,97 @@
+"""Streaming and parallel runs against the in-memory pipeline they stand in for"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fitness_nutrition_analysis import (
+    Config, DataCleaner, DataIngestor, FitnessDataAnalyzer, IncrementalState, ParallelCleaner, ParquetStorage,
+    QuantileSketch,
+)
+from datagen import SyntheticDataGenerator
+
+ROWS = 30_000
+
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    """Synthetic sessions in a CSV file; outputs go to tmp_path/final_output"""
+    monkeypatch.chdir(tmp_path)
+    return SyntheticDataGenerator(seed=7).write(str(tmp_path / 'sessions.csv'), ROWS)
+
+
+def run_both(data_file: str, **config) -> tuple:
+    """(in-memory, streaming) chart data, correlations and group tables of one input"""
+    analyzer = FitnessDataAnalyzer(Config(DATA_FILE=data_file, USE_CACHE=False, RESULTS_STORE_DIR=None,
+                                          CHUNK_SIZE=7_000, INGEST_WORKERS=1, **config))
+    analyzer.output_manager.setup_output_directories()
+    in_memory = analyzer._run_in_memory_stages()[:3]
+    streaming = analyzer._run_streaming_stages()
+    return in_memory, streaming
+
+
+def assert_results_close(in_memory: tuple, streaming: tuple, rtol: float) -> None:
+    (charts, corr, groups), (stream_charts, stream_corr, stream_groups) = in_memory, streaming
+    pd.testing.assert_frame_equal(stream_corr, corr, rtol=rtol, atol=rtol / 10)
+    assert stream_groups.keys() == groups.keys()
+    for name, table in groups.items():
+        pd.testing.assert_frame_equal(stream_groups[name], table, rtol=rtol, check_dtype=False)
+    counts, edges = charts['calorie_hist']
+    np.testing.assert_allclose(stream_charts['calorie_hist'][1], edges, rtol=rtol)
+    np.testing.assert_allclose(stream_charts['calorie_hist'][0], counts, rtol=rtol, atol=2)
+    for key in ('calories_mean', 'calories_median'):
+        assert stream_charts[key] == pytest.approx(charts[key], rel=rtol)
+
+
+def test_exact_streaming_equals_in_memory(data_file):
+    in_memory, streaming = run_both(data_file, STREAMING_SKETCH_ERROR=None)
+    assert_results_close(in_memory, streaming, rtol=1e-9)
+
+
+def test_sketched_streaming_is_close_to_in_memory(data_file):
+    in_memory, streaming = run_both(data_file)
+    assert_results_close(in_memory, streaming, rtol=1e-2)
+
+
+def test_streaming_state_is_sketched_by_default(data_file):
+    analyzer = FitnessDataAnalyzer(Config(DATA_FILE=data_file, USE_CACHE=False, RESULTS_STORE_DIR=None,
+                                          CHUNK_SIZE=7_000))
+    analyzer.output_manager.setup_output_directories()
+    analyzer._run_streaming_stages()
+    state = IncrementalState.load(analyzer.config.STATE_PATH, analyzer._state_key())
+    for col in Config.NUMERIC_COLS:
+        assert isinstance(state.stats.fill_counters[col], QuantileSketch), col
+    for col in Config.OUTLIER_COLS:
+        assert isinstance(state.stats.outlier_counters[col], QuantileSketch), col
+
+
+def test_parallel_cleaning_equals_serial(tmp_path):
+    df = SyntheticDataGenerator(seed=11).generate(ROWS)
+    # Rows repeated in a later file, so duplicates cross file boundaries too
+    shards = [df.iloc[:10_000], df.iloc[10_000:20_000], pd.concat([df.iloc[20_000:], df.iloc[:500]])]
+    paths = []
+    for i, shard in enumerate(shards):
+        paths.append(str(tmp_path / f"part-{i}.csv"))
+        shard.to_csv(paths[-1], index=False)
+    
+    ingestor = DataIngestor(ParquetStorage())
+    serial = DataCleaner().clean_data(ingestor.load_data(paths))
+    parallel = ParallelCleaner(ingestor, DataCleaner(), workers=2).clean_files(
+        paths, os.path.join(tmp_path, 'raw_data'))
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_streaming_spearman_is_close_to_in_memory(data_file):
+    (_, corr, _), (_, stream_corr, _) = run_both(data_file, CORRELATION_METHOD='spearman')
+    pd.testing.assert_frame_equal(stream_corr, corr, atol=5e-3)
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_header_only_input_fails_early(data_file, streaming):
+    pd.read_csv(data_file, nrows=0).to_csv(data_file, index=False)
+    analyzer = FitnessDataAnalyzer(Config(DATA_FILE=data_file, USE_CACHE=False, RESULTS_STORE_DIR=None))
+    analyzer.output_manager.setup_output_directories()
+    with pytest.raises(ValueError, match="No rows in sessions.csv"):
+        analyzer._run_streaming_stages() if streaming else analyzer._run_in_memory_stages()